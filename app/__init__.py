@@ -17,10 +17,10 @@ for logger_name in [
 ]:
     logging.getLogger(logger_name).setLevel(logging.ERROR)
 
-# Now import matplotlib and set backend
-import matplotlib
-matplotlib.use('Agg', force=True)
-matplotlib.set_loglevel('WARNING')
+# matplotlib is imported lazily by the modules that plot; select the
+# headless backend up front so the first import picks it up
+os.environ.setdefault('MPLBACKEND', 'Agg')
+logging.getLogger('matplotlib').setLevel(logging.WARNING)
 
 from flask import Flask
 import json
@@ -93,6 +93,7 @@ def create_app():
     directories = {
         'temp_uploads': os.path.join(app_dir, 'temp', 'uploads'),
         'temp_converted': os.path.join(app_dir, 'temp', 'converted'),
+        'temp_cache': os.path.join(app_dir, 'temp', 'cache'),
         'data': os.path.join(app_dir, 'data')
     }
     
@@ -124,6 +125,7 @@ def create_app():
         from .routes.analytics import analytics
         from .routes.gmail import gmail
         from .routes.business_api import business_api
+        from .routes.metrics import metrics
         
         app.register_blueprint(main)
         app.register_blueprint(api)
@@ -131,6 +133,7 @@ def create_app():
         app.register_blueprint(auth)
         app.register_blueprint(gmail)
         app.register_blueprint(business_api)
+        app.register_blueprint(metrics)
         
         # Create database tables
         db.create_all()
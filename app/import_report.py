@@ -0,0 +1,96 @@
+"""
+Import-time report for web worker cold starts.
+
+    python -m app.import_report [--budget-ms 2000] [--top 15]
+
+Imports the app and calls create_app() in a fresh interpreter under
+`python -X importtime`, prints the slowest top-level imports and any heavy
+optional dependency that was loaded eagerly, and exits with status 1 when
+startup exceeds the budget or loads any of those heavy dependencies.
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+# Startup budget in milliseconds for importing the app and building it
+DEFAULT_BUDGET_MS = int(os.environ.get('IMPORT_BUDGET_MS', 2000))
+
+# Dependencies that must only be imported by the code paths that need them
+HEAVY_MODULES = (
+    'numpy', 'cv2', 'PIL', 'matplotlib', 'seaborn', 'plotly', 'pandas',
+    'spacy', 'googleapiclient', 'google_auth_oauthlib', 'pdf2docx', 'camelot'
+)
+
+STARTUP_STATEMENT = 'from app import create_app; create_app()'
+
+def _run(statement, *python_args):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run(
+        [sys.executable, *python_args, '-c', statement],
+        cwd=root,
+        capture_output=True,
+        text=True
+    )
+
+def measure_imports(statement=STARTUP_STATEMENT):
+    """Run statement under -X importtime; returns (top-level (module, ms) pairs, error)"""
+    result = _run(statement, '-X', 'importtime')
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented; only top-level entries add up to the total
+        if name.startswith('  '):
+            continue
+        timings.append((name.strip(), int(cumulative) / 1000))
+
+    error = None
+    if result.returncode != 0:
+        messages = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        error = messages[-1] if messages else f"exit status {result.returncode}"
+    return timings, error
+
+def loaded_heavy_modules(statement=STARTUP_STATEMENT):
+    """Return the HEAVY_MODULES that are imported as a side effect of statement"""
+    check = f"{statement}\nimport sys\nprint('heavy:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = _run(check)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    # Imported libraries may print their own warnings; pick out our line
+    for line in result.stdout.splitlines():
+        if line.startswith('heavy:'):
+            return [name for name in line[len('heavy:'):].split(',') if name]
+    return []
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report app import time against a budget')
+    parser.add_argument('--budget-ms', type=int, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--statement', default=STARTUP_STATEMENT)
+    args = parser.parse_args(argv)
+
+    timings, error = measure_imports(args.statement)
+    total = sum(ms for _, ms in timings)
+
+    print(f"{'module':<40} {'ms':>10}")
+    for name, ms in sorted(timings, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<40} {ms:>10.1f}")
+    print(f"{'total':<40} {total:>10.1f}  (budget {args.budget_ms} ms)")
+
+    if error:
+        print(f"startup failed: {error}")
+        return 1
+
+    status = 0 if total <= args.budget_ms else 1
+
+    heavy = loaded_heavy_modules(args.statement)
+    if heavy:
+        print(f"heavy modules loaded at startup: {', '.join(heavy)}")
+        status = 1
+
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,4 @@
 from flask import Blueprint, render_template, request, jsonify, current_app
-from ..services.analysis.pattern_visualizer import PatternVisualizer
 from ..services.analysis.resume_analyzer import ResumeAnalyzer
 import logging
 
@@ -9,6 +8,9 @@ analytics = Blueprint('analytics', __name__, url_prefix='/analytics')
 @analytics.route('/')
 def dashboard():
     try:
+        # pandas/plotly are only loaded once the dashboard is actually requested
+        from ..services.analysis.pattern_visualizer import PatternVisualizer
+        
         # Initialize analyzer and visualizer
         analyzer = ResumeAnalyzer()
         visualizer = PatternVisualizer(analyzer)
@@ -48,6 +50,7 @@ def update_chart():
         chart_id = request.json.get('chart_id')
         filters = request.json.get('filters', {})
         
+        from ..services.analysis.pattern_visualizer import PatternVisualizer
         analyzer = ResumeAnalyzer()
         visualizer = PatternVisualizer(analyzer)
         
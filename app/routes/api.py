@@ -2,7 +2,10 @@ from flask import Blueprint, request, jsonify, current_app, send_file
 import os
 from werkzeug.utils import secure_filename
 import uuid
-from ..services.converter import DocumentConverter, SmartDocumentConverter
+from ..services.converter import SmartDocumentConverter
+from ..services.conversion_cache import get_conversion_cache
+from ..services.converter_pool import get_converter_pool
+from ..services.temp_reaper import get_temp_reaper, CONVERTED_TTL
 import logging
 from ..services.analysis.resume_analyzer import ResumeAnalyzer
 
@@ -43,12 +46,21 @@ def convert_file():
         output_path = os.path.join(output_folder, output_filename)
         file.save(input_path)
         
-        # Use the simpler DocumentConverter for now since SmartDocumentConverter has issues
-        converter = DocumentConverter()
-        success = converter.convert(input_path, output_path, target_format)
+        # The background reaper deletes the converted file once it expires. It is
+        # registered before converting so a failed conversion's partial output goes too
+        get_temp_reaper().register(output_path, CONVERTED_TTL)
         
-        if not success:
-            return jsonify({'error': 'Conversion failed'}), 500
+        # Identical uploads are served from the conversion cache without reconverting
+        cache = get_conversion_cache()
+        cache_key = cache.make_key(input_path, target_format)
+        if not cache.get(cache_key, output_path):
+            # Convert with DocumentConverter in a pre-warmed worker process
+            success = get_converter_pool().convert(input_path, output_path, target_format)
+            
+            if not success:
+                return jsonify({'error': 'Conversion failed'}), 500
+            
+            cache.put(cache_key, output_path)
         
         # Save the file to a permanent location for future reference
         permanent_upload_folder = os.path.join(current_app.root_path, 'uploads')
@@ -1,17 +1,28 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, send_file, Response
 from functools import wraps
 from ..models.user import User
 from ..models.api_key import APIKey
-from ..services.converter import DocumentConverter
+from ..services.converter import ConversionOptionsError, parse_page_options
+from ..services.conversion_cache import get_conversion_cache
+from ..services.conversion_jobs import get_job_queue, job_to_dict
+from ..services.converter_pool import get_converter_pool
+from ..services.temp_reaper import get_temp_reaper
+from ..services.batch_converter import convert_batch, stream_zip, batch_directory, batch_entries
 from werkzeug.utils import secure_filename
 import os
+import json
 import uuid
+import time
+import hashlib
 from datetime import datetime, timedelta
 from flask_login import login_required, current_user
 from ..extensions import db
 
 business_api = Blueprint('business_api', __name__)
 
+# Seconds download URLs stay valid; the uploaded and converted files are reaped afterwards
+DOWNLOAD_TTL = 3600
+
 def require_api_key(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -34,6 +45,25 @@ def require_api_key(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def _conversion_options():
+    """
+    Parse the JSON options form field, e.g. {"pages": "1-3,5", "max_pages": 2, "first_n_preview": 2}.
+    Raises ConversionOptionsError for malformed options; whether the pages exist is
+    only known once the document is opened for conversion.
+    """
+    try:
+        options = json.loads(request.form.get('options') or '{}')
+    except ValueError:
+        raise ConversionOptionsError("options must be a JSON object")
+    if not isinstance(options, dict):
+        raise ConversionOptionsError("options must be a JSON object")
+    parse_page_options(options)
+    return options
+
+def _api_key_owner():
+    """Opaque owner id for jobs so keys are never stored in the job queue"""
+    return hashlib.sha256(request.headers.get('X-API-Key', '').encode('utf-8')).hexdigest()
+
 @business_api.route('/api/v1/convert', methods=['POST'])
 @require_api_key
 def convert_document():
@@ -56,7 +86,13 @@ def convert_document():
         in: formData
         type: object
         required: false
-        description: Additional conversion options
+        description: 'Additional conversion options as JSON: pages (e.g. "1-3,5"), max_pages, first_n_preview'
+      - name: async
+        in: formData
+        type: boolean
+        required: false
+        default: false
+        description: Queue the conversion and return a job id immediately
     """
     try:
         if 'file' not in request.files:
@@ -74,6 +110,7 @@ def convert_document():
         filename = secure_filename(file.filename)
         temp_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], str(uuid.uuid4()))
         os.makedirs(temp_dir, exist_ok=True)
+        get_temp_reaper().register(temp_dir, DOWNLOAD_TTL)
         
         input_path = os.path.join(temp_dir, filename)
         output_filename = os.path.splitext(filename)[0] + '.docx'
@@ -82,21 +119,46 @@ def convert_document():
         # Save uploaded file
         file.save(input_path)
         
-        # Get conversion options
-        options = request.form.get('options', '{}')
+        # Reject malformed options up front rather than failing mid-conversion
         try:
-            options = json.loads(options)
-        except:
-            options = {}
+            options = _conversion_options()
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
             
-        # Initialize converter with options
-        converter = DocumentConverter()
+        # Re-uploads of the same document are served from the conversion cache
+        cache = get_conversion_cache()
+        cache_key = cache.make_key(input_path, 'docx', options)
         
-        # Perform conversion
-        result = converter.convert(input_path, output_path)
+        # Async mode hands the conversion to the job workers and returns at once
+        if request.form.get('async', '').lower() in ('1', 'true', 'yes'):
+            job_id = get_job_queue().submit(
+                input_path,
+                output_path,
+                'docx',
+                options=options,
+                cache_key=cache_key,
+                owner=_api_key_owner()
+            )
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f"https://{current_app.config['SERVER_NAME']}/api/v1/jobs/{job_id}",
+                'result_url': f"https://{current_app.config['SERVER_NAME']}/api/v1/jobs/{job_id}/result"
+            }), 202
         
-        if not result or not os.path.exists(output_path):
-            return jsonify({'error': 'Conversion failed'}), 500
+        if not cache.get(cache_key, output_path):
+            # Perform conversion in a pre-warmed converter worker
+            try:
+                result = get_converter_pool().convert(input_path, output_path, options=options)
+            except ConversionOptionsError as e:
+                # e.g. the selected pages do not exist in this document
+                return jsonify({'error': str(e)}), 400
+            
+            if not result or not os.path.exists(output_path):
+                return jsonify({'error': 'Conversion failed'}), 500
+            
+            cache.put(cache_key, output_path)
             
         # Return download URL or file content based on configuration
         download_url = f"https://{current_app.config['SERVER_NAME']}/api/v1/download/{os.path.basename(temp_dir)}/{output_filename}"
@@ -105,7 +167,7 @@ def convert_document():
             'success': True,
             'download_url': download_url,
             'filename': output_filename,
-            'expires_in': 3600  # URL expires in 1 hour
+            'expires_in': DOWNLOAD_TTL  # URL expires in 1 hour
         })
         
     except Exception as e:
@@ -137,11 +199,55 @@ def download_file(token, filename):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@business_api.route('/api/v1/jobs/<job_id>')
+@require_api_key
+def job_status(job_id):
+    """Get the status of an asynchronous conversion job"""
+    try:
+        job = get_job_queue().get(job_id)
+        if not job or job['owner'] != _api_key_owner():
+            return jsonify({'error': 'Job not found'}), 404
+            
+        return jsonify(job_to_dict(job))
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@business_api.route('/api/v1/jobs/<job_id>/result')
+@require_api_key
+def job_result(job_id):
+    """Download the output of a finished conversion job"""
+    try:
+        job = get_job_queue().get(job_id)
+        if not job or job['owner'] != _api_key_owner():
+            return jsonify({'error': 'Job not found'}), 404
+            
+        if job['status'] == 'failed':
+            return jsonify({'error': job['error'] or 'Conversion failed'}), 500
+            
+        if job['status'] != 'finished':
+            return jsonify(job_to_dict(job)), 409
+            
+        if not os.path.exists(job['output_path']):
+            return jsonify({'error': 'File not found'}), 404
+            
+        return send_file(
+            job['output_path'],
+            as_attachment=True,
+            download_name=os.path.basename(job['output_path'])
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @business_api.route('/api/v1/batch/convert', methods=['POST'])
 @require_api_key
 def batch_convert():
     """
     Convert multiple documents in a single request
+    
+    The files are converted before the response is sent, so the request stays
+    open for the whole batch; use async /api/v1/convert jobs for long documents.
     ---
     parameters:
       - name: files[]
@@ -155,7 +261,7 @@ def batch_convert():
         in: formData
         type: object
         required: false
-        description: Conversion options
+        description: 'Conversion options as JSON: pages (e.g. "1-3,5"), max_pages, first_n_preview'
     """
     try:
         if 'files[]' not in request.files:
@@ -165,21 +271,98 @@ def batch_convert():
         if not files:
             return jsonify({'error': 'No files selected'}), 400
             
-        # Process each file
-        results = []
-        for file in files:
-            # Similar conversion logic as single file endpoint
-            # but collect results for batch response
-            pass
+        # Malformed options would fail every file, so reject the whole batch
+        try:
+            options = _conversion_options()
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+            
+        # Save every upload under one batch token; each file gets its own
+        # numbered directory so duplicate names do not collide
+        token = str(uuid.uuid4())
+        batch_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], token)
+        os.makedirs(batch_dir, exist_ok=True)
+        get_temp_reaper().register(batch_dir, DOWNLOAD_TTL)
+        # One result per upload, at the upload's position; converted files fill theirs in below
+        results = [None] * len(files)
+        items = []
+        positions = []
+        for index, file in enumerate(files):
+            filename = secure_filename(file.filename or '')
+            if not filename.lower().endswith('.pdf'):
+                results[index] = {
+                    'filename': file.filename,
+                    'success': False,
+                    'error': 'Only PDF files are supported',
+                    'duration': 0.0,
+                    'cached': False,
+                    'output': None
+                }
+                continue
+                
+            file_dir = os.path.join(batch_dir, str(index))
+            os.makedirs(file_dir, exist_ok=True)
+            input_path = os.path.join(file_dir, filename)
+            file.save(input_path)
+            items.append((
+                filename,
+                input_path,
+                os.path.join(file_dir, os.path.splitext(filename)[0] + '.docx')
+            ))
+            positions.append(index)
             
+        # Convert on the bounded process pool, blocking this request until all are done
+        started = time.time()
+        converted = convert_batch(
+            items,
+            get_converter_pool(),
+            cache=get_conversion_cache(),
+            options=options
+        )
+        
+        for index, result in zip(positions, converted):
+            output_path = result.pop('output_path')
+            result['output'] = os.path.basename(output_path) if result['success'] else None
+            results[index] = result
+        succeeded = sum(1 for result in results if result['success'])
+        
         return jsonify({
-            'success': True,
-            'results': results
+            'success': succeeded > 0,
+            'total': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'duration': round(time.time() - started, 3),
+            'results': results,
+            'download_url': f"https://{current_app.config['SERVER_NAME']}/api/v1/batch/{token}/download" if succeeded else None,
+            'expires_in': DOWNLOAD_TTL  # URL expires in 1 hour
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@business_api.route('/api/v1/batch/<token>/download')
+@require_api_key
+def download_batch(token):
+    """Stream a ZIP archive of every converted file in a batch"""
+    try:
+        batch_dir = batch_directory(current_app.config['UPLOAD_FOLDER'], token)
+        if batch_dir is None:
+            return jsonify({'error': 'Batch not found'}), 404
+            
+        # Outputs in upload order, with duplicate archive names made unique
+        entries = batch_entries(batch_dir)
+        if not entries:
+            return jsonify({'error': 'File not found'}), 404
+            
+        return Response(
+            stream_zip(entries),
+            mimetype='application/zip',
+            headers={'Content-Disposition': 'attachment; filename=converted.zip'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @business_api.route('/api/v1/status', methods=['GET'])
 @require_api_key
 def api_status():
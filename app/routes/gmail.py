@@ -1,7 +1,4 @@
 from flask import Blueprint, redirect, url_for, session, request, render_template, current_app
-from google_auth_oauthlib.flow import Flow
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from werkzeug.exceptions import BadRequest as BadRequestError
 import os
 from dotenv import load_dotenv
@@ -41,6 +38,9 @@ def integration():
 def connect_gmail():
     """Initiate Gmail connection flow"""
     try:
+        # The Google client libraries are only loaded by the Gmail routes that use them
+        from google_auth_oauthlib.flow import Flow
+        
         # Create OAuth2 flow instance
         flow = Flow.from_client_secrets_file(
             get_client_secrets_file(),
@@ -70,6 +70,8 @@ def oauth2callback():
         if 'state' not in session:
             raise BadRequestError('Invalid state parameter')
 
+        from google_auth_oauthlib.flow import Flow
+        
         # Get flow instance
         flow = Flow.from_client_secrets_file(
             get_client_secrets_file(),
@@ -99,6 +101,9 @@ def dashboard():
         return redirect(url_for('gmail.integration'))
     
     try:
+        from google.oauth2.credentials import Credentials
+        from googleapiclient.discovery import build
+        
         credentials = Credentials(**session['gmail_credentials'])
         service = build('gmail', 'v1', credentials=credentials)
         
@@ -0,0 +1,39 @@
+"""
+Conversion stage metrics.
+
+The histograms live in each web process, so behind several web workers a
+scrape of /metrics only sees the conversions that one worker waited for.
+Scrape every worker (or run a single worker per scrape target) and sum the
+series in Prometheus.
+"""
+import os
+import hmac
+from flask import Blueprint, Response, request, g, current_app, abort
+from ..services.metrics import STAGE_METRICS, server_timing_header
+
+metrics = Blueprint('metrics', __name__)
+
+# Bearer token scrapers must send; without one /metrics only answers local requests
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+def _metrics_allowed():
+    token = current_app.config.get('METRICS_TOKEN', METRICS_TOKEN)
+    if token:
+        supplied = request.headers.get('Authorization', '')
+        return hmac.compare_digest(supplied.encode('utf-8'), f'Bearer {token}'.encode('utf-8'))
+    return request.remote_addr in ('127.0.0.1', '::1')
+
+@metrics.route('/metrics')
+def export_metrics():
+    """Conversion stage histograms of this process in Prometheus text format"""
+    if not _metrics_allowed():
+        abort(404)
+    return Response(STAGE_METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+@metrics.after_app_request
+def add_stage_timings(response):
+    """Return the request's per-stage conversion breakdown when the client asks for it"""
+    totals = g.get('stage_timings')
+    if totals and request.headers.get('X-Stage-Timings'):
+        response.headers['Server-Timing'] = server_timing_header(totals)
+    return response
@@ -1,4 +1,3 @@
-import spacy
 import fitz
 import numpy as np
 from collections import defaultdict
@@ -9,7 +8,8 @@ logger = logging.getLogger(__name__)
 class DocumentAIDetector:
     def __init__(self):
         try:
-            # Load English language model
+            # Load English language model (spaCy is only imported when a detector is built)
+            import spacy
             self.nlp = spacy.load("en_core_web_sm")
             logger.info("Initialized spaCy model")
         except Exception as e:
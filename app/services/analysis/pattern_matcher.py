@@ -1,5 +1,4 @@
 from collections import defaultdict
-import numpy as np
 from datetime import datetime
 import logging
 
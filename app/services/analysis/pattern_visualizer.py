@@ -1,7 +1,3 @@
-import matplotlib
-matplotlib.use('Agg')  # Set the backend to Agg before importing pyplot
-import matplotlib.pyplot as plt
-import seaborn as sns
 from collections import Counter, defaultdict
 import json
 import os
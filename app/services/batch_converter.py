@@ -0,0 +1,141 @@
+import os
+import uuid
+import logging
+import zipfile
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from .converter_pool import _pool_convert
+from .metrics import record_stage_timings
+
+logger = logging.getLogger(__name__)
+
+# Size of the pieces the ZIP stream is flushed in
+ZIP_CHUNK_SIZE = 64 * 1024
+
+def convert_batch(items, pool, cache=None, options=None):
+    """
+    Convert (filename, input_path, output_path) items on a ConverterPool, whose
+    size bounds the concurrency. Returns one result dict per item, in input order.
+    
+    This blocks until every item is done, so a request handler calling it holds
+    its thread for the whole batch; large batches belong on the job queue.
+    """
+    results = [None] * len(items)
+    pending = {}
+
+    for index, (filename, input_path, output_path) in enumerate(items):
+        cache_key = cache.make_key(input_path, 'docx', options) if cache else None
+        results[index] = {
+            'filename': filename,
+            'output_path': output_path,
+            'cache_key': cache_key
+        }
+        if cache and cache.get(cache_key, output_path):
+            results[index].update(success=True, error=None, duration=0.0, cached=True)
+        else:
+            pending[index] = (input_path, output_path)
+
+    def finish(index, future):
+        try:
+            success, spans = future.result()
+            record_stage_timings(spans)
+            success = success and os.path.exists(results[index]['output_path'])
+            error = None if success else 'Conversion failed'
+            # Worker-side conversion time, without the wait for a free worker
+            duration = sum(spans.get('convert', []))
+        except Exception as e:
+            logger.warning(f"Batch conversion of {results[index]['filename']} failed: {str(e)}")
+            success, error, duration = False, str(e), 0.0
+
+        results[index].update(success=success, error=error, duration=duration, cached=False)
+        if success and cache:
+            cache.put(results[index]['cache_key'], results[index]['output_path'])
+
+    if pending:
+        futures = {
+            pool.submit(_pool_convert, input_path, output_path, 'docx', options): index
+            for index, (input_path, output_path) in pending.items()
+        }
+        broken = []
+        for future in as_completed(futures):
+            if isinstance(future.exception(), BrokenProcessPool):
+                # A crashed worker breaks the pool and fails every file still in it
+                broken.append(futures[future])
+            else:
+                finish(futures[future], future)
+
+        # Retry those files one at a time (each submit replaces a broken pool), so
+        # only the file that crashes its worker fails
+        for index in sorted(broken):
+            input_path, output_path = pending[index]
+            finish(index, pool.submit(_pool_convert, input_path, output_path, 'docx', options))
+
+    for result in results:
+        result['duration'] = round(result['duration'], 3)
+        del result['cache_key']
+    return results
+
+def batch_directory(upload_folder, token):
+    """Return the directory of a batch download token, or None if the token is not valid"""
+    try:
+        token = str(uuid.UUID(token))
+    except (TypeError, ValueError):
+        return None
+    batch_dir = os.path.join(upload_folder, token)
+    return batch_dir if os.path.isdir(batch_dir) else None
+
+def batch_entries(batch_dir):
+    """(arcname, path) of every converted file in a batch, in upload order with unique names"""
+    entries = []
+    seen = set()
+    # Each upload has its own numbered directory, so duplicate names are renamed
+    file_dirs = sorted((d for d in os.listdir(batch_dir) if d.isdigit()), key=int)
+    for file_dir in file_dirs:
+        for name in sorted(os.listdir(os.path.join(batch_dir, file_dir))):
+            if not name.endswith('.docx'):
+                continue
+            arcname = name
+            if arcname in seen:
+                arcname = f"{os.path.splitext(name)[0]}_{file_dir}.docx"
+            seen.add(arcname)
+            entries.append((arcname, os.path.join(batch_dir, file_dir, name)))
+    return entries
+
+class _ZipStream:
+    """Write-only buffer that lets zipfile stream into a generator"""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def stream_zip(entries):
+    """Yield a ZIP archive of (arcname, path) entries without building it in memory"""
+    buffer = _ZipStream()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for arcname, path in entries:
+            with open(path, 'rb') as source, archive.open(arcname, 'w') as target:
+                for chunk in iter(lambda: source.read(ZIP_CHUNK_SIZE), b''):
+                    target.write(chunk)
+                    data = buffer.pop()
+                    if data:
+                        yield data
+    # Remaining entry trailers and the central directory
+    data = buffer.pop()
+    if data:
+        yield data
@@ -0,0 +1,125 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from time import perf_counter
+from flask import current_app
+from .converter import CONVERTER_VERSION
+from .metrics import record_stage_timings
+
+logger = logging.getLogger(__name__)
+
+# Default upper bound for the on-disk cache (512 MB)
+DEFAULT_MAX_BYTES = int(os.environ.get('CONVERSION_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# Serializes creation of the application's cache
+_cache_lock = threading.Lock()
+
+class ConversionCache:
+    """Content-addressed, size-bounded LRU cache of conversion outputs on disk"""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(input_path, target_format=None, options=None):
+        """Key on the input bytes, target format, options and converter version"""
+        started = perf_counter()
+        digest = hashlib.sha256()
+        with open(input_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+
+        # Options are normalised so key order in the request does not matter
+        settings = json.dumps({
+            'format': (target_format or 'docx').lower(),
+            'options': options or {},
+            'version': CONVERTER_VERSION
+        }, sort_keys=True, default=str)
+        digest.update(settings.encode('utf-8'))
+        record_stage_timings({'cache_key': [perf_counter() - started]})
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key, dest_path):
+        """Copy a cached output to dest_path; returns False on a miss"""
+        entry = self._entry_path(key)
+        started = perf_counter()
+        try:
+            # A copy, not a hard link, so edits to the served output never reach the entry
+            shutil.copyfile(entry, dest_path)
+            # Touch the entry so eviction treats it as recently used
+            os.utime(entry, None)
+            # Hits skip the converter, so time them here to keep hit latency in the histograms
+            record_stage_timings({'cache_hit': [perf_counter() - started]})
+            logger.debug(f"Conversion cache hit for {key}")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Error reading conversion cache entry {key}: {str(e)}")
+            return False
+
+    def put(self, key, output_path):
+        """Store a finished output under key and evict least recently used entries"""
+        try:
+            # Write to a temp name first so readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-')
+            os.close(fd)
+            shutil.copyfile(output_path, temp_path)
+            os.replace(temp_path, self._entry_path(key))
+            self._evict()
+        except Exception as e:
+            logger.warning(f"Error storing conversion cache entry {key}: {str(e)}")
+
+    def _evict(self):
+        """Delete the least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_file() or entry.name.startswith('.tmp-'):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+
+def get_conversion_cache():
+    """Return the application's conversion cache, creating it on first use"""
+    cache = current_app.extensions.get('conversion_cache')
+    if cache is None:
+        with _cache_lock:
+            # Concurrent first requests must share one cache and its eviction lock
+            cache = current_app.extensions.get('conversion_cache')
+            if cache is None:
+                cache_dir = current_app.config.get(
+                    'CONVERSION_CACHE_DIR',
+                    os.path.join(current_app.root_path, 'temp', 'cache')
+                )
+                cache = ConversionCache(
+                    cache_dir,
+                    current_app.config.get('CONVERSION_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+                )
+                current_app.extensions['conversion_cache'] = cache
+    return cache
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from flask import current_app
+from .conversion_cache import get_conversion_cache
+from .converter_pool import get_converter_pool
+from .temp_reaper import get_temp_reaper
+
+logger = logging.getLogger(__name__)
+
+# Number of jobs converted at once per web process (on the shared converter pool)
+JOB_WORKERS = int(os.environ.get('CONVERSION_JOB_WORKERS', 2))
+
+# A claimed job is leased to its worker for this long and the worker renews the lease
+# while the conversion runs; jobs whose lease expired (the worker died) are requeued
+JOB_LEASE_SECONDS = int(os.environ.get('CONVERSION_JOB_LEASE_SECONDS', 60))
+JOB_HEARTBEAT_INTERVAL = JOB_LEASE_SECONDS / 3
+
+# Job directories are kept this long while the job waits and runs, and for
+# JOB_RESULT_TTL after it finishes so the client can download the result
+JOB_PENDING_TTL = 24 * 3600
+JOB_RESULT_TTL = 3600
+
+# How often idle workers look for jobs submitted by other processes
+JOB_POLL_INTERVAL = 1.0
+
+# Serializes creation of the application's job queue
+_queue_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    owner TEXT,
+    status TEXT NOT NULL,
+    input_path TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    target_format TEXT NOT NULL,
+    options TEXT,
+    cache_key TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease TEXT,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+class ConversionJobQueue:
+    """SQLite-backed conversion job queue whose jobs are converted on a ConverterPool"""
+
+    def __init__(self, db_path, pool, workers=JOB_WORKERS, cache=None, reaper=None, result_ttl=JOB_RESULT_TTL):
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.reaper = reaper
+        self.result_ttl = result_ttl
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._pool = pool
+        self._threads = []
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            # Queues created before jobs were leased lack the lease columns
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+            for column, column_type in (('lease', 'TEXT'), ('lease_expires_at', 'REAL')):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {column_type}')
+
+    def _connect(self):
+        # Autocommit mode; claim() opens its own write transaction
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def submit(self, input_path, output_path, target_format='docx', options=None, cache_key=None, owner=None):
+        """Queue a conversion and return its job id
+        
+        The output's directory is kept until result_ttl seconds after the job finishes.
+        """
+        job_id = uuid.uuid4().hex
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, owner, status, input_path, output_path, target_format, options, cache_key, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (job_id, owner, 'queued', input_path, output_path, target_format,
+                 json.dumps(options or {}), cache_key, time.time())
+            )
+        self._keep(output_path, JOB_PENDING_TTL)
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def _keep(self, output_path, ttl):
+        """(Re)schedule deletion of a job's directory ttl seconds from now"""
+        if self.reaper is not None:
+            self.reaper.register(os.path.dirname(output_path), ttl)
+
+    def get(self, job_id):
+        """Return the job row as a dict, or None"""
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def claim(self):
+        """Atomically lease the oldest queued job (or running job whose lease expired) to this worker"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < ?)) "
+                "ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            job = dict(row, status='running', started_at=now, lease=uuid.uuid4().hex,
+                       lease_expires_at=now + JOB_LEASE_SECONDS)
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, lease = ?, lease_expires_at = ? WHERE id = ?",
+                (now, job['lease'], job['lease_expires_at'], job['id'])
+            )
+            conn.execute('COMMIT')
+            return job
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def renew(self, job):
+        """Extend the lease on a claimed job; returns False if another worker has taken it over"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND lease = ? AND status = 'running'",
+                (time.time() + JOB_LEASE_SECONDS, job['id'], job['lease'])
+            )
+        return cursor.rowcount == 1
+
+    def _finish(self, job, error=None):
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL '
+                'WHERE id = ? AND lease = ?',
+                ('failed' if error else 'finished', error, time.time(), job['id'], job['lease'])
+            )
+        if cursor.rowcount == 1:
+            self._keep(job['output_path'], self.result_ttl)
+        else:
+            logger.warning(f"Conversion job {job['id']} lost its lease before finishing")
+
+    def start(self):
+        """Start the worker threads if they are not running yet"""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work_loop,
+                    name=f'conversion-job-{i}',
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def shutdown(self):
+        """Stop the worker threads after their current job; the pool belongs to the caller"""
+        self._stopping.set()
+        self._wakeup.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join()
+
+    def _work_loop(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.claim()
+            except Exception as e:
+                logger.warning(f"Error claiming conversion job: {str(e)}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(JOB_POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+
+            self._run(job)
+
+    def _run(self, job):
+        """Convert one claimed job on the process pool and record the outcome"""
+        try:
+            if self.cache and job['cache_key'] and self.cache.get(job['cache_key'], job['output_path']):
+                self._finish(job)
+                return
+
+            # Heartbeat: keep renewing the lease for as long as the conversion runs
+            success = self._pool.convert(
+                job['input_path'], job['output_path'], job['target_format'],
+                json.loads(job['options'] or '{}'),
+                heartbeat=lambda: self.renew(job),
+                heartbeat_interval=JOB_HEARTBEAT_INTERVAL
+            )
+
+            if not success or not os.path.exists(job['output_path']):
+                self._finish(job, 'Conversion failed')
+                return
+
+            if self.cache and job['cache_key']:
+                self.cache.put(job['cache_key'], job['output_path'])
+            self._finish(job)
+
+        except Exception as e:
+            logger.warning(f"Conversion job {job['id']} failed: {str(e)}")
+            self._finish(job, str(e))
+
+def job_to_dict(job):
+    """Public view of a job row for API responses"""
+    return {
+        'job_id': job['id'],
+        'status': job['status'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at']
+    }
+
+def get_job_queue():
+    """Return the application's conversion job queue, creating it on first use"""
+    queue = current_app.extensions.get('conversion_jobs')
+    if queue is None:
+        with _queue_lock:
+            # Concurrent first requests must not each start a set of worker threads
+            queue = current_app.extensions.get('conversion_jobs')
+            if queue is None:
+                db_path = current_app.config.get(
+                    'CONVERSION_JOBS_DB',
+                    os.path.join(current_app.root_path, 'temp', 'jobs.sqlite3')
+                )
+                queue = ConversionJobQueue(
+                    db_path,
+                    get_converter_pool(),
+                    current_app.config.get('CONVERSION_JOB_WORKERS', JOB_WORKERS),
+                    cache=get_conversion_cache(),
+                    reaper=get_temp_reaper(),
+                    result_ttl=current_app.config.get('CONVERSION_JOB_RESULT_TTL', JOB_RESULT_TTL)
+                )
+                current_app.extensions['conversion_jobs'] = queue
+    return queue
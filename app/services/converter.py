@@ -3,43 +3,422 @@ from docx import Document
 from docx.shared import Pt, Cm, Inches, RGBColor
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_LINE_SPACING
 from docx.enum.section import WD_ORIENTATION, WD_SECTION_START
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+from docx.oxml.ns import qn, nsdecls
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.shape import CT_Inline
 import os
 import logging
-from datetime import datetime
-from flask import current_app
-import numpy as np
-import cv2
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import tempfile
-from PIL import Image
+import time
+import multiprocessing
+import threading
 import io
 import re
-from collections import defaultdict
+import importlib
+import importlib.util
+from functools import wraps
+from collections import Counter, defaultdict, deque
 from .analysis.pattern_matcher import PatternMatcher
+from .page_model import TEXT_BLOCK, build_blocks
+from .ooxml_writer import OoxmlDocument
 import subprocess
 import shutil
 from statistics import StatisticsError, mode, mean
 import json
 
-# Add new imports for the hybrid approach
-try:
-    from pdf2docx import Converter as Pdf2DocxConverter
-    PDF2DOCX_AVAILABLE = True
-except ImportError:
-    PDF2DOCX_AVAILABLE = False
-    
-try:
-    import camelot
-    CAMELOT_AVAILABLE = False
-except ImportError:
-    CAMELOT_AVAILABLE = False
+class _LazyModule:
+    """Stand-in for a module that imports it on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# numpy is only needed once layout analysis runs, not when the web app starts
+np = _LazyModule('numpy')
+
+# Optional engines for the hybrid approach. Only their presence is checked here;
+# pdf2docx (and the numpy/OpenCV stack behind it) is imported on first use
+PDF2DOCX_AVAILABLE = importlib.util.find_spec('pdf2docx') is not None
+
+# Camelot-enhanced table extraction is disabled; camelot is imported on demand
+CAMELOT_AVAILABLE = False
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-class DocumentConverter:
+# Bump whenever conversion output changes so cached results are not reused
+CONVERTER_VERSION = '1.4.0'
+
+# Image encodings python-docx can embed as-is; anything else is re-encoded as PNG
+DOCX_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tif', 'tiff'}
+
+# Worker processes used for per-page layout analysis (0 or 1 disables the pool)
+PAGE_WORKERS = int(os.environ.get('CONVERTER_PAGE_WORKERS', 0))
+# Documents shorter than this are analysed in-process; pool start-up would dominate
+PARALLEL_MIN_PAGES = 8
+# Pages handed to each text extraction worker at a time
+TEXT_CHUNK_PAGES = 64
+
+# Seconds the pdf2docx candidate may run in _convert_with_multiple_engines
+ENGINE_TIMEOUT = int(os.environ.get('CONVERTER_ENGINE_TIMEOUT', 120))
+# Processes kept per converter process for the pdf2docx candidate, started on first use
+ENGINE_WORKERS = int(os.environ.get('CONVERTER_ENGINE_WORKERS', 1))
+_engine_pools = {}
+_engine_pool_lock = threading.Lock()
+
+# From this many pages the standard engine renders through the OOXML writer and streams
+# each rendered page to a spool file instead of holding the whole document in memory
+STREAM_MIN_PAGES = int(os.environ.get('CONVERTER_STREAM_MIN_PAGES', 100))
+
+# Table style referenced by every layout table: no borders and fixed 3pt (60 dxa) cell
+# margins. It is added to each output document once instead of editing every cell.
+LAYOUT_TABLE_STYLE = 'Layout Table'
+LAYOUT_TABLE_STYLE_XML = (
+    f'<w:style {nsdecls("w")} w:type="table" w:customStyle="1" w:styleId="LayoutTable">'
+    '<w:name w:val="Layout Table"/><w:basedOn w:val="TableNormal"/><w:uiPriority w:val="99"/>'
+    '<w:tblPr><w:tblBorders>'
+    + ''.join(f'<w:{side} w:val="nil"/>' for side in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'))
+    + '</w:tblBorders><w:tblCellMar>'
+    + ''.join(f'<w:{side} w:w="60" w:type="dxa"/>' for side in ('top', 'left', 'bottom', 'right'))
+    + '</w:tblCellMar></w:tblPr></w:style>'
+)
+# Direct table formatting that would override the layout table style
+TABLE_BORDERS_XPATH = './w:tblPr/w:tblBorders | .//w:tcPr/w:tcBorders'
+
+# Styled DOCX templates kept per process, keyed by (base font, body size, header sizes)
+TEMPLATE_CACHE_SIZE = 32
+_styled_templates = {}
+
+# Patterns used by page layout analysis, compiled once per process
+EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+PHONE_PATTERN = re.compile(r'(?:\+|00)?[0-9()\s-]{7,}')
+# List markers at the start of a line: symbols, dashes, "1.", "a)" and "(1)"
+BULLET_PATTERN = re.compile(r'^\s*(?:[•⦁◦·○●◆⬤✦]|[-–—]|\d+\.|[a-zA-Z]\)|\(\d+\))\s')
+# Skill ratings: filled/empty symbols, meter bars, blocks, "8/10" and "4 out of 5"
+RATING_PATTERN = re.compile(
+    r'[●○★☆■□]{3,}|[\|│]{3,}|[▮▯]{2,}|[0-9]+\s*\/\s*[0-9]+|[0-9]+\s*out of\s*[0-9]+'
+)
+# Resume section headings, English and Swedish
+RESUME_SECTION_PATTERN = re.compile(
+    r'^(?:EDUCATION|EXPERIENCE|SKILLS|WORK HISTORY|EMPLOYMENT|PROFILE|SUMMARY|OBJECTIVE|QUALIFICATIONS'
+    r'|UTBILDNING|ARBETSLIVSERFARENHET|FÄRDIGHETER|PROFIL)$',
+    re.IGNORECASE
+)
+LAYOUT_RESUME_KEYWORDS = (
+    'RESUME', 'CV', 'CURRICULUM VITAE', 'PROFILE', 'EXPERIENCE', 'EDUCATION', 'SKILLS',
+    'WORK HISTORY', 'EMPLOYMENT', 'KONTAKT', 'PROFIL', 'UTBILDNING', 'ARBETSLIVSERFARENHET',
+    'SUMMARY', 'OBJECTIVE', 'QUALIFICATIONS', 'CAREER HIGHLIGHTS', 'CERTIFICATIONS'
+)
+
+class StageTimings:
+    """Wall-clock durations of conversion stages, one entry per span"""
+
+    def __init__(self):
+        self.spans = defaultdict(list)
+        self._active = set()
+
+    @contextmanager
+    def span(self, stage):
+        # Nested spans of the same stage (e.g. a multi-column page falling back
+        # to single-column processing) are timed once by the outermost span
+        if stage in self._active:
+            yield
+            return
+        self._active.add(stage)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[stage].append(time.perf_counter() - started)
+            self._active.discard(stage)
+
+    def merge(self, spans):
+        """Add spans recorded by a worker process"""
+        for stage, durations in spans.items():
+            self.spans[stage].extend(durations)
+
+    def totals(self):
+        return {stage: sum(durations) for stage, durations in self.spans.items()}
+
+def timed_stage(stage):
+    """Record every call of a DocumentConverter method as a span of the given stage"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.timings.span(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+class PageSnapshot:
+    """Per-page extraction results computed lazily and shared by every conversion stage"""
+
+    def __init__(self, page):
+        self.page = page
+        self.number = page.number
+        self.rect = page.rect
+        self.width = page.rect.width
+        self.height = page.rect.height
+        self._blocks = None
+        self._text_blocks = None
+        self._text = None
+        self._drawings = None
+        self._images = None
+        self._image_bboxes = None
+        # Result of DocumentConverter._analyze_page_layout, computed once per page
+        self.layout_info = None
+
+    @property
+    def blocks(self):
+        """All blocks as page_model.Block objects, extracted once"""
+        if self._blocks is None:
+            self._blocks = build_blocks(self.page)
+        return self._blocks
+
+    @property
+    def text_blocks(self):
+        """Text blocks only; callers must not mutate this list"""
+        if self._text_blocks is None:
+            self._text_blocks = [b for b in self.blocks if b.type == TEXT_BLOCK]
+        return self._text_blocks
+
+    @property
+    def text(self):
+        """Plain page text from page.get_text()"""
+        if self._text is None:
+            self._text = self.page.get_text()
+        return self._text
+
+    @property
+    def drawings(self):
+        """Vector drawings from page.get_drawings()"""
+        if self._drawings is None:
+            self._drawings = self.page.get_drawings()
+        return self._drawings
+
+    @property
+    def images(self):
+        """Image list from page.get_images(full=True)"""
+        if self._images is None:
+            self._images = self.page.get_images(full=True)
+        return self._images
+
+    def image_bbox(self, xref):
+        """Return the first placement rectangle of an image on this page, if any"""
+        if self._image_bboxes is None:
+            self._image_bboxes = {}
+            try:
+                for info in self.page.get_image_info(xrefs=True):
+                    self._image_bboxes.setdefault(info.get("xref"), info.get("bbox"))
+            except Exception as e:
+                logger.debug(f"Error reading image placements: {str(e)}")
+        return self._image_bboxes.get(xref)
+
+    def preload(self, page_record):
+        """Adopt the text blocks and layout computed by a page-analysis worker process"""
+        self._text_blocks = page_record['text_blocks']
+        self.layout_info = page_record['layout_info']
+
+class LayoutSummary:
+    """Document-wide layout style, updated as each page's layout is analysed"""
+
     def __init__(self):
+        self.pages = 0
+        self.layout_types = {}
+        self.font_sizes = {}
+        self.bullet_styles = set()
+        self.has_ratings = False
+        self.is_resume = False
+
+    def add(self, layout_info):
+        """Fold one page's layout analysis into the summary"""
+        self.pages += 1
+        layout_type = layout_info.get('type', 'single_column')
+        self.layout_types[layout_type] = self.layout_types.get(layout_type, 0) + 1
+        for size, count in layout_info.get('font_sizes', {}).items():
+            self.font_sizes[size] = self.font_sizes.get(size, 0) + count
+        self.bullet_styles.update(layout_info.get('bullet_styles', set()))
+        self.has_ratings = self.has_ratings or bool(layout_info.get('has_ratings', False))
+        self.is_resume = self.is_resume or bool(layout_info.get('is_resume', False))
+
+    def global_layout(self):
+        """The global layout dict used for document styles and per-page layout overrides"""
+        if not self.pages:
+            return {}
+        
+        global_layout = {
+            'layout_type': 'single_column',
+            'consistent_layout_type': False,
+            'header_font_sizes': [],
+            'body_font_size': 11,
+            'base_font': 'Calibri',
+            'bullet_styles': set(self.bullet_styles),
+            'has_ratings': self.has_ratings,
+            'is_resume': self.is_resume
+        }
+        
+        # Dominant layout type, and whether every page agrees on it
+        dominant_type, count = max(self.layout_types.items(), key=lambda x: x[1])
+        global_layout['layout_type'] = dominant_type
+        global_layout['consistent_layout_type'] = count == self.pages
+        
+        # Body font size is the most common size; headers are the three largest above it
+        if self.font_sizes:
+            body_font_size = max(self.font_sizes.items(), key=lambda x: x[1])[0]
+            header_sizes = sorted((size for size in self.font_sizes if size > body_font_size * 1.1), reverse=True)
+            global_layout['body_font_size'] = body_font_size
+            global_layout['header_font_sizes'] = header_sizes[:3]
+        
+        return global_layout
+
+class ConversionOptionsError(ValueError):
+    """Conversion options that are malformed or select no pages"""
+
+def _parse_page_ranges(pages):
+    """Parse 1-based page ranges ("1-3,5,8-" or a list) into (start, end) pairs; end is None if open"""
+    if isinstance(pages, (int, str)):
+        pages = str(pages).split(',')
+    elif not isinstance(pages, (list, tuple)):
+        raise ConversionOptionsError(f"Invalid page range: {pages}")
+    
+    ranges = []
+    for part in pages:
+        part = str(part).strip()
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, _, end = part.partition('-')
+                start = int(start) if start.strip() else 1
+                end = int(end) if end.strip() else None
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ConversionOptionsError(f"Invalid page range: {part}")
+        if start < 1 or (end is not None and end < start):
+            raise ConversionOptionsError(f"Invalid page range: {part}")
+        ranges.append((start, end))
+    return ranges
+
+def _positive_int_option(options, name):
+    value = options.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        value = 0
+    if value < 1:
+        raise ConversionOptionsError(f"{name} must be a positive integer")
+    return value
+
+def parse_page_options(options=None):
+    """
+    Validate the pages, max_pages and first_n_preview options without the document.
+    Returns (page ranges or None for every page, first_n_preview, max_pages).
+    """
+    options = options or {}
+    ranges = None
+    if options.get('pages') not in (None, '', []):
+        ranges = _parse_page_ranges(options['pages'])
+    return ranges, _positive_int_option(options, 'first_n_preview'), _positive_int_option(options, 'max_pages')
+
+def select_pages(page_count, options=None):
+    """Resolve the pages, max_pages and first_n_preview options to 0-based page numbers"""
+    ranges, first_n_preview, max_pages = parse_page_options(options)
+    
+    if ranges is None:
+        selected = list(range(page_count))
+    else:
+        pages = set()
+        for start, end in ranges:
+            pages.update(range(start - 1, page_count if end is None else min(end, page_count)))
+        selected = sorted(pages)
+    
+    # Preview mode keeps only the document's leading pages
+    if first_n_preview is not None:
+        selected = [page_num for page_num in selected if page_num < first_n_preview]
+    
+    if max_pages is not None:
+        selected = selected[:max_pages]
+    
+    if page_count and not selected:
+        raise ConversionOptionsError("No pages selected for conversion")
+    return selected
+
+class ConversionContext:
+    """Owns the single fitz.Document opened for one conversion request"""
+
+    def __init__(self, input_path, options=None):
+        self.input_path = input_path
+        self.options = options or {}
+        self.pdf = fitz.open(input_path)
+        self._snapshots = {}
+        
+        # Pages to convert, in order (every page unless the options narrow it)
+        try:
+            self.page_numbers = select_pages(self.pdf.page_count, self.options)
+        except Exception:
+            self.pdf.close()
+            raise
+
+    @property
+    def page_count(self):
+        """Number of pages being converted"""
+        return len(self.page_numbers)
+
+    @property
+    def is_partial(self):
+        return len(self.page_numbers) < self.pdf.page_count
+
+    def snapshot(self, page_num):
+        """Return the shared PageSnapshot for a page, creating it on first use"""
+        snapshot = self._snapshots.get(page_num)
+        if snapshot is None:
+            snapshot = PageSnapshot(self.pdf[page_num])
+            self._snapshots[page_num] = snapshot
+        return snapshot
+
+    def release_snapshot(self, page_num):
+        """Drop a page snapshot (and its memoized layout) once no later stage needs it"""
+        self._snapshots.pop(page_num, None)
+
+    def is_analysed(self, page_num):
+        """Whether the page's layout has been analysed during this conversion"""
+        snapshot = self._snapshots.get(page_num)
+        return snapshot is not None and snapshot.layout_info is not None
+
+    def close(self):
+        self._snapshots.clear()
+        if not self.pdf.is_closed:
+            self.pdf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class DocxFile:
+    """An engine's finished DOCX, kept as bytes and saved as is instead of being loaded"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.data)
+
+class DocumentConverter:
+    def __init__(self, page_workers=None):
         self.color_scheme = None
         self.shape_patterns = None
         self.section_styles = {}
@@ -51,35 +430,19 @@ class DocumentConverter:
             'has_borders': False,
             'has_background_elements': False
         }
+        # DOCX image parts of the document being rendered, keyed by PDF xref
+        self._image_parts = {}
         
-        # Add cleanup of old files
-        self._cleanup_old_files()
-
-    def _cleanup_old_files(self, max_age_hours=24):
-        """Clean up old temporary files"""
-        try:
-            temp_dirs = [
-                os.path.join(current_app.root_path, 'temp', 'uploads'),
-                os.path.join(current_app.root_path, 'temp', 'converted')
-            ]
-            
-            current_time = datetime.now()
-            
-            for temp_dir in temp_dirs:
-                if not os.path.exists(temp_dir):
-                    continue
-                    
-                for filename in os.listdir(temp_dir):
-                    filepath = os.path.join(temp_dir, filename)
-                    file_modified = datetime.fromtimestamp(os.path.getmtime(filepath))
-                    
-                    if (current_time - file_modified).total_seconds() > max_age_hours * 3600:
-                        os.remove(filepath)
-                        
-        except Exception as e:
-            logger.error(f"Error cleaning up temporary files: {str(e)}")
+        # Number of processes used to analyse pages in parallel
+        self.page_workers = PAGE_WORKERS if page_workers is None else page_workers
+        
+        # Time limit for the pdf2docx candidate of multi-engine conversion
+        self.engine_timeout = ENGINE_TIMEOUT
+        
+        # Per-stage timing spans for the conversions run by this converter
+        self.timings = StageTimings()
 
-    def convert(self, input_path, output_path, target_format=None):
+    def convert(self, input_path, output_path, target_format=None, options=None):
         """Convert document to target format using the best available method"""
         try:
             logger.debug(f"Starting conversion from {input_path} to {output_path}")
@@ -92,59 +455,74 @@ class DocumentConverter:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
             # Perform conversion based on target format
-            if target_format is None or target_format.lower() == 'docx':
-                # Use the new hybrid approach for DOCX conversion
-                return self.hybrid_convert_to_docx(input_path, output_path)
-            elif target_format.lower() == 'txt':
-                return self.convert_to_txt(input_path, output_path)
-            else:
-                raise ValueError(f"Unsupported target format: {target_format}")
+            with self.timings.span('convert'):
+                if target_format is None or target_format.lower() == 'docx':
+                    # Use the new hybrid approach for DOCX conversion
+                    return self.hybrid_convert_to_docx(input_path, output_path, options)
+                elif target_format.lower() == 'txt':
+                    return self.convert_to_txt(input_path, output_path, options=options)
+                else:
+                    raise ValueError(f"Unsupported target format: {target_format}")
             
         except Exception as e:
             logger.error(f"Conversion error: {str(e)}")
             raise
             
-    def hybrid_convert_to_docx(self, input_path, output_path):
+    def hybrid_convert_to_docx(self, input_path, output_path, options=None):
         """Hybrid approach for PDF to DOCX conversion using multiple engines"""
-        try:
-            # Step 1: Analyze document to determine type and complexity
-            doc_type, doc_complexity = self._analyze_document_type(input_path)
-            logger.debug(f"Detected document type: {doc_type}, complexity: {doc_complexity}")
-            
-            # Step 2: Choose the best conversion engine based on document type
-            if doc_type == 'resume' and PDF2DOCX_AVAILABLE:
-                # Resumes typically convert better with pdf2docx
-                logger.debug("Using pdf2docx engine for resume conversion")
-                result = self._convert_with_pdf2docx(input_path, output_path)
-            elif doc_type == 'table_heavy' and CAMELOT_AVAILABLE:
-                # Documents with many tables may benefit from camelot + our custom processing
-                logger.debug("Using camelot-enhanced conversion for table-heavy document")
-                result = self._convert_with_camelot_enhanced(input_path, output_path)
-            elif doc_complexity == 'complex':
-                # Try multiple engines and select the best result
-                logger.debug("Complex document detected, trying multiple engines")
-                result = self._convert_with_multiple_engines(input_path, output_path)
-            else:
-                # Use our standard conversion for simple documents
-                logger.debug("Using standard conversion engine")
-                result = self.convert_to_docx(input_path, output_path)
-            
-            # Step 3: Apply specialized post-processing based on document type
-            self._apply_specialized_post_processing(output_path, doc_type)
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Hybrid conversion error: {str(e)}")
-            # Fall back to standard conversion if hybrid approach fails
-            logger.debug("Falling back to standard conversion")
-            return self.convert_to_docx(input_path, output_path)
+        # One parsed document is shared by analysis and every engine below
+        with ConversionContext(input_path, options) as context:
+            try:
+                # Step 1: Analyze document to determine type and complexity
+                doc_type, doc_complexity = self._analyze_document_type(context)
+                logger.debug(f"Detected document type: {doc_type}, complexity: {doc_complexity}")
+                
+                # Large standard-engine renders are streamed page by page to keep memory flat
+                stream = len(context.page_numbers) >= STREAM_MIN_PAGES
+                
+                # Step 2: Choose the best conversion engine based on document type
+                if doc_type == 'resume' and PDF2DOCX_AVAILABLE:
+                    # Resumes typically convert better with pdf2docx
+                    logger.debug("Using pdf2docx engine for resume conversion")
+                    doc = self._convert_with_pdf2docx(context)
+                elif doc_type == 'table_heavy' and CAMELOT_AVAILABLE:
+                    # Documents with many tables may benefit from camelot + our custom processing
+                    logger.debug("Using camelot-enhanced conversion for table-heavy document")
+                    doc = self._convert_with_camelot_enhanced(context)
+                elif doc_complexity == 'complex':
+                    # Try multiple engines and select the best result
+                    logger.debug("Complex document detected, trying multiple engines")
+                    doc = self._convert_with_multiple_engines(context, stream=stream)
+                else:
+                    # Use our standard conversion for simple documents
+                    logger.debug("Using standard conversion engine")
+                    doc = self._render_docx(context, stream=stream)
+                
+                # Step 3: Apply specialized post-processing based on document type. Streamed
+                # pages are already written out and an engine's DOCX file is saved as is
+                if isinstance(doc, (OoxmlDocument, DocxFile)):
+                    logger.debug("Skipping specialized post-processing of a streamed document")
+                else:
+                    self._apply_specialized_post_processing(doc, doc_type)
+                
+                # Step 4: Serialize the finished document exactly once
+                with self.timings.span('save'):
+                    doc.save(output_path)
+                logger.debug(f"Saved document to {output_path}")
+                
+                return True
+                
+            except Exception as e:
+                logger.error(f"Hybrid conversion error: {str(e)}")
+                # Fall back to standard conversion if hybrid approach fails
+                logger.debug("Falling back to standard conversion")
+                return self.convert_to_docx(input_path, output_path, context=context)
             
-    def _analyze_document_type(self, input_path):
+    @timed_stage('document_analysis')
+    def _analyze_document_type(self, context):
         """Analyze document to determine its type and complexity"""
         try:
-            pdf = fitz.open(input_path)
-            page_count = pdf.page_count
+            page_count = context.page_count
             
             # Initialize counters
             total_words = 0
@@ -154,11 +532,11 @@ class DocumentConverter:
             complexity_score = 0
             
             # Check first 3 pages max for efficiency
-            for page_num in range(min(3, page_count)):
-                page = pdf[page_num]
+            for page_num in context.page_numbers[:3]:
+                snapshot = context.snapshot(page_num)
                 
                 # Get page text
-                text = page.get_text()
+                text = snapshot.text
                 words = re.findall(r'\w+', text)
                 total_words += len(words)
                 
@@ -173,14 +551,14 @@ class DocumentConverter:
                         resume_score += 1
                 
                 # Check for email/phone patterns (common in resumes)
-                if re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text):  # Email
+                if EMAIL_PATTERN.search(text):
                     resume_score += 2
-                if re.search(r'(?:\+|00)?[0-9()\s-]{7,}', text):  # Phone
+                if PHONE_PATTERN.search(text):
                     resume_score += 1
                 
                 # Table detection
                 rect_count = 0
-                for drawing in page.get_drawings():
+                for drawing in snapshot.drawings:
                     if drawing.get("type") == "rect":
                         rect_count += 1
                 
@@ -190,12 +568,12 @@ class DocumentConverter:
                     form_score += rect_count // 10
                 
                 # Complex layout detection
-                blocks = page.get_text("dict").get("blocks", [])
+                blocks = snapshot.blocks
                 if len(blocks) > 20:  # Many text blocks suggests complex layout
                     complexity_score += len(blocks) // 10
                 
                 # Check for multi-column layout (increases complexity)
-                columns = self._detect_columns(page)
+                columns = self._detect_columns(snapshot)
                 if len(columns) > 1:
                     complexity_score += len(columns) * 2
             
@@ -215,29 +593,22 @@ class DocumentConverter:
             elif complexity_score >= 5:
                 complexity = 'moderate'
             
-            pdf.close()
             return doc_type, complexity
             
         except Exception as e:
             logger.warning(f"Error analyzing document type: {str(e)}")
             return 'general', 'moderate'  # Default values if analysis fails
             
-    def _detect_columns(self, page):
+    def _detect_columns(self, snapshot):
         """Simple column detection for document analysis"""
         try:
             # Get page dimensions
-            page_width = page.rect.width
-            
-            # Get text blocks
-            blocks = page.get_text("dict").get("blocks", [])
-            x_coordinates = []
+            page_width = snapshot.width
             
             # Collect x-coordinates of all text blocks
-            for block in blocks:
-                if block.get("type") == 0 and "bbox" in block:
-                    x_min = block["bbox"][0]
-                    x_max = block["bbox"][2]
-                    x_coordinates.extend([x_min, x_max])
+            x_coordinates = []
+            for block in snapshot.text_blocks:
+                x_coordinates.extend([block.bbox[0], block.bbox[2]])
             
             if not x_coordinates:
                 return []
@@ -246,68 +617,48 @@ class DocumentConverter:
             hist, bins = np.histogram(x_coordinates, bins=20, range=(0, page_width))
             
             # Find significant valleys in the histogram (gaps between columns)
-            valleys = []
-            for i in range(1, len(hist) - 1):
-                if (hist[i] < hist[i-1] and hist[i] < hist[i+1] and 
-                    hist[i] < max(hist) * 0.2):  # Significant gap
-                    valleys.append(bins[i])
-            
-            # Create columns from valleys
-            columns = []
-            if valleys:
-                # Add left edge as first boundary
-                boundaries = [0] + valleys + [page_width]
-                
-                for i in range(len(boundaries) - 1):
-                    left = boundaries[i]
-                    right = boundaries[i+1]
-                    width_ratio = (right - left) / page_width
-                    
-                    # Skip if column is too narrow
-                    if width_ratio < 0.1:
-                        continue
-                    
-                    columns.append({
-                        'left': left,
-                        'right': right,
-                        'width_ratio': width_ratio
-                    })
-            
-            return columns
+            valleys = bins[self._find_valleys(hist)].tolist()
+            return self._columns_from_boundaries(valleys, page_width)
             
         except Exception as e:
             logger.debug(f"Error in simple column detection: {str(e)}")
             return []
     
-    def _convert_with_pdf2docx(self, input_path, output_path):
-        """Convert PDF to DOCX using pdf2docx library"""
+    def _convert_with_pdf2docx(self, context, fallback=True):
+        """Convert PDF to an in-memory DOCX Document using pdf2docx library
+        
+        With fallback=False a pdf2docx failure is raised instead of being
+        replaced by standard conversion output.
+        """
         try:
             if not PDF2DOCX_AVAILABLE:
                 logger.warning("pdf2docx library not available, falling back to standard conversion")
-                return self.convert_to_docx(input_path, output_path)
+                return self._render_docx(context)
             
-            # Use pdf2docx for conversion
-            cv = Pdf2DocxConverter(input_path)
-            cv.convert(output_path)
+            # Use pdf2docx for conversion on the already parsed document
+            from .shared_pdf2docx import SharedPdf2DocxConverter
+            cv = SharedPdf2DocxConverter(context)
+            with self.timings.span('pdf2docx_engine'):
+                doc = cv.convert_to_document(pages=context.page_numbers if context.is_partial else None)
             cv.close()
             
             # Apply additional post-processing specific to pdf2docx output
-            self._post_process_pdf2docx_output(output_path)
+            self._post_process_pdf2docx_output(doc)
             
-            return True
+            return doc
             
         except Exception as e:
             logger.error(f"pdf2docx conversion error: {str(e)}")
+            if not fallback:
+                raise
             # Fall back to standard conversion
             logger.debug("Falling back to standard conversion")
-            return self.convert_to_docx(input_path, output_path)
+            return self._render_docx(context)
     
-    def _post_process_pdf2docx_output(self, docx_path):
+    @timed_stage('post_processing')
+    def _post_process_pdf2docx_output(self, doc):
         """Apply post-processing to fix common issues in pdf2docx output"""
         try:
-            # Load the document
-            doc = Document(docx_path)
-            
             # Fix 1: Handle empty table cells better
             for table in doc.tables:
                 for row in table.rows:
@@ -320,8 +671,9 @@ class DocumentConverter:
                                     p.getparent().remove(p)
             
             # Fix 2: Remove borders from all tables
+            self._add_layout_table_style(doc)
             for table in doc.tables:
-                self._remove_table_borders_completely(table)
+                self._apply_layout_table_style(table)
             
             # Fix 3: Convert drawing tables to proper tables if needed
             # (This is a complex process, simplified here)
@@ -331,30 +683,26 @@ class DocumentConverter:
                 if not para.style.name.startswith('Heading'):
                     para.paragraph_format.space_after = Pt(6)
             
-            # Save the document
-            doc.save(docx_path)
-            
         except Exception as e:
             logger.warning(f"Error in pdf2docx post-processing: {str(e)}")
     
-    def _convert_with_camelot_enhanced(self, input_path, output_path):
+    def _convert_with_camelot_enhanced(self, context):
         """Convert PDF with enhanced table processing using camelot"""
+        doc = None
         try:
             if not CAMELOT_AVAILABLE:
                 logger.warning("Camelot library not available, falling back to standard conversion")
-                return self.convert_to_docx(input_path, output_path)
+                return self._render_docx(context)
             
             # Use our standard conversion first
-            self.convert_to_docx(input_path, output_path)
+            doc = self._render_docx(context)
             
             # Extract tables using camelot
-            tables = camelot.read_pdf(input_path)
+            import camelot
+            tables = camelot.read_pdf(context.input_path)
             
             # Only proceed if we found tables
             if len(tables) > 0:
-                # Load the document
-                doc = Document(output_path)
-                
                 # For each table found by camelot
                 for i, table in enumerate(tables):
                     # Convert camelot table to pandas DataFrame
@@ -376,16 +724,13 @@ class DocumentConverter:
                 
                 # Remove any empty tables from the original conversion
                 self._clean_empty_tables(doc)
-                
-                # Save the document
-                doc.save(output_path)
             
-            return True
+            return doc
             
         except Exception as e:
             logger.error(f"Camelot-enhanced conversion error: {str(e)}")
-            # Document already converted with standard method
-            return True
+            # Document may already be converted with standard method
+            return doc if doc is not None else self._render_docx(context)
     
     def _clean_empty_tables(self, doc):
         """Remove empty tables from document"""
@@ -406,157 +751,151 @@ class DocumentConverter:
                 if parent is not None:
                     parent.remove(tbl)
     
-    def _convert_with_multiple_engines(self, input_path, output_path):
-        """Try multiple conversion engines and select the best result"""
+    def _convert_with_multiple_engines(self, context, stream=False):
+        """Render pdf2docx in a worker while the standard engine renders here, and keep the best result
+        
+        Both candidates share the engine_timeout deadline. The pdf2docx worker is
+        terminated when it overruns; the standard render runs in this process and
+        stops at the next page boundary, so one page that hangs is not interrupted.
+        
+        With stream=True the standard candidate is streamed and scored page by page,
+        and a winning pdf2docx candidate is returned as a DocxFile rather than loaded.
+        """
+        if not PDF2DOCX_AVAILABLE:
+            return self._render_docx(context, stream=stream)
+        
+        temp_dir = None
         try:
-            # Create temporary files for each approach
             temp_dir = tempfile.mkdtemp()
-            standard_output = os.path.join(temp_dir, "standard.docx")
-            pdf2docx_output = os.path.join(temp_dir, "pdf2docx.docx")
-            
-            # Create base filename for output path
-            base_output = os.path.splitext(output_path)[0]
-            
-            # 1. Standard conversion
-            logger.debug("Trying standard conversion")
-            standard_success = self.convert_to_docx(input_path, standard_output)
-            
-            # 2. pdf2docx conversion if available
-            pdf2docx_success = False
-            if PDF2DOCX_AVAILABLE:
-                logger.debug("Trying pdf2docx conversion")
-                try:
-                    pdf2docx_success = self._convert_with_pdf2docx(input_path, pdf2docx_output)
-                except Exception as e:
-                    logger.warning(f"pdf2docx conversion failed: {str(e)}")
             
-            # Evaluate results to select the best approach
-            standard_score = 0
-            pdf2docx_score = 0
+            # pdf2docx runs in this process's engine pool; the standard engine keeps
+            # using the shared context here, so its document is neither saved nor reloaded
+            pool = _engine_pool()
+            candidate_path = os.path.join(temp_dir, "pdf2docx.docx")
+            started = time.monotonic()
+            result = pool.apply_async(_run_pdf2docx_candidate,
+                                      (context.input_path, candidate_path, context.options))
             
-            if standard_success:
-                standard_score = self._evaluate_conversion_quality(standard_output)
-                logger.debug(f"Standard conversion quality score: {standard_score}")
+            scores = {}
+            try:
+                # A streamed document only keeps its last page, so its pages are scored as they are flushed
+                quality = Counter() if stream else None
+                standard_doc = self._render_docx(context, stream=stream, deadline=started + self.engine_timeout,
+                                                 quality=quality)
+                if stream:
+                    scores['standard'] = self._quality_score(quality)
+                else:
+                    scores['standard'] = self._evaluate_conversion_quality(standard_doc)
+                logger.debug(f"standard conversion quality score: {scores['standard']}")
+            except Exception as e:
+                logger.warning(f"standard conversion failed: {str(e)}")
             
-            if pdf2docx_success:
-                pdf2docx_score = self._evaluate_conversion_quality(pdf2docx_output)
-                logger.debug(f"pdf2docx conversion quality score: {pdf2docx_score}")
+            # Collect the pdf2docx score once it finishes or its deadline passes
+            remaining = started + self.engine_timeout - time.monotonic()
+            try:
+                scores['pdf2docx'], spans = result.get(timeout=max(0, remaining))
+                self.timings.merge(spans)
+                logger.debug(f"pdf2docx conversion quality score: {scores['pdf2docx']}")
+            except multiprocessing.TimeoutError:
+                logger.warning(f"pdf2docx conversion timed out after {self.engine_timeout}s")
+                # Stop the overrunning candidate; the next conversion starts a fresh pool
+                _discard_engine_pool(pool)
+            except Exception as e:
+                logger.warning(f"pdf2docx conversion failed: {str(e)}")
             
             # Select best result based on scores
-            if pdf2docx_success and pdf2docx_score > standard_score:
+            if 'pdf2docx' in scores and scores['pdf2docx'] > scores.get('standard', -1):
                 logger.debug("Using pdf2docx result (higher quality)")
-                shutil.copy(pdf2docx_output, output_path)
-            elif standard_success:
+                # Loading a large candidate would build the whole document tree streaming avoids
+                return DocxFile(candidate_path) if stream else Document(candidate_path)
+            elif 'standard' in scores:
                 logger.debug("Using standard conversion result")
-                shutil.copy(standard_output, output_path)
-            else:
-                logger.warning("All conversion attempts failed, using fallback")
-                # Create minimal document as fallback
-                doc = Document()
-                doc.add_paragraph("Conversion failed. Please try a different format.")
-                doc.save(output_path)
+                return standard_doc
             
-            # Clean up temp directory
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                logger.debug(f"Error cleaning up temp directory: {str(e)}")
-            
-            return True
+            logger.warning("All conversion attempts failed, using fallback")
+            # Create minimal document as fallback
+            doc = Document()
+            doc.add_paragraph("Conversion failed. Please try a different format.")
+            return doc
             
         except Exception as e:
             logger.error(f"Multiple engine conversion error: {str(e)}")
             # Fall back to standard conversion
-            return self.convert_to_docx(input_path, output_path)
+            return self._render_docx(context, stream=stream)
+        
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
     
-    def _evaluate_conversion_quality(self, docx_path):
-        """Evaluate the quality of a conversion result"""
+    @timed_stage('quality_scoring')
+    def _evaluate_conversion_quality(self, doc):
+        """Evaluate the quality of a live conversion result"""
         try:
-            # Load the document
-            doc = Document(docx_path)
-            
-            # Initialize score
-            score = 0
+            return self._quality_score(self._quality_features(doc))
             
+        except Exception as e:
+            logger.warning(f"Error evaluating conversion quality: {str(e)}")
+            return 0
+    
+    def _quality_features(self, doc, features=None):
+        """Count the features quality scoring rewards, adding them to features
+        
+        Every count is a sum over paragraphs, tables or images, so counting a
+        document page by page gives the same totals as counting it whole.
+        """
+        features = Counter() if features is None else features
+        
+        for para in doc.paragraphs:
             # Feature 1: Text extraction completeness
-            text_length = 0
-            for para in doc.paragraphs:
-                text_length += len(para.text)
-            
-            # Longer text generally means more complete extraction
-            if text_length > 1000:
-                score += 10
-            elif text_length > 500:
-                score += 5
-            elif text_length > 100:
-                score += 2
+            features['text_length'] += len(para.text)
             
             # Feature 2: Structural elements preservation
-            headings_count = 0
-            for para in doc.paragraphs:
-                if para.style.name.startswith('Heading'):
-                    headings_count += 1
-            
-            # Documents with proper heading structure get bonus points
-            score += min(10, headings_count * 2)
-            
-            # Feature 3: Table quality
-            tables_count = len(doc.tables)
-            tables_score = 0
-            
-            for table in doc.tables:
-                # Check if table has content
-                has_content = False
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            has_content = True
-                            break
-                    if has_content:
-                        break
-                
-                if has_content:
-                    tables_score += 2
-                    
-                    # Bonus for larger tables (more complex)
-                    if len(table.rows) > 5 and len(table.columns) > 3:
-                        tables_score += 3
-            
-            score += tables_score
-            
-            # Feature 4: Image preservation
-            # Count inline shapes (images)
-            image_count = 0
-            for shape in doc.inline_shapes:
-                image_count += 1
+            if para.style.name.startswith('Heading'):
+                features['headings'] += 1
             
-            score += min(10, image_count * 2)
-            
-            # Feature 5: Formatting preservation (simplified)
-            formatting_score = 0
-            for para in doc.paragraphs:
-                # Check for mixed formatting in paragraph (indicates rich formatting preservation)
-                formats_in_para = set()
-                for run in para.runs:
-                    format_key = (run.bold, run.italic, run.underline)
-                    formats_in_para.add(format_key)
+            # Feature 5: Formatting preservation (mixed formatting in one paragraph)
+            if len({(run.bold, run.italic, run.underline) for run in para.runs}) > 1:
+                features['formatted_paragraphs'] += 1
+        
+        # Feature 3: Table quality
+        for table in doc.tables:
+            if any(cell.text.strip() for row in table.rows for cell in row.cells):
+                features['table_score'] += 2
                 
-                if len(formats_in_para) > 1:
-                    formatting_score += 1
-            
-            score += min(10, formatting_score)
-            
-            return score
-            
-        except Exception as e:
-            logger.warning(f"Error evaluating conversion quality: {str(e)}")
-            return 0
+                # Bonus for larger tables (more complex)
+                if len(table.rows) > 5 and len(table.columns) > 3:
+                    features['table_score'] += 3
+        
+        # Feature 4: Image preservation (inline shapes)
+        features['images'] += len(doc.inline_shapes)
+        
+        return features
+    
+    def _quality_score(self, features):
+        """Score the quality features of a whole document"""
+        score = 0
+        
+        # Longer text generally means more complete extraction
+        text_length = features['text_length']
+        if text_length > 1000:
+            score += 10
+        elif text_length > 500:
+            score += 5
+        elif text_length > 100:
+            score += 2
+        
+        # Documents with proper heading structure get bonus points
+        score += min(10, features['headings'] * 2)
+        score += features['table_score']
+        score += min(10, features['images'] * 2)
+        score += min(10, features['formatted_paragraphs'])
+        
+        return score
     
-    def _apply_specialized_post_processing(self, docx_path, doc_type):
-        """Apply document-type-specific post-processing"""
+    @timed_stage('post_processing')
+    def _apply_specialized_post_processing(self, doc, doc_type):
+        """Apply document-type-specific post-processing to a live document"""
         try:
-            doc = Document(docx_path)
-            
             # Common fixes for all document types
             self._fix_character_spacing(doc)
             self._fix_table_borders(doc)
@@ -570,9 +909,6 @@ class DocumentConverter:
             elif doc_type == 'form':
                 self._preserve_form_layout(doc)
             
-            # Save the document
-            doc.save(docx_path)
-            
         except Exception as e:
             logger.warning(f"Error in specialized post-processing: {str(e)}")
     
@@ -597,12 +933,9 @@ class DocumentConverter:
     
     def _fix_table_borders(self, doc):
         """Fix table borders throughout the document"""
+        self._add_layout_table_style(doc)
         for table in doc.tables:
-            # Remove all borders
-            self._remove_table_borders_completely(table)
-            
-            # Optionally add minimal styling if needed
-            table.style = 'Table Grid'
+            self._apply_layout_table_style(table)
     
     def _cleanup_empty_paragraphs(self, doc):
         """Remove excessive empty paragraphs"""
@@ -663,34 +996,10 @@ class DocumentConverter:
     def _optimize_table_layout(self, doc):
         """Optimize table layouts in table-heavy documents"""
         for table in doc.tables:
-            # Set consistent cell margins
-            for row in table.rows:
-                for cell in row.cells:
-                    # Access cell properties
-                    try:
-                        tc = cell._element.tcPr
-                        if tc is None:
-                            tc = OxmlElement('w:tcPr')
-                            cell._element.append(tc)
-                            
-                        # Add cell margins specification
-                        tcMar = OxmlElement('w:tcMar')
-                        
-                        # Set all margins (1pt = 20 dxa)
-                        for side in ['top', 'left', 'bottom', 'right']:
-                            margin = OxmlElement(f'w:{side}')
-                            margin.set(qn('w:w'), '60')  # 3pt margin
-                            margin.set(qn('w:type'), 'dxa')
-                            tcMar.append(margin)
-                            
-                        # Check if margins already exist
-                        existing_tcMar = tc.find('.//w:tcMar')
-                        if existing_tcMar is not None:
-                            tc.remove(existing_tcMar)
-                            
-                        tc.append(tcMar)
-                    except Exception as e:
-                        logger.debug(f"Error setting cell margins: {str(e)}")
+            # Consistent cell margins come from the layout table style (applied by
+            # _fix_table_borders) once the engine's per-cell margins are dropped
+            for tcMar in table._tbl.xpath('.//w:tcPr/w:tcMar'):
+                tcMar.getparent().remove(tcMar)
             
             # Fix header row if present
             if len(table.rows) > 0:
@@ -744,23 +1053,19 @@ class DocumentConverter:
                         field_value = parts[2].strip()
                         para.add_run(field_value)
 
-    def convert_to_txt(self, input_path, output_path):
+    def convert_to_txt(self, input_path, output_path, context=None, options=None):
         """Convert PDF to plain text"""
-        pdf = None
+        pdf_context = None
         try:
-            # Open PDF
-            pdf = fitz.open(input_path)
+            # Open PDF unless the caller already shares one
+            if context is None:
+                context = pdf_context = ConversionContext(input_path, options)
             
-            # Extract text from all pages
-            text = ""
-            for page_num in range(pdf.page_count):
-                page = pdf[page_num]
-                text += page.get_text()
-                text += "\n\n"  # Add page separators
-            
-            # Write to output file
+            # Write each page as soon as it is extracted instead of building one string
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+                for page_text in self.iter_text(context):
+                    f.write(page_text)
+                    f.write("\n\n")  # Add page separators
                 
             return True
             
@@ -769,123 +1074,256 @@ class DocumentConverter:
             raise
             
         finally:
-            if pdf:
-                pdf.close()
+            if pdf_context:
+                pdf_context.close()
+
+    def iter_text(self, context):
+        """Yield the plain text of each of the context's selected pages in page order"""
+        executor = None
+        try:
+            page_numbers = context.page_numbers
+            
+            if self.page_workers <= 1 or len(page_numbers) < PARALLEL_MIN_PAGES:
+                for page_num in page_numbers:
+                    yield context.pdf[page_num].get_text()
+                return
+            
+            # Page runs are extracted concurrently; a bounded window of futures
+            # is consumed in submission order so output stays in page order
+            chunk_size = max(1, min(TEXT_CHUNK_PAGES, -(-len(page_numbers) // (self.page_workers * 4))))
+            chunks = [page_numbers[start:start + chunk_size]
+                      for start in range(0, len(page_numbers), chunk_size)]
+            
+            executor = ProcessPoolExecutor(max_workers=self.page_workers)
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(_extract_text_worker, context.input_path, chunk)))
+                if len(pending) >= self.page_workers * 2:
+                    yield from self._collect_text(context, *pending.popleft())
+            while pending:
+                yield from self._collect_text(context, *pending.popleft())
+                
+        finally:
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
 
-    def convert_to_docx(self, input_path, output_path):
+    def _collect_text(self, context, chunk, future):
+        """Return a worker's page texts, extracting locally if the worker failed"""
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning(f"Text extraction worker failed for pages {chunk[0]}-{chunk[-1]}: {str(e)}")
+            return [context.pdf[page_num].get_text() for page_num in chunk]
+
+    def convert_to_docx(self, input_path, output_path, context=None, options=None):
         """Convert PDF to DOCX with layout preservation"""
-        pdf = None
+        pdf_context = None
         try:
-            # Create Word document
-            doc = Document()
+            # Open PDF unless the caller already shares one
+            if context is None:
+                context = pdf_context = ConversionContext(input_path, options)
             
-            # Set minimal default margins for better layout
-            for section in doc.sections:
-                section.left_margin = Inches(0.5)
-                section.right_margin = Inches(0.5)
-                section.top_margin = Inches(0.5)
-                section.bottom_margin = Inches(0.5)
+            # Nothing edits the result before saving, so large documents can be streamed
+            doc = self._render_docx(context, stream=len(context.page_numbers) >= STREAM_MIN_PAGES)
+            
+            # Save document
+            with self.timings.span('save'):
+                doc.save(output_path)
+            logger.debug(f"Saved document to {output_path}")
             
-            # Open PDF
-            pdf = fitz.open(input_path)
-            logger.debug(f"Opened PDF with {pdf.page_count} pages")
+            return True
+            
+        except Exception as e:
+            logger.error(f"PDF to DOCX conversion error: {str(e)}")
+            raise
+            
+        finally:
+            if pdf_context:
+                pdf_context.close()
+
+    def _render_docx(self, context, stream=False, deadline=None, quality=None):
+        """Build the standard engine's DOCX as a live Document without saving it
+        
+        With stream=True the document is an OoxmlDocument that writes each page
+        to a spool file once it is rendered; it can only be saved afterwards.
+        Each page's quality features are then added to the quality Counter, if
+        given, before the page is written.
+        With a deadline (a time.monotonic() value) rendering stops with a
+        TimeoutError before the first page that starts after it.
+        """
+        try:
+            page_numbers = context.page_numbers
+            logger.debug(f"Rendering {len(page_numbers)} of {context.pdf.page_count} PDF pages")
             
             # NEW: Check first page for decorative elements at top
-            if pdf.page_count > 0:
-                self._has_decorative_header = self._check_for_decorative_header(pdf[0])
+            if page_numbers:
+                self._has_decorative_header = self._check_for_decorative_header(context.snapshot(page_numbers[0]))
                 logger.debug(f"Decorative header detected: {self._has_decorative_header}")
             else:
                 self._has_decorative_header = False
             
-            # Analyze whole document to detect global layout patterns
-            layout_info_all_pages = []
-            for page_num in range(min(pdf.page_count, 3)):  # Limit to first 3 pages
-                page = pdf[page_num]
-                layout_info = self._analyze_page_layout(page)
-                layout_info_all_pages.append(layout_info)
-            
-            # Determine global document style based on all analyzed pages
-            global_layout = self._combine_layout_info(layout_info_all_pages)
-            
-            # Set consistent document styles based on analysis
-            self._set_document_styles(doc, global_layout)
-            
-            # Process each page
-            for page_num in range(pdf.page_count):
-                page = pdf[page_num]
-                
-                # Only add page break after first page
-                if page_num > 0:
-                    doc.add_page_break()
-                    # Ensure there's a section for this page
-                    if len(doc.sections) <= page_num:
+            # Determine global document style from the first pages; their layouts are
+            # memoized on the snapshots and reused when the pages are rendered
+            summary = LayoutSummary()
+            for page_num in page_numbers[:3]:  # Limit to first 3 pages
+                summary.add(self._page_layout(context.snapshot(page_num)))
+            global_layout = summary.global_layout()
+            
+            # Create Word document from a template already styled for this layout.
+            # A streamed document only keeps the page being rendered.
+            doc = self._styled_document(global_layout)
+            if stream:
+                doc = OoxmlDocument(doc, spool=True)
+            self._image_parts = {}
+            
+            # Process each page (layouts may be analysed by worker processes,
+            # but the document itself is always assembled here in page order)
+            with self._page_layouts(context) as page_layouts:
+                for index, (page_num, snapshot, layout_info) in enumerate(page_layouts):
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise TimeoutError(f"Standard conversion ran out of time after {index} pages")
+                    
+                    # Page-level overrides go on a copy; the memoized analysis stays as computed
+                    layout_info = dict(layout_info)
+                    
+                    # Every page after the first starts with a page break and a new section
+                    if index > 0:
+                        doc.add_page_break()
                         doc.add_section()
-                
-                # Set page size and orientation
-                # Fix potential index error by making sure the section exists
-                if page_num < len(doc.sections):
-                    section = doc.sections[page_num]
-                    self._set_page_properties(section, page)
-                else:
-                    # If section doesn't exist, use the last section
-                    section = doc.sections[-1]
-                    self._set_page_properties(section, page)
-                
-                # Extract layout information
-                layout_info = self._analyze_page_layout(page)
-                
-                # Skip decorative headers on first page if detected
-                if page_num == 0 and self._has_decorative_header:
-                    layout_info['skip_decorative_top'] = True
-                
-                # Use global layout type if more consistent
-                if global_layout.get('consistent_layout_type'):
-                    layout_info['type'] = global_layout['layout_type']
                     
-                logger.debug(f"Detected layout type: {layout_info['type']}")
-                
-                # Process page based on layout type
-                if layout_info['type'] == 'multi_column' and layout_info['columns']:
-                    self._process_multi_column_page(doc, page, layout_info)
-                else:
-                    self._process_single_column_page(doc, page, layout_info)
+                    # Set page size and orientation on the page's (always the last) section
+                    self._set_page_properties(doc.sections[-1], snapshot)
+                    
+                    # Skip decorative headers on first page if detected
+                    if index == 0 and self._has_decorative_header:
+                        layout_info['skip_decorative_top'] = True
+                    
+                    # Use global layout type if more consistent
+                    if global_layout.get('consistent_layout_type'):
+                        layout_info['type'] = global_layout['layout_type']
+                        
+                    logger.debug(f"Detected layout type: {layout_info['type']}")
+                    
+                    # Process page based on layout type
+                    if layout_info['type'] == 'multi_column' and layout_info['columns']:
+                        self._process_multi_column_page(doc, snapshot, layout_info)
+                    else:
+                        self._process_single_column_page(doc, snapshot, layout_info)
+                    
+                    # Release each snapshot once its page has been rendered
+                    context.release_snapshot(page_num)
+                    if isinstance(doc, OoxmlDocument):
+                        if quality is not None:
+                            with self.timings.span('quality_scoring'):
+                                self._quality_features(doc, quality)
+                        doc.flush()
             
             # Post-process the document for final cleanup and adjustments
             self._post_process_document(doc)
             
-            # Save document
-            doc.save(output_path)
-            logger.debug(f"Saved document to {output_path}")
-            
-            return True
+            return doc
             
         except Exception as e:
-            logger.error(f"PDF to DOCX conversion error: {str(e)}")
+            logger.error(f"PDF to DOCX rendering error: {str(e)}")
             raise
+
+    def _styled_document(self, global_layout):
+        """Return a new Document whose styles are set for global_layout, from a cached template"""
+        key = (global_layout.get('base_font', 'Calibri'),
+               global_layout.get('body_font_size', 11),
+               tuple(global_layout.get('header_font_sizes', [16, 14, 12])))
+        template = _styled_templates.get(key)
+        if template is None:
+            doc = Document()
+            
+            # Set minimal default margins for better layout
+            for section in doc.sections:
+                section.left_margin = Inches(0.5)
+                section.right_margin = Inches(0.5)
+                section.top_margin = Inches(0.5)
+                section.bottom_margin = Inches(0.5)
             
+            # Set consistent document styles based on analysis
+            self._set_document_styles(doc, global_layout)
+            self._add_layout_table_style(doc)
+            
+            stream = io.BytesIO()
+            doc.save(stream)
+            template = stream.getvalue()
+            if len(_styled_templates) >= TEMPLATE_CACHE_SIZE:
+                _styled_templates.pop(next(iter(_styled_templates)))
+            _styled_templates[key] = template
+        
+        return Document(io.BytesIO(template))
+
+    def _page_layout(self, snapshot):
+        """Return the page's layout analysis, computing it on first use"""
+        if snapshot.layout_info is None:
+            snapshot.layout_info = self._analyze_page_layout(snapshot)
+        return snapshot.layout_info
+
+    @contextmanager
+    def _page_layouts(self, context):
+        """Yield an iterator of (page_num, snapshot, layout_info) in page order"""
+        # Pages analysed already (e.g. for the global summary) are never analysed again
+        pending = [page_num for page_num in context.page_numbers if not context.is_analysed(page_num)]
+        if self.page_workers <= 1 or len(pending) < PARALLEL_MIN_PAGES:
+            yield ((page_num, context.snapshot(page_num), self._page_layout(context.snapshot(page_num)))
+                   for page_num in context.page_numbers)
+            return
+        
+        # Small contiguous chunks keep every worker busy while results still arrive in order
+        chunk_size = max(1, -(-len(pending) // (self.page_workers * 4)))
+        chunks = [pending[start:start + chunk_size]
+                  for start in range(0, len(pending), chunk_size)]
+        
+        executor = ProcessPoolExecutor(max_workers=self.page_workers)
+        try:
+            futures = [executor.submit(_analyze_pages_worker, context.input_path, chunk)
+                       for chunk in chunks]
+            yield self._collect_page_layouts(context, chunks, futures)
         finally:
-            if pdf:
-                pdf.close()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _collect_page_layouts(self, context, chunks, futures):
+        """Merge worker page records back into snapshots, analysing locally if a chunk failed"""
+        results = iter(zip(chunks, futures))
+        records = {}
+        for page_num in context.page_numbers:
+            # Wait for the next chunk when reaching its first page
+            if not context.is_analysed(page_num) and page_num not in records:
+                chunk, future = next(results)
+                try:
+                    page_records, spans = future.result()
+                    self.timings.merge(spans)
+                except Exception as e:
+                    logger.warning(f"Page analysis worker failed for pages {chunk[0]}-{chunk[-1]}: {str(e)}")
+                    page_records = [None] * len(chunk)
+                records.update(zip(chunk, page_records))
+            
+            snapshot = context.snapshot(page_num)
+            page_record = records.pop(page_num, None)
+            if page_record:
+                snapshot.preload(page_record)
+            yield page_num, snapshot, self._page_layout(snapshot)
 
-    def _check_for_decorative_header(self, page):
+    def _check_for_decorative_header(self, snapshot):
         """Check if the page has decorative elements at the top"""
         try:
             # Get page size
-            page_width = page.rect.width
-            page_height = page.rect.height
+            page_width = snapshot.width
+            page_height = snapshot.height
             
             # Define top region (top 15% of page)
             top_region_height = page_height * 0.15
             
             # Get text blocks in the top region
-            blocks = page.get_text("dict").get("blocks", [])
+            blocks = snapshot.blocks
             top_blocks = []
             
             for block in blocks:
-                if "bbox" in block and len(block["bbox"]) >= 4:
-                    y_top = block["bbox"][1]
-                    if y_top < top_region_height:
-                        top_blocks.append(block)
+                if block.bbox[1] < top_region_height:
+                    top_blocks.append(block)
             
             # No blocks at top - less likely to have decorative elements
             if not top_blocks:
@@ -893,7 +1331,7 @@ class DocumentConverter:
                 
             # Check for any lines or rectangles in the top region
             # These might be decorative elements
-            paths = page.get_drawings()
+            paths = snapshot.drawings
             top_paths = []
             
             for path in paths:
@@ -908,11 +1346,8 @@ class DocumentConverter:
             # Check for very short lines of text (often decorative)
             short_text_count = 0
             for block in top_blocks:
-                if block.get("type") == 0:  # Text block
-                    text = "".join(span.get("text", "") for line in block.get("lines", []) 
-                                  for span in line.get("spans", []))
-                    if len(text.strip()) < 3:
-                        short_text_count += 1
+                if block.type == TEXT_BLOCK and len(block.text.strip()) < 3:
+                    short_text_count += 1
             
             # If more than 2 very short text blocks at top, might be decorative
             if short_text_count > 1:
@@ -931,7 +1366,8 @@ class DocumentConverter:
             logger.debug(f"Error checking for decorative header: {str(e)}")
             return False
             
-    def _process_single_column_page(self, doc, page, layout_info=None):
+    @timed_stage('page_processing')
+    def _process_single_column_page(self, doc, snapshot, layout_info=None):
         """Process a page with single-column layout"""
         try:
             # If layout_info wasn't provided, create a default
@@ -941,18 +1377,14 @@ class DocumentConverter:
                     'skip_decorative_top': False
                 }
                 
-            # Extract text blocks
-            blocks = page.get_text("dict").get("blocks", [])
-            
             # Sort blocks by y-position (top to bottom)
-            text_blocks = [b for b in blocks if b.get("type") == 0 and "bbox" in b]
-            text_blocks.sort(key=lambda b: b["bbox"][1])
+            text_blocks = sorted(snapshot.text_blocks, key=lambda b: b.bbox[1])
             
             # Skip decorative elements at top if detected
             if layout_info.get('skip_decorative_top', False) and text_blocks:
                 # Skip first block if it's in the top 10% of page and has little text
-                if text_blocks[0]["bbox"][1] < page.rect.height * 0.1:
-                    first_text = self._extract_text(text_blocks[0]).strip()
+                if text_blocks[0].bbox[1] < snapshot.height * 0.1:
+                    first_text = text_blocks[0].text.strip()
                     if len(first_text) < 10:  # Very short text, likely decorative
                         text_blocks = text_blocks[1:]
             
@@ -961,21 +1393,15 @@ class DocumentConverter:
                 # Extract text and formatting
                 paragraph = doc.add_paragraph()
                 
-                for line_idx, line in enumerate(block.get("lines", [])):
+                for line_idx, line in enumerate(block.lines):
                     if line_idx > 0:
                         # Add line break between lines
                         paragraph.add_run().add_break()
                     
-                    for span in line.get("spans", []):
-                        text = span.get("text", "").strip()
-                        if not text:
-                            continue
-                        
-                        run = paragraph.add_run(text + " ")
-                        self._apply_span_formatting(run, span)
+                    self._add_span_runs(paragraph, line.spans)
                 
                 # Check if this might be a header
-                if any(span.get("size", 0) > 12 or (span.get("flags", 0) & 16) for line in block.get("lines", []) for span in line.get("spans", [])):
+                if any(span.size > 12 or (span.flags & 16) for span in block.spans()):
                     paragraph.style = "Heading 2"
                     
                     # Add some spacing
@@ -986,18 +1412,24 @@ class DocumentConverter:
                     paragraph.paragraph_format.space_after = Pt(6)
             
             # Process images if any
-            self._extract_and_add_images(doc, page)
+            self._extract_and_add_images(doc, snapshot)
         except Exception as e:
             logger.warning(f"Error in single column processing: {str(e)}")
             # Create a simple paragraph with the page text as fallback
             try:
-                doc.add_paragraph(page.get_text())
+                doc.add_paragraph(snapshot.text)
             except:
                 pass
     
+    @timed_stage('post_processing')
     def _post_process_document(self, doc):
         """Apply final adjustments to the document before saving"""
         try:
+            if isinstance(doc, OoxmlDocument):
+                doc.remove_repeated_empty_paragraphs()
+                doc.remove_empty_tables()
+                return
+            
             # Fix empty paragraphs (excessive spacing)
             for para in doc.paragraphs:
                 if not para.text.strip():
@@ -1010,7 +1442,8 @@ class DocumentConverter:
                             prev_idx = list(parent).index(para._p) - 1
                             if prev_idx >= 0:
                                 prev_p = parent[prev_idx]
-                                if hasattr(prev_p, 'text') and not prev_p.text.strip():
+                                # Only a preceding empty paragraph counts (tables have no text)
+                                if prev_p.tag == qn('w:p') and not prev_p.text.strip():
                                     prev_was_empty = True
                             
                             # Remove if previous was also empty (keep one for spacing)
@@ -1046,9 +1479,6 @@ class DocumentConverter:
                     if not table_is_empty:
                         break
                 
-                # Special handling for document start tables (more likely to be decorative)
-                is_document_start = (i == 0)
-                
                 if table_is_empty:
                     # Remove empty table completely by getting its parent and removing it
                     if hasattr(table, '_tbl') and hasattr(table._tbl, 'getparent'):
@@ -1062,120 +1492,22 @@ class DocumentConverter:
                             except Exception as e:
                                 logger.warning(f"Error removing table: {str(e)}")
                 else:
-                    # Apply stronger border removal for all tables
-                    self._remove_table_borders_completely(table, is_document_start)
+                    # Tables that stay are layout tables and must not show borders
+                    self._apply_layout_table_style(table)
         except Exception as e:
             logger.warning(f"Error in aggressive table cleaning: {str(e)}")
 
-    def _remove_table_borders_completely(self, table, is_document_start=False):
-        """Complete border removal with multiple fallback methods"""
-        try:
-            # Step 1: Try enhanced border removal
-            self._remove_table_borders_enhanced(table)
-            
-            # Step 2: Direct XML approach to absolutely ensure borders are gone
-            tbl = table._tbl
-            
-            # Add explicit border-related namespaces
-            nsmap = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-            
-            # Define all possible border elements that could appear
-            border_paths = [
-                './/w:tblBorders',
-                './/w:tcBorders',
-                './/w:tblBorders/w:top',
-                './/w:tblBorders/w:left',
-                './/w:tblBorders/w:bottom',
-                './/w:tblBorders/w:right',
-                './/w:tblBorders/w:insideH',
-                './/w:tblBorders/w:insideV',
-                './/w:pBdr'  # Paragraph borders that might be in cells
-            ]
-            
-            # Remove each type of border element
-            for path in border_paths:
-                elements = tbl.xpath(path, namespaces=nsmap)
-                for element in elements:
-                    parent = element.getparent()
-                    if parent is not None:
-                        parent.remove(element)
-            
-            # Step 3: Explicitly set zero-width border on table properties
-            try:
-                tblPr = tbl.find('.//w:tblPr', namespaces=nsmap)
-                if tblPr is not None:
-                    # Create new border settings with nil values
-                    new_borders = OxmlElement('w:tblBorders')
-                    
-                    for border_type in ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']:
-                        border = OxmlElement(f'w:{border_type}')
-                        border.set(qn('w:val'), 'nil')
-                        border.set(qn('w:sz'), '0')
-                        border.set(qn('w:space'), '0')
-                        border.set(qn('w:color'), 'auto')
-                        new_borders.append(border)
-                    
-                    # Add borders element to table properties
-                    existing = tblPr.find('.//w:tblBorders', namespaces=nsmap)
-                    if existing is not None:
-                        tblPr.remove(existing)
-                    tblPr.append(new_borders)
-            except Exception as e:
-                logger.debug(f"Error setting table properties: {str(e)}")
-            
-            # Step 4: Handle cells individually
-            for row in table.rows:
-                for cell in row.cells:
-                    try:
-                        # Handle each cell's borders explicitly
-                        tc = cell._tc
-                        tcPr = tc.get_or_add_tcPr()
-                        
-                        # Remove any existing borders
-                        tcBorders = tcPr.find('.//w:tcBorders', namespaces=nsmap)
-                        if tcBorders is not None:
-                            tcPr.remove(tcBorders)
-                        
-                        # Add new borders with "nil" value
-                        tcBorders = OxmlElement('w:tcBorders')
-                        
-                        for border in ['top', 'left', 'bottom', 'right']:
-                            border_elem = OxmlElement(f'w:{border}')
-                            border_elem.set(qn('w:val'), 'nil')  # nil = no border
-                            border_elem.set(qn('w:sz'), '0')     # zero width
-                            border_elem.set(qn('w:space'), '0')  # no spacing
-                            border_elem.set(qn('w:color'), 'auto')
-                            tcBorders.append(border_elem)
-                            
-                        tcPr.append(tcBorders)
-                        
-                        # Special handling for first row top borders in document-start tables
-                        if is_document_start and row._index == 0:
-                            # Extra strong removal for top row border which tends to persist
-                            for paragraph in cell.paragraphs:
-                                if hasattr(paragraph, '_p'):
-                                    p = paragraph._p
-                                    pPr = p.get_or_add_pPr()
-                                    pBdr = pPr.find('.//w:pBdr')
-                                    if pBdr is not None:
-                                        pPr.remove(pBdr)
-                    except Exception as e:
-                        logger.debug(f"Error processing cell: {str(e)}")
-            
-            # Step 5: Set table to look like it has no borders in all attributes
-            table.style = 'Table Grid'  # Reset to standard style
-            
-            # Remove any styling that might add borders
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        if paragraph.style and paragraph.style.name != 'Normal':
-                            paragraph.style = 'Normal'
-                            
-        except Exception as e:
-            logger.warning(f"Enhanced border removal failed: {str(e)}")
-            # Try standard removal as last resort
-            self._remove_table_borders(table)
+    def _add_layout_table_style(self, doc):
+        """Define the borderless layout table style in the document if it is missing"""
+        styles = doc.styles
+        if LAYOUT_TABLE_STYLE not in styles:
+            styles.element.append(parse_xml(LAYOUT_TABLE_STYLE_XML))
+    
+    def _apply_layout_table_style(self, table):
+        """Make a table borderless by dropping its direct borders and using the layout style"""
+        for borders in table._tbl.xpath(TABLE_BORDERS_XPATH):
+            borders.getparent().remove(borders)
+        table.style = LAYOUT_TABLE_STYLE
     
     def _set_document_styles(self, doc, layout_info):
         """Apply consistent styles throughout the document based on analysis"""
@@ -1231,23 +1563,22 @@ class DocumentConverter:
         except Exception as e:
             logger.warning(f"Error setting document styles: {str(e)}")
 
-    def _process_multi_column_page(self, doc, page, layout_info):
+    @timed_stage('page_processing')
+    def _process_multi_column_page(self, doc, snapshot, layout_info):
         """Process a page with multi-column layout"""
         try:
             # Add a table for multi-column layout
             num_columns = len(layout_info['columns'])
             if num_columns < 1:
                 # Fall back to single column if no columns detected
-                self._process_single_column_page(doc, page)
+                self._process_single_column_page(doc, snapshot)
                 return
                 
+            # Borderless with fixed cell margins through the shared layout table style
             table = doc.add_table(rows=1, cols=num_columns)
-            table.style = 'Table Grid'
+            table.style = LAYOUT_TABLE_STYLE
             table.autofit = False
             
-            # Remove table borders
-            self._remove_table_borders(table)
-            
             # Calculate optimal column width ratios
             column_width_ratios = []
             for col in layout_info['columns']:
@@ -1272,36 +1603,16 @@ class DocumentConverter:
                     column_width = width_ratio * effective_page_width
                     table.columns[i].width = Inches(column_width)
             
-            # Extract and categorize blocks by column
-            columns_content = self._categorize_blocks_by_column(page, layout_info['columns'])
+            # Extract and categorize blocks by column (worker processes may have done this already)
+            columns_content = layout_info.get('column_blocks')
+            if columns_content is None:
+                columns_content = self._categorize_blocks_by_column(snapshot, layout_info['columns'])
             
             # Process each column
             for col_idx, blocks in enumerate(columns_content):
                 if col_idx < len(table.cells):  # Ensure cell exists
                     cell = table.cell(0, col_idx)
                     
-                    # Set cell margin for better spacing (3pt on all sides)
-                    # Access cell's properties to set margins
-                    try:
-                        tc = cell._element.tcPr
-                        if tc is None:
-                            tc = OxmlElement('w:tcPr')
-                            cell._element.append(tc)
-                            
-                        # Create margin specification
-                        tcMar = OxmlElement('w:tcMar')
-                        
-                        # Set all margins (1pt = 20 dxa)
-                        for side in ['top', 'left', 'bottom', 'right']:
-                            margin = OxmlElement(f'w:{side}')
-                            margin.set(qn('w:w'), '60')  # 3pt margin
-                            margin.set(qn('w:type'), 'dxa')
-                            tcMar.append(margin)
-                            
-                        tc.append(tcMar)
-                    except Exception as e:
-                        logger.debug(f"Error setting cell margins: {str(e)}")
-                    
                     # Process blocks in this column
                     self._process_column_blocks(cell, blocks, layout_info)
                     
@@ -1318,58 +1629,17 @@ class DocumentConverter:
         except Exception as e:
             logger.warning(f"Error in multi-column processing: {str(e)}")
             # Fall back to single column processing
-            self._process_single_column_page(doc, page)
+            self._process_single_column_page(doc, snapshot)
     
-    def _remove_table_borders(self, table):
-        """Remove borders from table"""
-        try:
-            # Access table properties to remove all borders
-            tbl = table._tbl
-            tblPr = tbl.get_or_add_tblPr()
-            
-            # Add table borders element
-            tblBorders = OxmlElement('w:tblBorders')
-            
-            # Set all borders to none
-            for border in ['top', 'left', 'bottom', 'right', 'insideH', 'insideV']:
-                border_elem = OxmlElement(f'w:{border}')
-                border_elem.set(qn('w:val'), 'none')
-                border_elem.set(qn('w:sz'), '0')
-                border_elem.set(qn('w:space'), '0')
-                border_elem.set(qn('w:color'), 'auto')
-                tblBorders.append(border_elem)
-            
-            # Replace any existing borders element
-            existing_borders = tblPr.find('.//w:tblBorders')
-            if existing_borders is not None:
-                tblPr.remove(existing_borders)
-            tblPr.append(tblBorders)
-            
-            # Also set individual cell borders to none
-            for row in table.rows:
-                for cell in row.cells:
-                    # For all borders
-                    for border in ['top', 'left', 'bottom', 'right']:
-                        # Get the border element
-                        border_elm = cell._element.xpath(f"w:tcPr/w:tcBorders/w:{border}")
-                        if border_elm:
-                            # Set the border value to 'nil'
-                            border_elm[0].set(qn('w:val'), 'nil')
-        except Exception as e:
-            logger.warning(f"Error removing table borders: {str(e)}")
-    
-    def _categorize_blocks_by_column(self, page, columns):
+    def _categorize_blocks_by_column(self, snapshot, columns):
         """Categorize blocks into columns based on position"""
-        blocks = page.get_text("dict").get("blocks", [])
+        blocks = snapshot.text_blocks
         columns_blocks = [[] for _ in columns]
         
         for block in blocks:
-            if block.get("type") != 0 or "bbox" not in block:  # Skip non-text blocks or blocks without bbox
-                continue
-            
             # Get block coordinates
-            x_min = block["bbox"][0]
-            x_max = block["bbox"][2]
+            x_min = block.bbox[0]
+            x_max = block.bbox[2]
             block_center_x = (x_min + x_max) / 2
             
             # Find which column this block belongs to
@@ -1400,7 +1670,7 @@ class DocumentConverter:
         
         # Sort blocks in each column by y-position
         for col_blocks in columns_blocks:
-            col_blocks.sort(key=lambda b: b["bbox"][1])
+            col_blocks.sort(key=lambda b: b.bbox[1])
         
         return columns_blocks
     
@@ -1430,7 +1700,7 @@ class DocumentConverter:
                     self._add_header_text(header_para, block, layout_info)
                     
                     # If it's a main header, update current section
-                    section_name = self._extract_text(block).strip()
+                    section_name = block.text.strip()
                     if section_name:
                         current_section = section_name
                         current_list = False
@@ -1439,8 +1709,8 @@ class DocumentConverter:
                     is_continuation = False
                     if i > 0:
                         prev_block = blocks[i-1]
-                        prev_text = self._extract_text(prev_block).strip()
-                        current_text = self._extract_text(block).strip()
+                        prev_text = prev_block.text.strip()
+                        current_text = block.text.strip()
                         
                         # Check if previous block ends without punctuation and current starts lowercase
                         if (prev_text and not prev_text[-1] in '.!?:;' and 
@@ -1451,13 +1721,13 @@ class DocumentConverter:
                     if is_continuation and cell.paragraphs:
                         # Add to the previous paragraph instead of creating a new one
                         para = cell.paragraphs[-1]
-                        para.add_run(' ' + self._extract_text(block))
+                        para.add_run(' ' + block.text)
                     else:
                         # Process regular content
                         self._process_content_block(cell, block, layout_info, current_section, current_list, is_resume)
                     
                     # Check if this block contains bullet points
-                    block_text = self._extract_text(block)
+                    block_text = block.text
                     if any(bullet in block_text for bullet in layout_info['bullet_styles']):
                         current_list = True
                     elif block_text.strip() and not re.match(r'^\s*[•⦁◦·○●]\s', block_text):
@@ -1466,7 +1736,7 @@ class DocumentConverter:
                 logger.warning(f"Error processing block: {str(e)}")
                 # Add a simple paragraph with the text to ensure content is not lost
                 try:
-                    p = cell.add_paragraph(self._extract_text(block))
+                    p = cell.add_paragraph(block.text)
                 except:
                     pass
     
@@ -1474,7 +1744,7 @@ class DocumentConverter:
         """Determine if a block is a header"""
         try:
             # Extract text from block
-            block_text = self._extract_text(block).strip()
+            block_text = block.text.strip()
             
             # Check if any headers match this block
             for header in headers:
@@ -1482,13 +1752,12 @@ class DocumentConverter:
                     return True
             
             # Check if block has header-like properties
-            for line in block.get("lines", []):
-                for span in line.get("spans", []):
-                    # Check for larger font size or bold flag
-                    if span.get("size", 0) > 13 or (span.get("flags", 0) & 16):
-                        # Additionally check if text is short (typical for headers)
-                        if len(block_text) < 50:
-                            return True
+            for span in block.spans():
+                # Check for larger font size or bold flag
+                if span.size > 13 or (span.flags & 16):
+                    # Additionally check if text is short (typical for headers)
+                    if len(block_text) < 50:
+                        return True
         except Exception as e:
             logger.debug(f"Error checking header: {str(e)}")
         
@@ -1497,7 +1766,7 @@ class DocumentConverter:
     def _add_header_text(self, paragraph, block, layout_info):
         """Add properly formatted header text to paragraph"""
         try:
-            text = self._extract_text(block).strip()
+            text = block.text.strip()
             if not text:
                 return
             
@@ -1505,17 +1774,15 @@ class DocumentConverter:
             header_level = 1  # Default to level 1
             max_size = 0
             is_bold = False
-            is_first_header = text == self._extract_text(block).strip()
+            is_first_header = True
             
             # Extract formatting from spans
-            for line in block.get("lines", []):
-                for span in line.get("spans", []):
-                    size = span.get("size", 0)
-                    if size > max_size:
-                        max_size = size
-                    
-                    if span.get("flags", 0) & 16:  # Bold flag
-                        is_bold = True
+            for span in block.spans():
+                if span.size > max_size:
+                    max_size = span.size
+                
+                if span.flags & 16:  # Bold flag
+                    is_bold = True
             
             # Determine header level
             body_size = layout_info.get('body_font_size', 11)
@@ -1575,7 +1842,7 @@ class DocumentConverter:
         except Exception as e:
             logger.warning(f"Error formatting header: {str(e)}")
             # Fallback to simple text
-            paragraph.text = self._extract_text(block).strip()
+            paragraph.text = block.text.strip()
     
     def _add_bottom_border(self, paragraph):
         """Add bottom border to paragraph for header underlining"""
@@ -1614,7 +1881,7 @@ class DocumentConverter:
             paragraph = cell.add_paragraph()
             
             # Check for bullet points
-            text = self._extract_text(block)
+            text = block.text
             contains_bullets = any(bullet in text for bullet in layout_info['bullet_styles'])
             
             # If this looks like a list item but no bullet markers detected,
@@ -1646,13 +1913,12 @@ class DocumentConverter:
                     return
             
             # Process lines in the block
-            for line_idx, line in enumerate(block.get("lines", [])):
+            for line_idx, line in enumerate(block.lines):
                 if line_idx > 0:
                     # Add line break between lines
                     paragraph.add_run().add_break()
                 
-                # Extract text for this line
-                line_text = "".join(span.get("text", "") for span in line.get("spans", []))
+                line_text = line.text
                 
                 # Check if this is a bullet point
                 is_bullet = re.match(r'^\s*[•⦁◦·○●◆⬤✦]\s', line_text) or re.match(r'^\s*\d+\.\s', line_text)
@@ -1670,18 +1936,12 @@ class DocumentConverter:
                     run = paragraph.add_run(clean_text)
                     
                     # Preserve formatting from original
-                    if line.get("spans"):
-                        self._apply_span_formatting(run, line.get("spans")[0])
+                    if line.spans:
+                        self._apply_span_formatting(run, line.spans[0])
             else:
                     # Regular text - preserve spans and their formatting
-                    spans = line.get("spans", [])
-                    for span in spans:
-                        span_text = span.get("text", "").strip()
-                        if not span_text:
-                            continue
-                        
-                        run = paragraph.add_run(span_text + " ")
-                        self._apply_span_formatting(run, span)
+                    spans = line.spans
+                    self._add_span_runs(paragraph, spans)
                     
                     # If no spans were processed, add the line text directly
                     if not spans:
@@ -1720,14 +1980,14 @@ class DocumentConverter:
             logger.warning(f"Error processing content block: {str(e)}")
             # Add a simple paragraph with the text to ensure content is not lost
             try:
-                cell.add_paragraph(self._extract_text(block))
+                cell.add_paragraph(block.text)
             except:
                 pass
     
     def _contains_ratings(self, block):
         """Check if a block contains skill ratings (patterns of dots or circles)"""
         try:
-            text = self._extract_text(block)
+            text = block.text
             # Look for patterns like ●●●○○ or ★★★☆☆
             return bool(re.search(r'[●○★☆■□]{3,}', text))
         except:
@@ -1737,11 +1997,9 @@ class DocumentConverter:
         """Process a block containing skill ratings"""
         try:
             # Create paragraph for each line
-            for line in block.get("lines", []):
+            for line in block.lines:
                 paragraph = cell.add_paragraph()
-                
-                # Get text for this line
-                line_text = "".join(span.get("text", "") for span in line.get("spans", []))
+                line_text = line.text
                 
                 # Try to extract skill name and rating
                 rating_match = re.search(r'(.*?)([●○★☆■□]{3,})', line_text)
@@ -1775,75 +2033,75 @@ class DocumentConverter:
             logger.warning(f"Error processing ratings: {str(e)}")
             # Fallback to simple text
             try:
-                cell.add_paragraph(self._extract_text(block))
+                cell.add_paragraph(block.text)
             except:
                 pass
     
+    def _add_span_runs(self, paragraph, spans):
+        """Add the spans' text to a paragraph, one run per group of adjacent spans that look the same"""
+        texts = []
+        first_span = format_key = None
+        for span in spans:
+            text = span.text.strip()
+            if not text:
+                continue
+            
+            span_key = self._span_format_key(span)
+            if texts and span_key != format_key:
+                run = paragraph.add_run(''.join(texts))
+                self._apply_span_formatting(run, first_span)
+                texts = []
+            if not texts:
+                first_span, format_key = span, span_key
+            texts.append(text + " ")
+        
+        if texts:
+            run = paragraph.add_run(''.join(texts))
+            self._apply_span_formatting(run, first_span)
+    
+    def _span_format_key(self, span):
+        """The run formatting _apply_span_formatting derives from a span, as a comparable tuple"""
+        # Sizes are compared in the half points Word stores
+        half_points = int(Pt(max(6, min(72, span.size))).pt * 2) if span.size > 0 else None
+        return span.font or None, half_points, span.color & 0xFFFFFF, span.flags & (16 | 2 | 4)
+    
     def _apply_span_formatting(self, run, span):
         """Apply text formatting from span to run"""
         try:
             # Set font name if available
-            font_name = span.get("font", "Calibri")
-            if font_name and len(font_name) > 0:
-                run.font.name = font_name
+            if span.font:
+                run.font.name = span.font
             
             # Set font size
-            size = span.get("size", 11)
-            if size > 0:
-                run.font.size = Pt(max(6, min(72, size)))  # Clamp between 6 and 72
-            
-            # Set font color if available
-            if "color" in span:
-                color = span["color"]
-                # Convert from integer RGB values to RGBColor
-                if isinstance(color, int):
-                    # Extract RGB components (assuming color is stored as RGB integer)
-                    r = (color >> 16) & 0xFF
-                    g = (color >> 8) & 0xFF
-                    b = color & 0xFF
-                    run.font.color.rgb = RGBColor(r, g, b)
+            if span.size > 0:
+                run.font.size = Pt(max(6, min(72, span.size)))  # Clamp between 6 and 72
+            
+            # Convert the integer sRGB colour to RGBColor
+            color = span.color
+            r = (color >> 16) & 0xFF
+            g = (color >> 8) & 0xFF
+            b = color & 0xFF
+            run.font.color.rgb = RGBColor(r, g, b)
             
             # Apply text decorations
-            flags = span.get("flags", 0)
+            flags = span.flags
             run.bold = bool(flags & 16)  # 2^4 = 16 (bold flag)
             run.italic = bool(flags & 2)  # 2^1 = 2 (italic flag)
             run.underline = bool(flags & 4)  # 2^2 = 4 (underline flag)
         except Exception as e:
             logger.debug(f"Error applying formatting: {str(e)}")
     
-    def _extract_text(self, block):
-        """Extract all text from a block"""
-        try:
-            text = ""
-            for line in block.get("lines", []):
-                for span in line.get("spans", []):
-                    text += span.get("text", "")
-            return text
-        except Exception as e:
-            logger.debug(f"Error extracting text: {str(e)}")
-            return ""
-    
     def _detect_text_alignment(self, block):
         """Detect the alignment of text in a block"""
         try:
-            # Get all spans in the block
-            spans = []
-            for line in block.get("lines", []):
-                spans.extend(line.get("spans", []))
-            
-            if not spans:
+            if not any(line.spans for line in block.lines):
                 return None
             
-            # Get page width and block position
-            page_width = block.get("page", {}).get("width", 0)
-            if not page_width:  # If page width not available in block
-                page_width = 612  # Default A4 width in points
-            
-            if "bbox" not in block or len(block["bbox"]) < 4:
-                return WD_PARAGRAPH_ALIGNMENT.LEFT
+            # Blocks do not carry their page size; assume a Letter-width page
+            page_width = 612
                 
-            block_left = block["bbox"][0]
-            block_right = block["bbox"][2]
+            block_left = block.bbox[0]
+            block_right = block.bbox[2]
             block_width = block_right - block_left
             page_center = page_width / 2
             block_center = block_left + (block_width / 2)
@@ -1867,11 +2125,12 @@ class DocumentConverter:
             # Default to None if detection fails
             return WD_PARAGRAPH_ALIGNMENT.LEFT
     
-    def _extract_and_add_images(self, doc, page):
+    @timed_stage('image_extraction')
+    def _extract_and_add_images(self, doc, snapshot):
         """Extract images from the PDF page and add them to the document"""
         try:
             # Get list of image blocks
-            image_list = page.get_images(full=True)
+            image_list = snapshot.images
             
             for img_index, img_info in enumerate(image_list):
                 if not img_info or len(img_info) < 1:
@@ -1879,30 +2138,20 @@ class DocumentConverter:
                     
                 xref = img_info[0]  # Image reference number
                 
-                # Extract the image
-                base_image = page.parent.extract_image(xref)
-                image_bytes = base_image.get("image")
+                # Extract the image (once per document, repeated logos reuse the same part)
+                image_part = self._get_image_part(doc, snapshot.page.parent, xref)
                 
                 # Get image rectangle (position and size)
-                image_rect = None
-                for block in page.get_text("dict").get("blocks", []):
-                    if block.get("type") == 1 and block.get("xref") == xref:  # Image block
-                        image_rect = block.get("bbox")
-                        break
+                image_rect = snapshot.image_bbox(xref)
                 
-                if image_bytes:
-                    # Create a temporary file for the image
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as temp_file:
-                        temp_file.write(image_bytes)
-                        temp_path = temp_file.name
-                    
+                if image_part:
                     # Add a paragraph for image positioning
                     p = doc.add_paragraph()
                     
                     # Set alignment based on image position
                     if image_rect:
                         x_center = (image_rect[0] + image_rect[2]) / 2
-                        page_center = page.rect.width / 2
+                        page_center = snapshot.width / 2
                         
                         if abs(x_center - page_center) < 50:  # Image is centered
                             p.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
@@ -1911,19 +2160,38 @@ class DocumentConverter:
                         else:  # Image is right-aligned
                             p.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
                     
-                    # Add the image
+                    # Add the image straight from the cached part
                     run = p.add_run()
-                    run.add_picture(temp_path)
-                    
-                    # Clean up temporary file
-                    try:
-                        os.unlink(temp_path)
-                    except:
-                        pass
+                    rId, image = image_part
+                    cx, cy = image.scaled_dimensions(None, None)
+                    inline = CT_Inline.new_pic_inline(doc.part.next_id, rId, image.filename, cx, cy)
+                    run._r.add_drawing(inline)
         
         except Exception as e:
             logger.warning(f"Error extracting images: {str(e)}")
 
+    def _get_image_part(self, doc, pdf, xref):
+        """Return the cached (rId, Image) for a PDF image, extracting it in memory on first use"""
+        if xref in self._image_parts:
+            return self._image_parts[xref]
+        
+        image_part = None
+        base_image = pdf.extract_image(xref)
+        image_bytes = base_image.get("image") if base_image else None
+        
+        if image_bytes:
+            # Encodings python-docx cannot parse (JPX, JBIG2, ...) are re-encoded as PNG
+            if base_image.get("ext", "").lower() not in DOCX_IMAGE_EXTENSIONS:
+                pix = fitz.Pixmap(pdf, xref)
+                if pix.n - pix.alpha >= 4:  # CMYK cannot be written as PNG
+                    pix = fitz.Pixmap(fitz.csRGB, pix)
+                image_bytes = pix.tobytes("png")
+            
+            image_part = doc.part.get_or_add_image(io.BytesIO(image_bytes))
+        
+        self._image_parts[xref] = image_part
+        return image_part
+
     def _detect_alignment_zones(self, x_coordinates, page_width):
         """Detect alignment zones (left, center, right) on the page"""
         try:
@@ -1960,22 +2228,24 @@ class DocumentConverter:
     def _find_peaks(self, histogram):
         """Find peaks in a histogram"""
         try:
+            histogram = np.asarray(histogram)
+            
             # Minimum height for a peak
-            min_height = max(histogram) * 0.2
+            min_height = histogram.max() * 0.2
             
             # Minimum distance between peaks (in bins)
             min_distance = max(1, len(histogram) // 10)
             
-            # Find peaks
+            # Local maxima that are tall enough
+            inner = histogram[1:-1]
+            candidates = np.flatnonzero((inner > histogram[:-2]) & (inner > histogram[2:]) &
+                                        (inner >= min_height)) + 1
+            
+            # Keep peaks left to right, skipping any too close to the previous one
             peaks = []
-            for i in range(1, len(histogram) - 1):
-                # Check if this point is higher than its neighbors
-                if histogram[i] > histogram[i-1] and histogram[i] > histogram[i+1]:
-                    # Check minimum height
-                    if histogram[i] >= min_height:
-                        # Check minimum distance from existing peaks
-                        if not any(abs(i - p) < min_distance for p in peaks):
-                            peaks.append(i)
+            for i in candidates.tolist():
+                if not peaks or i - peaks[-1] >= min_distance:
+                    peaks.append(i)
             
             return peaks
         except Exception as e:
@@ -1995,46 +2265,15 @@ class DocumentConverter:
             # Smooth the histogram to reduce noise
             smoothed_hist = np.convolve(hist, np.ones(3)/3, mode='same')
             
-            # Find density valleys (spaces between columns)
-            valleys = []
-            for i in range(1, len(smoothed_hist) - 1):
-                if (smoothed_hist[i] < smoothed_hist[i-1] and 
-                    smoothed_hist[i] < smoothed_hist[i+1] and
-                    smoothed_hist[i] < max(smoothed_hist) * 0.2):  # 20% of max height
-                    valleys.append(i)
-            
-            # Convert valley indices to x-coordinates
-            valley_x = [bin_edges[i] for i in valleys if i < len(bin_edges)]
+            # Find density valleys (spaces between columns) below 20% of max height
+            valley_x = bin_edges[self._find_valleys(smoothed_hist)]
             
-            # Filter valleys that are too close together
+            # Filter valleys that are too close to the previous valley
             min_column_width = page_width * 0.1  # 10% of page width
-            filtered_valleys = []
-            for i, x in enumerate(valley_x):
-                if i == 0 or x - valley_x[i-1] >= min_column_width:
-                    filtered_valleys.append(x)
-            
-            # Create columns from valley boundaries
-            columns = []
-            if filtered_valleys:
-                # Add left edge as first column boundary
-                boundaries = [0] + filtered_valleys + [page_width]
-                
-                for i in range(len(boundaries) - 1):
-                    left = boundaries[i]
-                    right = boundaries[i+1]
-                    width_ratio = (right - left) / page_width
-                    
-                    # Skip if column is too narrow
-                    if width_ratio < 0.1:
-                        continue
-                        
-                    columns.append({
-                        'left': left,
-                        'right': right,
-                        'width_ratio': width_ratio
-                    })
+            keep = np.ones(len(valley_x), dtype=bool)
+            keep[1:] = np.diff(valley_x) >= min_column_width
             
-            return columns
+            return self._columns_from_boundaries(valley_x[keep].tolist(), page_width)
         except Exception as e:
             logger.warning(f"Error in advanced column detection: {str(e)}")
             return []
@@ -2088,12 +2327,14 @@ class DocumentConverter:
             logger.warning(f"Error creating columns from alignment zones: {str(e)}")
             return []
 
-    def _analyze_page_layout(self, page):
+    @timed_stage('page_layout_analysis')
+    def _analyze_page_layout(self, snapshot):
         """Advanced page layout analysis with improved structure detection"""
         try:
             # Extract text blocks and prepare for analysis
-            blocks = page.get_text("dict").get("blocks", [])
-            text_blocks = [b for b in blocks if b.get("type") == 0]
+            text_blocks = snapshot.text_blocks
+            page_width = snapshot.width
+            page_height = snapshot.height
             
             # Initialize layout info with more detailed structure
             layout_info = {
@@ -2102,18 +2343,18 @@ class DocumentConverter:
                 'headers': [],
                 'has_ratings': False,
                 'bullet_styles': set(),
-                'page_width': page.rect.width,
-                'page_height': page.rect.height,
+                'page_width': page_width,
+                'page_height': page_height,
                 'font_sizes': {},
                 'all_x_coordinates': [],
                 'alignment_zones': [],
                 'text_blocks_count': len(text_blocks),
                 'is_resume': False,
-                'text_density_map': {},  # NEW: Track text density across the page
+                'text_density_map': None,  # NEW: Track text density across the page
                 'margins': {            # NEW: Track document margins
-                    'left': page.rect.width,
+                    'left': page_width,
                     'right': 0,
-                    'top': page.rect.height,
+                    'top': page_height,
                     'bottom': 0
                 },
                 'line_heights': [],     # NEW: Track line heights for better spacing
@@ -2121,150 +2362,98 @@ class DocumentConverter:
                 'vertical_spacing': []   # NEW: Track vertical spacing between elements
             }
             
-            # More precise text block analysis
-            x_coordinates = []
-            y_coordinates = []
-            
-            # Create a density map of the page (divide into 100x100 grid)
-            density_map = {}
-            grid_size = 100
-            for i in range(grid_size):
-                for j in range(grid_size):
-                    density_map[f"{i}_{j}"] = 0
-                    
-            page_width = page.rect.width
-            page_height = page.rect.height
+            # Single pass over blocks, lines and spans; everything else works on arrays
+            font_sizes = layout_info['font_sizes']
+            bullet_styles = layout_info['bullet_styles']
+            line_heights = layout_info['line_heights']
+            first_line_x = []
+            block_max_sizes = []
+            block_is_bold = []
             
-            # Extract comprehensive layout information
             for block in text_blocks:
-                if "bbox" in block and len(block["bbox"]) >= 4:
-                    # Extract precise coordinates
-                    x_min = block["bbox"][0]
-                    y_min = block["bbox"][1]
-                    x_max = block["bbox"][2]
-                    y_max = block["bbox"][3]
-                    
-                    # Track boundaries for accurate margin detection
-                    layout_info['margins']['left'] = min(layout_info['margins']['left'], x_min)
-                    layout_info['margins']['right'] = max(layout_info['margins']['right'], x_max)
-                    layout_info['margins']['top'] = min(layout_info['margins']['top'], y_min)
-                    layout_info['margins']['bottom'] = max(layout_info['margins']['bottom'], y_max)
-                    
-                    # Collect coordinate data
-                    x_coordinates.append(x_min)
-                    x_coordinates.append(x_max)
-                    layout_info['all_x_coordinates'].append(x_min)
-                    layout_info['all_x_coordinates'].append(x_max)
-                    
-                    y_coordinates.append(y_min)
-                    y_coordinates.append(y_max)
-                    
-                    # Update density map
-                    width = x_max - x_min
-                    height = y_max - y_min
-                    
-                    # Convert to grid coordinates
-                    grid_x_min = int((x_min / page_width) * grid_size)
-                    grid_x_max = int((x_max / page_width) * grid_size)
-                    grid_y_min = int((y_min / page_height) * grid_size)
-                    grid_y_max = int((y_max / page_height) * grid_size)
-                    
-                    # Update density in all overlapping grid cells
-                    for i in range(max(0, grid_x_min), min(grid_size, grid_x_max + 1)):
-                        for j in range(max(0, grid_y_min), min(grid_size, grid_y_max + 1)):
-                            density_map[f"{i}_{j}"] += 1
-                
-                # Track line heights for better spacing detection
-                for line_idx, line in enumerate(block.get("lines", [])):
-                    if "bbox" in line and len(line["bbox"]) >= 4:
-                        line_height = line["bbox"][3] - line["bbox"][1]
-                        layout_info['line_heights'].append(line_height)
-                        
-                        # Track indentation level
-                        if line_idx == 0 and line["bbox"][0] > layout_info['margins']['left'] + 5:
-                            # This might be an indented paragraph
-                            indentation = line["bbox"][0] - layout_info['margins']['left']
-                            layout_info['indentation_levels'].append(indentation)
-                
-                # Check for vertical spacing between blocks
-                if len(y_coordinates) >= 4:  # Need at least two blocks to compute spacing
-                    prev_block_bottom = y_coordinates[-3]  # Second-to-last bottom
-                    curr_block_top = y_coordinates[-2]     # Last top
-                    spacing = curr_block_top - prev_block_bottom
-                    if spacing > 0:
-                        layout_info['vertical_spacing'].append(spacing)
-                
-                # Collect formatting information for design analysis
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        font_size = span.get("size", 0)
-                        font_name = span.get("font", "")
-                        text_color = span.get("color", 0)
-                        
+                max_size = 0
+                is_bold = False
+                for line in block.lines:
+                    line_heights.append(line.bbox[3] - line.bbox[1])
+                    for span in line.spans:
+                        size = span.size
                         # Track font sizes with frequency
-                        layout_info['font_sizes'][font_size] = layout_info['font_sizes'].get(font_size, 0) + 1
-                    
-                    # Check for bullet points with more patterns
-                    line_text = "".join(span.get("text", "") for span in line.get("spans", []))
-                    bullet_patterns = [
-                        r'^\s*[•⦁◦·○●◆⬤✦]\s',  # Common bullet symbols
-                        r'^\s*[-–—]\s',         # Dashes as bullets
-                        r'^\s*\d+\.\s',         # Numbered lists
-                        r'^\s*[a-zA-Z]\)\s',    # Letter lists like a) b) c)
-                        r'^\s*\(\d+\)\s'        # Number in parentheses like (1) (2)
-                    ]
+                        font_sizes[size] = font_sizes.get(size, 0) + 1
+                        if size > max_size:
+                            max_size = size
+                        if span.flags & 16:  # Bold flag
+                            is_bold = True
                     
-                    for pattern in bullet_patterns:
-                        if re.match(pattern, line_text):
-                            # Extract the actual bullet character used
-                            bullet_match = re.match(pattern, line_text)
-                            if bullet_match and bullet_match.group(0):
-                                bullet_char = bullet_match.group(0).strip()
-                                if bullet_char:
-                                    layout_info['bullet_styles'].add(bullet_char[0])
-            
-            # Store density map
+                    # Record the marker character of bulleted and numbered lines
+                    bullet_match = BULLET_PATTERN.match(line.text)
+                    if bullet_match:
+                        bullet_styles.add(bullet_match.group(0).strip()[0])
+                
+                first_line_x.append(block.lines[0].bbox[0] if block.lines else np.nan)
+                block_max_sizes.append(max_size)
+                block_is_bold.append(is_bold)
+            
+            bboxes = np.array([block.bbox for block in text_blocks], dtype=float).reshape(-1, 4)
+            x_min, y_min, x_max, y_max = bboxes.T
+            
+            if len(bboxes):
+                # Track boundaries for accurate margin detection
+                margins = layout_info['margins']
+                margins['left'] = min(page_width, float(x_min.min()))
+                margins['right'] = max(0, float(x_max.max()))
+                margins['top'] = min(page_height, float(y_min.min()))
+                margins['bottom'] = max(0, float(y_max.max()))
+                
+                # A first line starting right of the left margin seen so far is an indentation
+                running_left = np.minimum.accumulate(np.minimum(x_min, page_width))
+                indentation = np.asarray(first_line_x) - running_left
+                layout_info['indentation_levels'] = indentation[indentation > 5].tolist()
+                
+                # Gaps between consecutive blocks
+                spacing = y_min[1:] - y_max[:-1]
+                layout_info['vertical_spacing'] = spacing[spacing > 0].tolist()
+            
+            # Left and right edge of every block, in block order
+            x_coordinates = bboxes[:, [0, 2]].ravel()
+            layout_info['all_x_coordinates'] = x_coordinates.tolist()
+            
+            # Create a density map of the page (divide into 100x100 grid, indexed [x, y])
+            grid_size = 100
+            density_map = self._text_density_map(bboxes, page_width, page_height, grid_size)
             layout_info['text_density_map'] = density_map
             
             # Enhance document type detection
-            text_content = page.get_text().upper()
-            resume_keywords = [
-                'RESUME', 'CV', 'CURRICULUM VITAE', 'PROFILE', 'EXPERIENCE', 'EDUCATION', 'SKILLS',
-                'WORK HISTORY', 'EMPLOYMENT', 'KONTAKT', 'PROFIL', 'UTBILDNING', 'ARBETSLIVSERFARENHET',
-                'SUMMARY', 'OBJECTIVE', 'QUALIFICATIONS', 'CAREER HIGHLIGHTS', 'CERTIFICATIONS'
-            ]
-            
-            # Check for typical resume patterns
-            has_contact_info = bool(re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text_content))  # Email
-            has_phone = bool(re.search(r'(?:\+|00)?[0-9()\s-]{7,}', text_content))  # Phone number
+            text_content = snapshot.text.upper()
             
             # Count resume keywords found
-            resume_keyword_count = sum(1 for keyword in resume_keywords if keyword in text_content)
+            resume_keyword_count = sum(1 for keyword in LAYOUT_RESUME_KEYWORDS if keyword in text_content)
             
-            # If we found multiple resume keywords OR contact info with at least one keyword
-            if resume_keyword_count >= 2 or (resume_keyword_count >= 1 and (has_contact_info or has_phone)):
+            # If we found multiple resume keywords OR contact info (email or phone) with
+            # at least one keyword; the page-wide searches only run when they can decide it
+            if resume_keyword_count >= 2 or (resume_keyword_count == 1 and (
+                    EMAIL_PATTERN.search(text_content) or PHONE_PATTERN.search(text_content))):
                 layout_info['is_resume'] = True
                 
             # IMPROVED: Advanced column detection using multiple methods
             
             # 1. First try density map analysis for column detection
-            columns_from_density = self._detect_columns_from_density(density_map, grid_size, page.rect.width)
+            columns_from_density = self._detect_columns_from_density(density_map, grid_size, page_width)
             
             # 2. Then try improved histogram method
             columns_from_histogram = []
             if len(x_coordinates) > 5:  # Need enough blocks for reliable detection
                 try:
-                    columns_from_histogram = self._detect_columns_advanced(x_coordinates, page.rect.width)
+                    columns_from_histogram = self._detect_columns_advanced(x_coordinates, page_width)
                 except Exception as e:
                     logger.warning(f"Enhanced column detection failed: {str(e)}")
             
             # 3. Finally try alignment zone analysis
             columns_from_alignment = []
-            if layout_info['all_x_coordinates']:
+            if len(x_coordinates):
                 try:
-                    alignment_zones = self._detect_alignment_zones(np.array(layout_info['all_x_coordinates']), page.rect.width)
+                    alignment_zones = self._detect_alignment_zones(x_coordinates, page_width)
                     layout_info['alignment_zones'] = alignment_zones
-                    columns_from_alignment = self._columns_from_alignment_zones(alignment_zones, page.rect.width)
+                    columns_from_alignment = self._columns_from_alignment_zones(alignment_zones, page_width)
                 except Exception as e:
                     logger.warning(f"Alignment zones detection failed: {str(e)}")
             
@@ -2301,7 +2490,6 @@ class DocumentConverter:
             # Find most common paragraph spacing for consistent layout
             if layout_info['vertical_spacing']:
                 # Use statistical mode to find most common spacing
-                from statistics import mode, mean
                 try:
                     layout_info['common_paragraph_spacing'] = mode(layout_info['vertical_spacing'])
                 except StatisticsError:
@@ -2309,7 +2497,7 @@ class DocumentConverter:
                     layout_info['common_paragraph_spacing'] = mean(layout_info['vertical_spacing'])
             
             # Identify headers (larger or bold text) with improved detection
-            layout_info['headers'] = self._detect_headers(text_blocks, layout_info['font_sizes'])
+            layout_info['headers'] = self._detect_headers(text_blocks, block_max_sizes, block_is_bold, font_sizes)
             
             # Check for rating indicators (dots or stars)
             layout_info['has_ratings'] = self._detect_ratings(text_blocks)
@@ -2325,68 +2513,81 @@ class DocumentConverter:
                 'headers': [],
                 'has_ratings': False,
                 'bullet_styles': set(),
-                'page_width': page.rect.width if page else 612,  # Default A4 width
-                'page_height': page.rect.height if page else 792,  # Default A4 height
+                'page_width': snapshot.width if snapshot else 612,  # Default A4 width
+                'page_height': snapshot.height if snapshot else 792,  # Default A4 height
                 'font_sizes': {},
                 'all_x_coordinates': [],
                 'text_blocks_count': 0
             }
+    
+    def _text_density_map(self, bboxes, page_width, page_height, grid_size):
+        """Count the blocks overlapping each cell of a grid_size x grid_size page grid"""
+        # Convert to grid coordinates (truncating like int())
+        grid = (bboxes / [page_width, page_height, page_width, page_height] * grid_size).astype(int)
+        x_start = np.maximum(0, grid[:, 0])
+        y_start = np.maximum(0, grid[:, 1])
+        x_stop = np.minimum(grid_size, grid[:, 2] + 1)
+        y_stop = np.minimum(grid_size, grid[:, 3] + 1)
+        valid = (x_start < x_stop) & (y_start < y_stop)
+        x_start, y_start, x_stop, y_stop = x_start[valid], y_start[valid], x_stop[valid], y_stop[valid]
+        
+        # Mark each rectangle's corners in a difference grid; two prefix sums fill it in
+        diff = np.zeros((grid_size + 1, grid_size + 1), dtype=np.int32)
+        np.add.at(diff, (x_start, y_start), 1)
+        np.add.at(diff, (x_stop, y_start), -1)
+        np.add.at(diff, (x_start, y_stop), -1)
+        np.add.at(diff, (x_stop, y_stop), 1)
+        return diff.cumsum(axis=0).cumsum(axis=1)[:grid_size, :grid_size].astype(np.int32)
+            
+    def _find_valleys(self, profile):
+        """Indices of local minima in profile that are below 20% of its maximum"""
+        profile = np.asarray(profile)
+        inner = profile[1:-1]
+        is_valley = ((inner < profile[:-2]) &
+                     (inner < profile[2:]) &
+                     (inner < profile.max() * 0.2))
+        return np.flatnonzero(is_valley) + 1
+    
+    def _columns_from_boundaries(self, valleys, page_width):
+        """Turn gap positions into columns between them, skipping any under 10% of the page"""
+        # Need at least one valley to create columns
+        if not valleys:
+            return []
+        
+        columns = []
+        boundaries = [0] + list(valleys) + [page_width]
+        for left, right in zip(boundaries, boundaries[1:]):
+            width_ratio = (right - left) / page_width
+            if width_ratio < 0.1:
+                continue
             
+            columns.append({
+                'left': left,
+                'right': right,
+                'width_ratio': width_ratio
+            })
+        
+        return columns
+    
     def _detect_columns_from_density(self, density_map, grid_size, page_width):
         """Detect columns using the text density map"""
         try:
-            # Create a vertical density profile
-            vertical_profile = [0] * grid_size
-            
-            for i in range(grid_size):
-                for j in range(grid_size):
-                    vertical_profile[i] += density_map.get(f"{i}_{j}", 0)
-            
-            # Find valleys in the density profile (these are gaps between columns)
-            valleys = []
-            for i in range(1, grid_size - 1):
-                # Check if this is a local minimum
-                if (vertical_profile[i] < vertical_profile[i-1] and 
-                    vertical_profile[i] < vertical_profile[i+1] and
-                    vertical_profile[i] < max(vertical_profile) * 0.2):  # Significant gap
-                    valleys.append(i)
-            
-            # Convert to page coordinates
-            valley_positions = [(v * page_width) / grid_size for v in valleys]
-            
-            # Need at least one valley to create columns
-            if not valley_positions:
-                return []
-                
-            # Create columns from valley boundaries
-            columns = []
+            # Create a vertical density profile (total density per x cell)
+            vertical_profile = np.asarray(density_map).sum(axis=1)
             
-            # Add left edge as first boundary
-            boundaries = [0] + valley_positions + [page_width]
+            # Valleys in the density profile are gaps between columns
+            valleys = self._find_valleys(vertical_profile)
             
-            for i in range(len(boundaries) - 1):
-                left = boundaries[i]
-                right = boundaries[i+1]
-                width_ratio = (right - left) / page_width
-                
-                # Skip if column is too narrow
-                if width_ratio < 0.1:  # Less than 10% of page width
-                    continue
-                    
-                columns.append({
-                    'left': left,
-                    'right': right,
-                    'width_ratio': width_ratio
-                })
-            
-            return columns
+            # Convert to page coordinates
+            valley_positions = ((valleys * page_width) / grid_size).tolist()
+            return self._columns_from_boundaries(valley_positions, page_width)
             
         except Exception as e:
             logger.warning(f"Error in density-based column detection: {str(e)}")
             return []
     
-    def _detect_headers(self, text_blocks, font_sizes):
-        """Improved header detection with multiple signals"""
+    def _detect_headers(self, text_blocks, max_sizes, is_bold, font_sizes):
+        """Improved header detection with multiple signals (per-block max size and bold flag)"""
         try:
             # Find the most common (body) font size
             if not font_sizes:
@@ -2394,72 +2595,37 @@ class DocumentConverter:
                 
             body_font_size = max(font_sizes.items(), key=lambda x: x[1])[0]
             
+            # Size signals for every block at once: larger than body text, and header level
+            sizes = np.asarray(max_sizes, dtype=float)
+            is_larger = sizes > body_font_size * 1.1
+            levels = np.where(~is_larger, 3, np.where(sizes <= body_font_size * 1.5, 2, 1))
+            
             # Headers are typically larger or bold
             headers = []
             
-            for block in text_blocks:
-                # Extract block text once for efficiency
-                block_text = self._extract_text(block).strip()
-                if not block_text:
-                    continue
-                    
-                # Skip very long text blocks (likely not headers)
-                if len(block_text) > 100:
+            for index, block in enumerate(text_blocks):
+                block_text = block.text.strip()
+                
+                # Skip empty and very long text blocks (likely not headers)
+                if not block_text or len(block_text) > 100:
                     continue
                 
-                is_header = False
-                max_size = 0
-                is_bold = False
                 all_caps = block_text.isupper() and len(block_text) > 2
                 
-                # Check for header-like formatting
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        size = span.get("size", 0)
-                        if size > max_size:
-                            max_size = size
-                        
-                        # Check for bold flag (16)
-                        if span.get("flags", 0) & 16:
-                            is_bold = True
-                
-                # Combine signals to detect headers
-                if (max_size > body_font_size * 1.1) or (is_bold and all_caps):
-                    is_header = True
-                    
-                # Additional checks for section headers
-                if block_text.endswith(':') and len(block_text) < 30:
-                    is_header = True
-                    
-                # Resume section headers often match these patterns
-                resume_section_patterns = [
-                    r'^(EDUCATION|EXPERIENCE|SKILLS|WORK HISTORY|EMPLOYMENT|PROFILE|SUMMARY|OBJECTIVE|QUALIFICATIONS)$',
-                    r'^(UTBILDNING|ARBETSLIVSERFARENHET|FÄRDIGHETER|PROFIL)$'  # Swedish
-                ]
-                
-                for pattern in resume_section_patterns:
-                    if re.match(pattern, block_text, re.IGNORECASE):
-                        is_header = True
-                        break
+                # Combine signals to detect headers; section labels and resume
+                # section names count as headers whatever their formatting
+                is_header = (is_larger[index] or (is_bold[index] and all_caps) or
+                             (block_text.endswith(':') and len(block_text) < 30) or
+                             RESUME_SECTION_PATTERN.match(block_text) is not None)
                         
                 if is_header:
-                    header_level = 1  # Default level
-                    
-                    # Determine header level based on size and formatting
-                    if max_size <= body_font_size * 1.1:  # Slightly larger than body
-                        header_level = 3
-                    elif max_size <= body_font_size * 1.5:  # Moderately larger
-                        header_level = 2
-                    else:  # Significantly larger
-                        header_level = 1
-                        
                     headers.append({
                         'text': block_text,
-                        'level': header_level,
-                        'position': block.get("bbox", [0, 0, 0, 0]),
-                        'is_bold': is_bold,
+                        'level': int(levels[index]),
+                        'position': block.bbox,
+                        'is_bold': is_bold[index],
                         'is_allcaps': all_caps,
-                        'size': max_size
+                        'size': max_sizes[index]
                     })
             
             return headers
@@ -2471,119 +2637,17 @@ class DocumentConverter:
     def _detect_ratings(self, text_blocks):
         """Detect if document contains rating indicators (skill bars, stars, etc.)"""
         try:
-            for block in text_blocks:
-                text = self._extract_text(block)
-                
-                # Check for rating patterns
-                rating_patterns = [
-                    r'[●○★☆■□]{3,}',    # Filled/empty circles or stars
-                    r'[\|│]{3,}',       # Vertical bars (skill meter)
-                    r'[▮▯]{2,}',        # Block indicators
-                    r'[0-9]+\s*\/\s*[0-9]+',  # Numeric ratings (e.g., 8/10)
-                    r'[0-9]+\s*out of\s*[0-9]+'  # Text ratings (e.g., 4 out of 5)
-                ]
-                
-                for pattern in rating_patterns:
-                    if re.search(pattern, text):
-                        return True
-            
-            return False
-            
+            return any(RATING_PATTERN.search(block.text) for block in text_blocks)
         except Exception as e:
             logger.debug(f"Error detecting ratings: {str(e)}")
             return False
 
-    def _combine_layout_info(self, layout_info_all_pages):
-        """Combine layout information from multiple pages to determine global document style"""
-        try:
-            if not layout_info_all_pages:
-                return {}
-                
-            # Initialize global layout with default values
-            global_layout = {
-                'layout_type': 'single_column',
-                'consistent_layout_type': False,
-                'header_font_sizes': [],
-                'body_font_size': 11,
-                'base_font': 'Calibri',
-                'bullet_styles': set(),
-                'has_ratings': False,
-                'is_resume': False
-            }
-            
-            # Count layout types
-            layout_types = {}
-            for info in layout_info_all_pages:
-                layout_type = info.get('type', 'single_column')
-                layout_types[layout_type] = layout_types.get(layout_type, 0) + 1
-            
-            # Determine dominant layout type
-            if layout_types:
-                dominant_type, count = max(layout_types.items(), key=lambda x: x[1])
-                global_layout['layout_type'] = dominant_type
-                
-                # Check if layout type is consistent across pages
-                if count == len(layout_info_all_pages):
-                    global_layout['consistent_layout_type'] = True
-            
-            # Combine font information
-            all_font_sizes = {}
-            for info in layout_info_all_pages:
-                for size, count in info.get('font_sizes', {}).items():
-                    all_font_sizes[size] = all_font_sizes.get(size, 0) + count
-            
-            # Determine body font size (most common size)
-            if all_font_sizes:
-                global_layout['body_font_size'] = max(all_font_sizes.items(), key=lambda x: x[1])[0]
-                
-                # Extract header sizes (larger than body text)
-                header_sizes = [size for size in all_font_sizes.keys() 
-                               if size > global_layout['body_font_size'] * 1.1]
-                header_sizes.sort(reverse=True)  # Sort from largest to smallest
-                global_layout['header_font_sizes'] = header_sizes[:3]  # Top 3 header sizes
-            
-            # Combine bullet styles
-            for info in layout_info_all_pages:
-                global_layout['bullet_styles'].update(info.get('bullet_styles', set()))
-            
-            # Check if any page has ratings
-            global_layout['has_ratings'] = any(info.get('has_ratings', False) for info in layout_info_all_pages)
-            
-            # Check if document is likely a resume
-            global_layout['is_resume'] = any(info.get('is_resume', False) for info in layout_info_all_pages)
-            
-            # Find most common base font
-            font_counts = {}
-            for info in layout_info_all_pages:
-                for line in [line for block in info.get('blocks', []) 
-                            if isinstance(block, dict) and 'lines' in block
-                            for line in block['lines']]:
-                    for span in line.get('spans', []):
-                        font = span.get('font', '')
-                        if font:
-                            font_counts[font] = font_counts.get(font, 0) + 1
-            
-            if font_counts:
-                global_layout['base_font'] = max(font_counts.items(), key=lambda x: x[1])[0]
-            
-            return global_layout
-            
-        except Exception as e:
-            logger.warning(f"Error combining layout info: {str(e)}")
-            return {
-                'layout_type': 'single_column',
-                'consistent_layout_type': False,
-                'header_font_sizes': [16, 14, 12],
-                'body_font_size': 11,
-                'base_font': 'Calibri'
-            }
-            
-    def _set_page_properties(self, section, page):
+    def _set_page_properties(self, section, snapshot):
         """Set page size and orientation in document section"""
         try:
             # Get page dimensions
-            page_width = page.rect.width
-            page_height = page.rect.height
+            page_width = snapshot.width
+            page_height = snapshot.height
             
             # Convert PDF points to inches (1 point = 1/72 inch)
             width_inches = page_width / 72
@@ -2609,6 +2673,63 @@ class DocumentConverter:
             logger.warning(f"Error setting page properties: {str(e)}")
             # Use default properties if error occurs
 
+def _analyze_pages_worker(input_path, page_numbers):
+    """Worker process entry point: analyse a run of pages into picklable page records"""
+    converter = DocumentConverter(page_workers=0)
+    page_records = []
+    with ConversionContext(input_path) as context:
+        for page_num in page_numbers:
+            snapshot = context.snapshot(page_num)
+            layout_info = converter._analyze_page_layout(snapshot)
+            
+            # The density grid is only needed during analysis; keep the record small
+            layout_info.pop('text_density_map', None)
+            if layout_info.get('columns'):
+                layout_info['column_blocks'] = converter._categorize_blocks_by_column(
+                    snapshot, layout_info['columns'])
+            
+            page_records.append({
+                'number': page_num,
+                'text_blocks': snapshot.text_blocks,
+                'layout_info': layout_info
+            })
+            context.release_snapshot(page_num)
+    return page_records, dict(converter.timings.spans)
+
+def _extract_text_worker(input_path, page_numbers):
+    """Worker process entry point: extract the text of a run of pages"""
+    with ConversionContext(input_path) as context:
+        return [context.pdf[page_num].get_text() for page_num in page_numbers]
+
+def _engine_pool():
+    """Return this process's pool for candidate engines, starting it on first use"""
+    # Keyed by pid so a forked child never uses its parent's pool
+    with _engine_pool_lock:
+        pool = _engine_pools.get(os.getpid())
+        if pool is None:
+            pool = multiprocessing.Pool(processes=ENGINE_WORKERS)
+            _engine_pools[os.getpid()] = pool
+        return pool
+
+def _discard_engine_pool(pool):
+    """Terminate an engine pool, e.g. to stop a candidate that overran its deadline"""
+    with _engine_pool_lock:
+        if _engine_pools.get(os.getpid()) is pool:
+            del _engine_pools[os.getpid()]
+    pool.terminate()
+
+def _run_pdf2docx_candidate(input_path, output_path, options=None):
+    """Engine pool entry point: render the pdf2docx candidate, score it and save it"""
+    converter = DocumentConverter(page_workers=0)
+    with ConversionContext(input_path, options) as context:
+        # A failed candidate must fail, not turn into a second standard candidate
+        doc = converter._convert_with_pdf2docx(context, fallback=False)
+    
+    score = converter._evaluate_conversion_quality(doc)
+    with converter.timings.span('save'):
+        doc.save(output_path)
+    return score, dict(converter.timings.spans)
+
 # Keep SmartDocumentConverter for backward compatibility
 class SmartDocumentConverter:
     def __init__(self, analysis=None):
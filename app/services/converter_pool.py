@@ -0,0 +1,146 @@
+import os
+import logging
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from .converter import DocumentConverter, PDF2DOCX_AVAILABLE
+from .metrics import record_stage_timings
+
+logger = logging.getLogger(__name__)
+
+# Long-lived converter processes shared by the request handlers
+POOL_WORKERS = int(os.environ.get('CONVERTER_POOL_WORKERS', os.cpu_count() or 1))
+
+# A worker crash breaks the whole pool and fails every task in it, including
+# other requests' tasks; those are resubmitted this many times to a new pool
+BROKEN_POOL_RETRIES = 1
+
+# Serializes creation of the application's pool
+_pool_lock = threading.Lock()
+
+# Text for the warm-up PDF; the resume keywords route it through pdf2docx as well
+WARMUP_TEXT = (
+    "Jane Doe\njane.doe@example.com\n+1 555 010 0000\n\n"
+    "Professional Experience\nEngineer, Example Corp\n\n"
+    "Education\nBSc Computer Science\n\nSkills\nPython, Flask"
+)
+
+def _warm_up_worker():
+    """Process initializer: load the conversion stack and run one throwaway conversion"""
+    try:
+        import fitz
+
+        # Import pdf2docx even if the warm-up conversion below fails early
+        if PDF2DOCX_AVAILABLE:
+            from . import shared_pdf2docx
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_path = os.path.join(temp_dir, 'warmup.pdf')
+            pdf = fitz.open()
+            page = pdf.new_page()
+            page.insert_text((72, 72), WARMUP_TEXT, fontsize=11)
+            page.draw_rect(fitz.Rect(72, 300, 300, 340))
+            pdf.save(pdf_path)
+            pdf.close()
+
+            # Loads lxml, the oxml classes and the styled template cache on the way
+            converter = DocumentConverter()
+            converter.convert(pdf_path, os.path.join(temp_dir, 'warmup.docx'))
+            converter.convert_to_docx(pdf_path, os.path.join(temp_dir, 'standard.docx'))
+
+    except Exception as e:
+        logger.warning(f"Converter worker warm-up failed: {str(e)}")
+
+def _noop():
+    return os.getpid()
+
+def _pool_convert(input_path, output_path, target_format=None, options=None):
+    """Run one conversion in a pool worker; returns (success, stage spans)"""
+    converter = DocumentConverter()
+    success = converter.convert(input_path, output_path, target_format, options)
+    return success, dict(converter.timings.spans)
+
+class ConverterPool:
+    """Persistent pool of pre-warmed converter processes"""
+
+    def __init__(self, workers=POOL_WORKERS):
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def start(self):
+        """Spawn every worker now so the warm-up happens before the first request"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+        return self
+
+    def _create_executor(self):
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up_worker)
+        # The executor only forks workers on demand; one task each starts them all
+        for _ in range(self.workers):
+            executor.submit(_noop)
+        return executor
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit fn to a warm worker, replacing the pool if a worker has crashed"""
+        self.start()
+        executor = self._executor
+        try:
+            return executor.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            with self._lock:
+                # Another thread may have replaced the broken pool already
+                if self._executor is executor:
+                    logger.warning("Converter pool was broken; starting a new one")
+                    executor.shutdown(wait=False)
+                    self._executor = self._create_executor()
+                executor = self._executor
+            return executor.submit(fn, *args, **kwargs)
+
+    def run(self, fn, *args, heartbeat=None, heartbeat_interval=None):
+        """
+        Run fn(*args) on a warm worker and return its result, resubmitting it if the
+        pool broke under it. heartbeat() is called every heartbeat_interval seconds
+        while the task runs.
+        """
+        for attempt in range(BROKEN_POOL_RETRIES + 1):
+            future = self.submit(fn, *args)
+            try:
+                while True:
+                    try:
+                        return future.result(timeout=heartbeat_interval)
+                    except FutureTimeoutError:
+                        heartbeat()
+            except BrokenProcessPool:
+                if attempt == BROKEN_POOL_RETRIES:
+                    raise
+                logger.warning("Converter pool broke while a task was running; resubmitting it")
+
+    def convert(self, input_path, output_path, target_format=None, options=None,
+                heartbeat=None, heartbeat_interval=None):
+        """Convert a document in the pool, wait for the result and record its stage timings"""
+        success, spans = self.run(_pool_convert, input_path, output_path, target_format, options,
+                                  heartbeat=heartbeat, heartbeat_interval=heartbeat_interval)
+        record_stage_timings(spans)
+        return success
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+def get_converter_pool():
+    """Return the application's converter pool, starting it on first use"""
+    pool = current_app.extensions.get('converter_pool')
+    if pool is None:
+        with _pool_lock:
+            # Concurrent first requests must not each start a pre-warmed pool
+            pool = current_app.extensions.get('converter_pool')
+            if pool is None:
+                pool = ConverterPool(current_app.config.get('CONVERTER_POOL_WORKERS', POOL_WORKERS)).start()
+                current_app.extensions['converter_pool'] = pool
+    return pool
@@ -0,0 +1,73 @@
+import threading
+from bisect import bisect_left
+from flask import g, has_request_context
+
+# Histogram bucket upper bounds in seconds
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus data model"""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+class StageMetrics:
+    """Per-stage conversion duration histograms for this process"""
+
+    NAME = 'converter_stage_duration_seconds'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, spans):
+        """Record the spans of one conversion, as produced by StageTimings"""
+        with self._lock:
+            for stage, durations in spans.items():
+                histogram = self._histograms.setdefault(stage, Histogram())
+                for duration in durations:
+                    histogram.observe(duration)
+
+    def render(self):
+        """Prometheus text exposition of every stage histogram"""
+        lines = [
+            f'# HELP {self.NAME} Time spent in each document conversion stage.',
+            f'# TYPE {self.NAME} histogram'
+        ]
+        with self._lock:
+            for stage in sorted(self._histograms):
+                lines.extend(self._histograms[stage].render(self.NAME, f'stage="{stage}"'))
+        return '\n'.join(lines) + '\n'
+
+STAGE_METRICS = StageMetrics()
+
+def record_stage_timings(spans):
+    """Export a conversion's spans and keep them for the current request's breakdown"""
+    STAGE_METRICS.observe(spans)
+    if has_request_context():
+        totals = g.setdefault('stage_timings', {})
+        for stage, durations in spans.items():
+            totals[stage] = totals.get(stage, 0.0) + sum(durations)
+
+def server_timing_header(totals):
+    """Format per-stage totals as a Server-Timing header value (milliseconds)"""
+    return ', '.join(f'{stage};dur={seconds * 1000:.1f}' for stage, seconds in sorted(totals.items()))
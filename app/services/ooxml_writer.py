@@ -0,0 +1,564 @@
+"""
+Direct OOXML writer for the standard engine.
+
+OoxmlDocument offers the subset of python-docx's Document API that the
+standard engine renders through (paragraphs, runs, page breaks, sections,
+tables and inline images), but keeps the body as plain Python objects and
+streams word/document.xml straight into the DOCX ZIP on save. Package-level
+parts (styles, settings, images, relationships) still come from a python-docx
+template document, so style names resolve and fail exactly as they would
+with python-docx.
+
+With spool=True the document only keeps the page being rendered: flush()
+writes the finished body XML to a spooled temporary file, and save() copies
+it into the package, so memory stays flat however many pages are written.
+
+Serializing the package reuses python-docx internals (serialize_part_xml,
+default_content_types, Part.before_marshal and the Section proxy), and the
+output mirrors what python-docx 1.2.0 writes, so this module is tied to the
+python-docx version pinned in requirements.txt.
+"""
+import io
+import re
+import shutil
+import zipfile
+import tempfile
+from xml.sax.saxutils import escape
+
+from lxml import etree
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_BREAK, WD_PARAGRAPH_ALIGNMENT, WD_LINE_SPACING
+from docx.opc.constants import CONTENT_TYPE as CT
+from docx.opc.oxml import serialize_part_xml
+from docx.opc.spec import default_content_types
+from docx.oxml.simpletypes import ST_HpsMeasure, ST_SignedTwipsMeasure, ST_TwipsMeasure
+from docx.section import Section
+from docx.shape import InlineShape
+from docx.shared import Emu, Length, Twips
+
+# Characters lxml refuses in text nodes; python-docx raises ValueError for them too
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+# Break types as written by python-docx's Run.add_break
+BREAK_TYPES = {
+    WD_BREAK.LINE: None,
+    WD_BREAK.PAGE: 'page',
+    WD_BREAK.COLUMN: 'column',
+}
+
+# Run text characters that become their own run content elements
+RUN_SPECIAL_CHARS = re.compile('([\t\r\n])')
+
+CONTENT_TYPES_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+
+# Spooled body XML stays in memory up to this size before moving to a temporary file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+def _attr(value):
+    return escape(str(value), {'"': '&quot;'})
+
+def _element_xml(element):
+    return etree.tostring(element, encoding='unicode')
+
+class _Break:
+    """A w:br inside a run"""
+    __slots__ = ('type',)
+
+    def __init__(self, type):
+        self.type = type
+
+class _Color:
+    __slots__ = ('rgb',)
+
+    def __init__(self):
+        self.rgb = None
+
+class _Font:
+    """Character formatting of one run (the w:rPr properties the engine sets)"""
+    __slots__ = ('name', 'size', 'bold', 'italic', 'underline', '_color')
+
+    def __init__(self):
+        self.name = None
+        self.size = None
+        self.bold = None
+        self.italic = None
+        self.underline = None
+        self._color = None
+
+    @property
+    def color(self):
+        if self._color is None:
+            self._color = _Color()
+        return self._color
+
+    def xml(self):
+        props = []
+        if self.name is not None:
+            name = _attr(self.name)
+            props.append(f'<w:rFonts w:ascii="{name}" w:hAnsi="{name}"/>')
+        if self.bold is not None:
+            props.append('<w:b/>' if self.bold else '<w:b w:val="0"/>')
+        if self.italic is not None:
+            props.append('<w:i/>' if self.italic else '<w:i w:val="0"/>')
+        if self._color is not None and self._color.rgb is not None:
+            props.append(f'<w:color w:val="{self._color.rgb}"/>')
+        if self.size is not None:
+            props.append(f'<w:sz w:val="{ST_HpsMeasure.convert_to_xml(self.size)}"/>')
+        if self.underline is not None:
+            props.append(f'<w:u w:val="{"single" if self.underline else "none"}"/>')
+        return f"<w:rPr>{''.join(props)}</w:rPr>" if props else ''
+
+class OoxmlRun:
+    """A run of text, breaks and drawings with one character format"""
+    __slots__ = ('_content', '_font')
+
+    def __init__(self, text=None):
+        self._content = []
+        self._font = None
+        if text:
+            self._add_text(text)
+
+    def _add_text(self, text):
+        if INVALID_XML_CHARS.search(text):
+            raise ValueError("All strings must be XML compatible: Unicode or ASCII, "
+                             "no NULL bytes or control characters")
+        self._content.append(text)
+
+    @property
+    def font(self):
+        if self._font is None:
+            self._font = _Font()
+        return self._font
+
+    @property
+    def bold(self):
+        return self.font.bold
+
+    @bold.setter
+    def bold(self, value):
+        self.font.bold = value
+
+    @property
+    def italic(self):
+        return self.font.italic
+
+    @italic.setter
+    def italic(self, value):
+        self.font.italic = value
+
+    @property
+    def underline(self):
+        return self.font.underline
+
+    @underline.setter
+    def underline(self, value):
+        self.font.underline = value
+
+    @property
+    def text(self):
+        # Same reading as python-docx: only line breaks contribute a newline
+        parts = []
+        for item in self._content:
+            if isinstance(item, str):
+                parts.append(item.replace('\r', '\n'))
+            elif isinstance(item, _Break) and item.type is None:
+                parts.append('\n')
+        return ''.join(parts)
+
+    @text.setter
+    def text(self, text):
+        self._content = []
+        self._add_text(text)
+
+    def add_break(self, break_type=WD_BREAK.LINE):
+        self._content.append(_Break(BREAK_TYPES[break_type]))
+
+    @property
+    def _r(self):
+        # The engine adds pictures through run._r.add_drawing like it does with python-docx
+        return self
+
+    def add_drawing(self, inline):
+        self._content.append(inline)
+
+    def drawings(self):
+        return [item for item in self._content if etree.iselement(item)]
+
+    def xml(self):
+        parts = ['<w:r>']
+        if self._font is not None:
+            parts.append(self._font.xml())
+        for item in self._content:
+            if isinstance(item, str):
+                parts.extend(_text_xml(item))
+            elif isinstance(item, _Break):
+                parts.append(f'<w:br w:type="{item.type}"/>' if item.type else '<w:br/>')
+            else:
+                parts.append(f'<w:drawing>{_element_xml(item)}</w:drawing>')
+        parts.append('</w:r>')
+        return ''.join(parts)
+
+def _text_xml(text):
+    """Split run text into w:t, w:tab and w:br elements the way python-docx does"""
+    for piece in RUN_SPECIAL_CHARS.split(text):
+        if piece == '\t':
+            yield '<w:tab/>'
+        elif piece in ('\r', '\n'):
+            yield '<w:br/>'
+        elif piece:
+            space = ' xml:space="preserve"' if piece.strip() != piece else ''
+            yield f'<w:t{space}>{escape(piece)}</w:t>'
+
+class _ParagraphFormat:
+    __slots__ = ('space_before', 'space_after', 'line_spacing')
+
+    def __init__(self):
+        self.space_before = None
+        self.space_after = None
+        self.line_spacing = None
+
+    def xml(self):
+        attrs = []
+        if self.space_before is not None:
+            attrs.append(f'w:before="{ST_TwipsMeasure.convert_to_xml(self.space_before)}"')
+        if self.space_after is not None:
+            attrs.append(f'w:after="{ST_TwipsMeasure.convert_to_xml(self.space_after)}"')
+        if self.line_spacing is not None:
+            if isinstance(self.line_spacing, Length):
+                line, rule = self.line_spacing, WD_LINE_SPACING.AT_LEAST
+            else:
+                # A float is a multiple of single spacing (240 twips)
+                line, rule = Emu(self.line_spacing * Twips(240)), WD_LINE_SPACING.MULTIPLE
+            attrs.append(f'w:line="{ST_SignedTwipsMeasure.convert_to_xml(line)}" '
+                         f'w:lineRule="{WD_LINE_SPACING.to_xml(rule)}"')
+        return f"<w:spacing {' '.join(attrs)}/>" if attrs else ''
+
+class OoxmlParagraph:
+    """A paragraph of runs; section breaks are paragraphs carrying a w:sectPr"""
+    __slots__ = ('_document', '_style_id', '_format', 'alignment', 'runs', 'sectPr')
+
+    def __init__(self, document):
+        self._document = document
+        self._style_id = None
+        self._format = None
+        self.alignment = None
+        self.runs = []
+        self.sectPr = None
+
+    @property
+    def style(self):
+        return self._document.part.get_style(self._style_id, WD_STYLE_TYPE.PARAGRAPH)
+
+    @style.setter
+    def style(self, style_or_name):
+        self._style_id = self._document._style_id(style_or_name, WD_STYLE_TYPE.PARAGRAPH)
+
+    @property
+    def paragraph_format(self):
+        if self._format is None:
+            self._format = _ParagraphFormat()
+        return self._format
+
+    def add_run(self, text=None):
+        run = OoxmlRun(text)
+        self.runs.append(run)
+        return run
+
+    @property
+    def text(self):
+        return ''.join(run.text for run in self.runs)
+
+    @text.setter
+    def text(self, text):
+        self.runs = []
+        self.add_run(text)
+
+    def xml(self):
+        props = []
+        if self._style_id is not None:
+            props.append(f'<w:pStyle w:val="{_attr(self._style_id)}"/>')
+        if self._format is not None:
+            props.append(self._format.xml())
+        if self.alignment is not None:
+            props.append(f'<w:jc w:val="{WD_PARAGRAPH_ALIGNMENT.to_xml(self.alignment)}"/>')
+        if self.sectPr is not None:
+            props.append(_element_xml(self.sectPr))
+        parts = ['<w:p>']
+        if any(props):
+            parts.append(f"<w:pPr>{''.join(props)}</w:pPr>")
+        parts.extend(run.xml() for run in self.runs)
+        parts.append('</w:p>')
+        return ''.join(parts)
+
+class _Cell:
+    __slots__ = ('_document', 'width', 'paragraphs')
+
+    def __init__(self, document, width):
+        self._document = document
+        self.width = width
+        self.paragraphs = [OoxmlParagraph(document)]
+
+    def add_paragraph(self, text='', style=None):
+        return self._document._add_paragraph(self.paragraphs, text, style)
+
+    @property
+    def text(self):
+        return '\n'.join(paragraph.text for paragraph in self.paragraphs)
+
+    def xml(self):
+        return (f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{self.width.twips}"/></w:tcPr>'
+                f"{''.join(paragraph.xml() for paragraph in self.paragraphs)}</w:tc>")
+
+class _Row:
+    __slots__ = ('cells',)
+
+    def __init__(self, cells):
+        self.cells = cells
+
+class _Column:
+    __slots__ = ('width',)
+
+    def __init__(self, width):
+        self.width = width
+
+class OoxmlTable:
+    """A table laid out like python-docx's Document.add_table"""
+
+    def __init__(self, document, rows, cols, width):
+        self._document = document
+        self._style_id = None
+        self.autofit = True
+        col_width = Emu(width // cols) if cols > 0 else Emu(0)
+        self.columns = [_Column(col_width) for _ in range(cols)]
+        self.rows = [_Row([_Cell(document, col_width) for _ in range(cols)]) for _ in range(rows)]
+
+    @property
+    def style(self):
+        return self._document.part.get_style(self._style_id, WD_STYLE_TYPE.TABLE)
+
+    @style.setter
+    def style(self, style_or_name):
+        self._style_id = self._document._style_id(style_or_name, WD_STYLE_TYPE.TABLE)
+
+    def cell(self, row_idx, col_idx):
+        return self.rows[row_idx].cells[col_idx]
+
+    def paragraphs(self):
+        for row in self.rows:
+            for cell in row.cells:
+                yield from cell.paragraphs
+
+    def xml(self):
+        parts = ['<w:tbl><w:tblPr>']
+        if self._style_id is not None:
+            parts.append(f'<w:tblStyle w:val="{_attr(self._style_id)}"/>')
+        parts.append('<w:tblW w:type="auto" w:w="0"/>')
+        if not self.autofit:
+            parts.append('<w:tblLayout w:type="fixed"/>')
+        parts.append('<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+                     'w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>')
+        parts.extend(f'<w:gridCol w:w="{Emu(column.width).twips}"/>' for column in self.columns)
+        parts.append('</w:tblGrid>')
+        for row in self.rows:
+            parts.append(f"<w:tr>{''.join(cell.xml() for cell in row.cells)}</w:tr>")
+        parts.append('</w:tbl>')
+        return ''.join(parts)
+
+class _DocumentPart:
+    """The template's document part with drawing ids counted here instead of re-scanned"""
+
+    def __init__(self, part):
+        self._part = part
+        self._last_id = 0
+
+    @property
+    def next_id(self):
+        self._last_id += 1
+        return self._last_id
+
+    def __getattr__(self, name):
+        return getattr(self._part, name)
+
+class OoxmlDocument:
+    """A DOCX document rendered as plain objects and streamed to word/document.xml on save"""
+
+    def __init__(self, template=None, spool=False):
+        # Styles, settings and image parts live in the template's package
+        self._template = template if template is not None else Document()
+        self.part = _DocumentPart(self._template.part)
+        self._sentinel_sectPr = self._template.element.body.get_or_add_sectPr()
+        self._section_breaks = []
+        self._body = []
+        self._style_ids = {}
+        
+        # Body XML already written by flush(), and whether it ended in an empty paragraph
+        self._spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) if spool else None
+        self._after_empty_paragraph = False
+
+    @property
+    def styles(self):
+        return self._template.styles
+
+    def _style_id(self, style_or_name, style_type):
+        """Resolve a style like python-docx does, remembering the answer (or the error) per name"""
+        key = (style_or_name, style_type)
+        if key not in self._style_ids:
+            try:
+                self._style_ids[key] = self.part.get_style_id(style_or_name, style_type)
+            except (KeyError, ValueError) as e:
+                self._style_ids[key] = e
+        style_id = self._style_ids[key]
+        if isinstance(style_id, Exception):
+            raise style_id
+        return style_id
+
+    def _add_paragraph(self, container, text, style):
+        paragraph = OoxmlParagraph(self)
+        container.append(paragraph)
+        if text:
+            paragraph.add_run(text)
+        if style is not None:
+            paragraph.style = style
+        return paragraph
+
+    def add_paragraph(self, text='', style=None):
+        return self._add_paragraph(self._body, text, style)
+
+    def add_page_break(self):
+        paragraph = self.add_paragraph()
+        paragraph.add_run().add_break(WD_BREAK.PAGE)
+        return paragraph
+
+    @property
+    def sections(self):
+        # Once flushed, section breaks are only in the spool; the last section is always here
+        return [Section(sectPr, self._template.part)
+                for sectPr in self._section_breaks + [self._sentinel_sectPr]]
+
+    def add_section(self, start_type=None):
+        """End the current section with a copy of the last w:sectPr, as python-docx does"""
+        sectPr = self._sentinel_sectPr
+        paragraph = self.add_paragraph()
+        paragraph.sectPr = sectPr.clone()
+        self._section_breaks.append(paragraph.sectPr)
+        for reference in sectPr.xpath('w:headerReference|w:footerReference'):
+            sectPr.remove(reference)
+        section = Section(sectPr, self._template.part)
+        if start_type is not None:
+            section.start_type = start_type
+        return section
+
+    def add_table(self, rows, cols):
+        section = self.sections[-1]
+        width = section.page_width - section.left_margin - section.right_margin
+        table = OoxmlTable(self, rows, cols, width)
+        self._body.append(table)
+        return table
+
+    @property
+    def paragraphs(self):
+        return [item for item in self._body if isinstance(item, OoxmlParagraph)]
+
+    @property
+    def tables(self):
+        return [item for item in self._body if isinstance(item, OoxmlTable)]
+
+    @property
+    def inline_shapes(self):
+        paragraphs = []
+        for item in self._body:
+            if isinstance(item, OoxmlTable):
+                paragraphs.extend(item.paragraphs())
+            else:
+                paragraphs.append(item)
+        return [InlineShape(inline) for paragraph in paragraphs
+                for run in paragraph.runs for inline in run.drawings()]
+
+    def remove_repeated_empty_paragraphs(self):
+        """Drop each empty paragraph that directly follows another empty paragraph"""
+        body = []
+        after_empty = self._after_empty_paragraph
+        for item in self._body:
+            is_empty = isinstance(item, OoxmlParagraph) and not item.text.strip()
+            if is_empty and after_empty:
+                if item.sectPr is not None:
+                    self._section_breaks.remove(item.sectPr)
+                continue
+            body.append(item)
+            after_empty = is_empty
+        self._body = body
+        return after_empty
+
+    def remove_empty_tables(self):
+        """Drop tables whose cells hold no text"""
+        self._body = [item for item in self._body if not isinstance(item, OoxmlTable)
+                      or any(paragraph.text.strip() for paragraph in item.paragraphs())]
+
+    def flush(self):
+        """Write the body rendered so far to the spool and forget it (no-op without a spool)"""
+        if self._spool is None:
+            return
+        # Both cleanups only look back one item, so they can run page by page
+        after_empty = self.remove_repeated_empty_paragraphs()
+        self.remove_empty_tables()
+        self._spool.write(''.join(item.xml() for item in self._body).encode('utf-8'))
+        self._after_empty_paragraph = after_empty
+        self._body = []
+        self._section_breaks = []
+
+    def _write_document_xml(self, stream):
+        # The template supplies the root element and its namespace declarations
+        template_xml = serialize_part_xml(self._template.element)
+        head = template_xml[:template_xml.index(b'<w:body>') + len(b'<w:body>')]
+        stream.write(head)
+        if self._spool is not None:
+            self.flush()
+            self._spool.seek(0)
+            shutil.copyfileobj(self._spool, stream)
+
+        writer = io.TextIOWrapper(stream, encoding='utf-8', write_through=False)
+        for item in self._body:
+            writer.write(item.xml())
+        writer.write(_element_xml(self._sentinel_sectPr))
+        writer.write('</w:body></w:document>')
+        writer.flush()
+        writer.detach()
+
+    def save(self, path_or_stream):
+        """Write the DOCX package; the template's parts are copied, the body is streamed"""
+        package = self._template.part.package
+        parts = list(package.iter_parts())
+        for part in parts:
+            part.before_marshal()
+
+        with zipfile.ZipFile(path_or_stream, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('[Content_Types].xml', _content_types_xml(parts))
+            zf.writestr('_rels/.rels', package.rels.xml)
+            for part in parts:
+                if part is self._template.part:
+                    with zf.open(part.partname.membername, 'w') as stream:
+                        self._write_document_xml(stream)
+                else:
+                    zf.writestr(part.partname.membername, part.blob)
+                if len(part.rels):
+                    zf.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+def _content_types_xml(parts):
+    """[Content_Types].xml for parts, using defaults where OPC defines one for the extension"""
+    defaults = {'rels': CT.OPC_RELATIONSHIPS, 'xml': CT.XML}
+    overrides = {}
+    for part in parts:
+        ext = part.partname.ext.lower()
+        if (ext, part.content_type) in default_content_types:
+            defaults[ext] = part.content_type
+        else:
+            overrides[part.partname] = part.content_type
+
+    xml = [f"<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n<Types xmlns=\"{CONTENT_TYPES_NS}\">"]
+    xml.extend(f'<Default Extension="{_attr(ext)}" ContentType="{_attr(content_type)}"/>'
+               for ext, content_type in sorted(defaults.items()))
+    xml.extend(f'<Override PartName="{_attr(partname)}" ContentType="{_attr(content_type)}"/>'
+               for partname, content_type in sorted(overrides.items()))
+    xml.append('</Types>')
+    return ''.join(xml).encode('utf-8')
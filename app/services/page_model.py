@@ -0,0 +1,61 @@
+import sys
+
+TEXT_BLOCK = 0
+IMAGE_BLOCK = 1
+
+class Span:
+    """A piece of text with uniform formatting"""
+    __slots__ = ('text', 'bbox', 'font', 'size', 'flags', 'color')
+
+    def __init__(self, text, bbox, font, size, flags, color):
+        self.text = text
+        self.bbox = bbox
+        self.font = font
+        self.size = size
+        self.flags = flags
+        self.color = color
+
+class Line:
+    """A line of spans; text is the spans' text joined once"""
+    __slots__ = ('bbox', 'spans', 'text')
+
+    def __init__(self, bbox, spans):
+        self.bbox = bbox
+        self.spans = spans
+        self.text = ''.join(span.text for span in spans)
+
+class Block:
+    """A text or image block; text is the lines' text joined once"""
+    __slots__ = ('type', 'bbox', 'lines', 'text')
+
+    def __init__(self, type, bbox, lines=()):
+        self.type = type
+        self.bbox = bbox
+        self.lines = lines
+        self.text = ''.join(line.text for line in lines)
+
+    def spans(self):
+        """Iterate over every span of the block in reading order"""
+        for line in self.lines:
+            yield from line.spans
+
+def build_blocks(page):
+    """Read a page's get_text("dict") output into Block/Line/Span objects"""
+    blocks = []
+    for raw_block in page.get_text("dict")["blocks"]:
+        # Image blocks keep only their bbox so the decoded image bytes can be freed
+        if raw_block["type"] != TEXT_BLOCK:
+            blocks.append(Block(IMAGE_BLOCK, tuple(raw_block["bbox"])))
+            continue
+
+        lines = []
+        for raw_line in raw_block["lines"]:
+            # Interning shares one string per font name across the page's spans
+            spans = [
+                Span(raw_span["text"], raw_span["bbox"], sys.intern(raw_span["font"]),
+                     raw_span["size"], raw_span["flags"], raw_span["color"])
+                for raw_span in raw_line["spans"]
+            ]
+            lines.append(Line(raw_line["bbox"], spans))
+        blocks.append(Block(TEXT_BLOCK, raw_block["bbox"], lines))
+    return blocks
@@ -0,0 +1,56 @@
+"""
+pdf2docx engine that works on the converter's already opened PDF.
+
+Importing this module imports pdf2docx and the numpy/OpenCV stack behind it,
+so the converter only imports it when the pdf2docx engine actually runs.
+"""
+import logging
+from docx import Document
+from pdf2docx import Converter
+from pdf2docx.converter import ConversionException, MakedocxException
+from pdf2docx.page.Pages import Pages
+
+logger = logging.getLogger(__name__)
+
+class SharedPdf2DocxConverter(Converter):
+    """pdf2docx converter that parses an already opened fitz.Document"""
+
+    def __init__(self, context):
+        # Skip the base initializer so the document is not opened again. This sets
+        # the attributes Converter.__init__ sets in the pinned pdf2docx 0.5.6 (and
+        # every later 0.5.x release)
+        self.filename_pdf = context.input_path
+        self.password = ""
+        self._fitz_doc = context.pdf
+        self._pages = Pages()
+
+    def close(self):
+        """The owning ConversionContext closes the shared document"""
+        pass
+
+    def convert_to_document(self, start=0, end=None, pages=None, **kwargs):
+        """Parse pages and build a live python-docx Document without saving it
+
+        Mirrors Converter.make_docx, including its page error handling, but
+        returns the Document instead of writing it to a file.
+        """
+        settings = self.default_settings
+        settings.update(kwargs)
+        self.parse(start, end, pages, **settings)
+
+        parsed_pages = [page for page in self.pages if page.finalized]
+        if not parsed_pages:
+            raise ConversionException('No parsed pages. Please parse page first.')
+
+        docx_file = Document()
+        for page in parsed_pages:
+            try:
+                page.make_docx(docx_file)
+            except Exception as e:
+                # raw_exceptions only exists from pdf2docx 0.5.7 on
+                if settings.get('raw_exceptions'):
+                    raise
+                if settings['debug'] or not settings['ignore_page_error']:
+                    raise MakedocxException(f'Error when make page {page.id + 1}: {e}')
+                logger.warning(f"pdf2docx skipped page {page.id + 1}: {str(e)}")
+        return docx_file
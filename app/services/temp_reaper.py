@@ -0,0 +1,130 @@
+import os
+import time
+import shutil
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background reaper passes
+REAP_INTERVAL = int(os.environ.get('TEMP_REAPER_INTERVAL', 60))
+
+# Upper bound on artifacts deleted per pass so one pass never stalls for long
+REAP_BATCH_SIZE = 500
+
+# Converted files served from temp/converted are kept for a day
+CONVERTED_TTL = 24 * 3600
+
+# Serializes creation of the application's reaper
+_reaper_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_expires_at ON artifacts (expires_at);
+"""
+
+class TempFileReaper:
+    """Deletes temporary files and directories once their registered expiry passes"""
+
+    def __init__(self, db_path, interval=REAP_INTERVAL):
+        self.db_path = db_path
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def register(self, path, ttl):
+        """Schedule path (a file or a directory) for deletion ttl seconds from now"""
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO artifacts (path, expires_at) VALUES (?, ?)',
+                    (os.path.abspath(path), time.time() + ttl)
+                )
+        except Exception as e:
+            logger.warning(f"Error registering temporary file {path}: {str(e)}")
+
+    def reap(self, now=None):
+        """Delete every expired artifact; cost is proportional to the number expired"""
+        now = time.time() if now is None else now
+        removed = 0
+        with closing(self._connect()) as conn:
+            while True:
+                rows = conn.execute(
+                    'SELECT path FROM artifacts WHERE expires_at <= ? ORDER BY expires_at LIMIT ?',
+                    (now, REAP_BATCH_SIZE)
+                ).fetchall()
+                if not rows:
+                    break
+
+                for (path,) in rows:
+                    _remove_path(path)
+                conn.executemany('DELETE FROM artifacts WHERE path = ?', rows)
+                removed += len(rows)
+        return removed
+
+    def start(self):
+        """Start the background reaper thread if it is not running yet"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='temp-reaper', daemon=True)
+                self._thread.start()
+        return self
+
+    def shutdown(self):
+        self._stopping.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                removed = self.reap()
+                if removed:
+                    logger.debug(f"Reaped {removed} expired temporary files")
+            except Exception as e:
+                logger.warning(f"Error reaping temporary files: {str(e)}")
+
+def _remove_path(path):
+    try:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Error removing temporary file {path}: {str(e)}")
+
+def get_temp_reaper():
+    """Return the application's temp-file reaper, starting it on first use"""
+    reaper = current_app.extensions.get('temp_reaper')
+    if reaper is None:
+        with _reaper_lock:
+            # Concurrent first requests must not each start a reaper thread
+            reaper = current_app.extensions.get('temp_reaper')
+            if reaper is None:
+                db_path = current_app.config.get(
+                    'TEMP_REAPER_DB',
+                    os.path.join(current_app.root_path, 'temp', 'artifacts.sqlite3')
+                )
+                reaper = TempFileReaper(db_path, current_app.config.get('TEMP_REAPER_INTERVAL', REAP_INTERVAL)).start()
+                current_app.extensions['temp_reaper'] = reaper
+    return reaper
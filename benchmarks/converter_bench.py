@@ -0,0 +1,287 @@
+"""
+Converter benchmark suite.
+
+    python -m benchmarks.converter_bench                  # run and compare with the baseline
+    python -m benchmarks.converter_bench --save-baseline  # run and store a new baseline
+    python -m benchmarks.converter_bench --quick --case two_column_resume
+
+Builds a deterministic PDF corpus with PyMuPDF and converts each document with
+DocumentConverter.hybrid_convert_to_docx in a fresh process. It reports the
+route taken, pages/second, peak RSS of the converting process and of its
+largest worker process, and per-stage time. Results are compared with
+benchmarks/baseline.json; a case is flagged when throughput drops or either
+peak RSS grows by more than --threshold. --quick results are stored under
+their own keys (long_report_quick) so they never replace the full baseline.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import subprocess
+
+import fitz
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Bump when the generated documents change so stale corpora are rebuilt
+CORPUS_VERSION = 1
+
+# Relative slowdown (or memory growth) that counts as a regression
+DEFAULT_THRESHOLD = 0.2
+
+WORDS = (
+    "analysis system design report quarterly revenue customer platform service "
+    "delivery growth market product engineering team project support quality "
+    "process data model performance release security network document review"
+).split()
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def _paragraph(rng, sentences=4):
+    return ' '.join(_sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+def _single_column(pdf, rng, pages):
+    for page_num in range(pages):
+        page = pdf.new_page()
+        page.insert_text((72, 60), f"Section {page_num + 1}: {_sentence(rng, 4)}", fontsize=16)
+        rect = fitz.Rect(72, 90, page.rect.width - 72, page.rect.height - 72)
+        text = '\n\n'.join(_paragraph(rng) for _ in range(6))
+        page.insert_textbox(rect, text, fontsize=10)
+
+def build_single_column(pdf, rng):
+    _single_column(pdf, rng, 20)
+
+def build_long_report(pdf, rng, pages=500):
+    _single_column(pdf, rng, pages)
+
+def build_two_column_resume(pdf, rng):
+    for page_num in range(2):
+        page = pdf.new_page()
+        width, height = page.rect.width, page.rect.height
+        # Coloured sidebar with contact details and skills
+        page.draw_rect(fitz.Rect(0, 0, width * 0.32, height), color=None, fill=(0.15, 0.25, 0.4))
+        sidebar = fitz.Rect(20, 40, width * 0.32 - 20, height - 40)
+        page.insert_textbox(sidebar, (
+            "Alex Example\n\nalex.example@example.com\n+1 555 010 0199\n\n"
+            "Skills\nPython, SQL, Flask\nData analysis\n\nLanguages\nEnglish, Swedish"
+        ), fontsize=10, color=(1, 1, 1))
+        main = fitz.Rect(width * 0.32 + 24, 40, width - 36, height - 40)
+        sections = ["Profile", "Professional Experience", "Education", "Projects"]
+        text = '\n\n'.join(f"{title}\n{_paragraph(rng, 3)}" for title in sections)
+        page.insert_textbox(main, text, fontsize=10)
+
+def build_table_grid(pdf, rng):
+    for _ in range(10):
+        page = pdf.new_page()
+        rows, cols = 20, 5
+        left, top, cell_w, cell_h = 50, 60, 100, 30
+        for r in range(rows):
+            for c in range(cols):
+                cell = fitz.Rect(left + c * cell_w, top + r * cell_h,
+                                 left + (c + 1) * cell_w, top + (r + 1) * cell_h)
+                page.draw_rect(cell, color=(0, 0, 0), width=0.5)
+                label = rng.choice(WORDS) if r else f"Column {c + 1}"
+                page.insert_text((cell.x0 + 4, cell.y1 - 10), label, fontsize=8)
+
+def _image_bytes(rng, size=160):
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, size, size), False)
+    tile = size // 4
+    for x in range(0, size, tile):
+        for y in range(0, size, tile):
+            color = tuple(rng.randint(0, 255) for _ in range(3))
+            pix.set_rect(fitz.IRect(x, y, x + tile, y + tile), color)
+    return pix.tobytes('png')
+
+def build_image_heavy(pdf, rng):
+    images = [_image_bytes(rng) for _ in range(6)]
+    for page_num in range(10):
+        page = pdf.new_page()
+        page.insert_text((72, 50), f"Gallery page {page_num + 1}", fontsize=14)
+        for index in range(6):
+            x = 60 + (index % 2) * 250
+            y = 80 + (index // 2) * 230
+            page.insert_image(fitz.Rect(x, y, x + 200, y + 200), stream=images[(page_num + index) % len(images)])
+            page.insert_text((x, y + 215), _sentence(rng, 5), fontsize=8)
+
+def build_drawing_heavy(pdf, rng):
+    for _ in range(10):
+        page = pdf.new_page()
+        shape = page.new_shape()
+        for _ in range(150):
+            p1 = fitz.Point(rng.uniform(40, 550), rng.uniform(40, 800))
+            p2 = fitz.Point(rng.uniform(40, 550), rng.uniform(40, 800))
+            kind = rng.randint(0, 2)
+            if kind == 0:
+                shape.draw_line(p1, p2)
+            elif kind == 1:
+                shape.draw_circle(p1, rng.uniform(3, 25))
+            else:
+                shape.draw_rect(fitz.Rect(p1, p1 + (rng.uniform(5, 60), rng.uniform(5, 40))))
+        shape.finish(color=(0.2, 0.2, 0.2), width=0.6)
+        shape.commit()
+        page.insert_textbox(fitz.Rect(72, 72, 520, 300), _paragraph(rng), fontsize=10)
+
+CASES = {
+    'single_column': build_single_column,
+    'two_column_resume': build_two_column_resume,
+    'table_grid': build_table_grid,
+    'image_heavy': build_image_heavy,
+    'drawing_heavy': build_drawing_heavy,
+    'long_report': build_long_report,
+}
+
+def result_key(name, quick=False):
+    """Name a case's corpus file and baseline entry; the quick long report is a different document"""
+    return f"{name}_quick" if quick and name == 'long_report' else name
+
+def corpus_path(name, quick=False):
+    return os.path.join(CORPUS_DIR, f"{result_key(name, quick)}_v{CORPUS_VERSION}.pdf")
+
+def build_corpus(names, quick=False):
+    """Generate any missing corpus documents; the same seed always yields the same PDF"""
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for name in names:
+        path = corpus_path(name, quick)
+        if os.path.exists(path):
+            continue
+        # Seed per case so generating a subset never changes the other documents
+        rng = random.Random(f"{name}-{CORPUS_VERSION}")
+        pdf = fitz.open()
+        if name == 'long_report' and quick:
+            build_long_report(pdf, rng, pages=50)
+        else:
+            CASES[name](pdf, rng)
+        # Fixed metadata and no random trailer ID keep the files byte-identical
+        pdf.set_metadata({'producer': 'converter_bench', 'creationDate': '', 'modDate': ''})
+        pdf.save(path, garbage=3, deflate=True, no_new_id=True)
+        pdf.close()
+
+def _peak_rss_mb(who):
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS; for
+    # RUSAGE_CHILDREN it is the peak of the largest child, not a sum
+    peak_rss = resource.getrusage(who).ru_maxrss
+    return peak_rss / (1024 * 1024) if sys.platform == 'darwin' else peak_rss / 1024
+
+def run_child(pdf_path):
+    """Convert one document in this (fresh) process and print the measurements as JSON"""
+    sys.path.insert(0, ROOT_DIR)
+    import tempfile
+    from app.services import converter as converter_module
+    from app.services.converter import DocumentConverter, ConversionContext
+
+    converter = DocumentConverter()
+    with ConversionContext(pdf_path) as context:
+        pages = context.page_count
+        doc_type, complexity = converter._analyze_document_type(context)
+    converter = DocumentConverter()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        started = time.perf_counter()
+        converter.hybrid_convert_to_docx(pdf_path, os.path.join(temp_dir, 'out.docx'))
+        elapsed = time.perf_counter() - started
+
+    # Children only show up in RUSAGE_CHILDREN once they are reaped, so stop the
+    # engine pool as well (page worker pools are shut down by the converter)
+    for pool in list(converter_module._engine_pools.values()):
+        converter_module._discard_engine_pool(pool)
+
+    print(json.dumps({
+        'pages': pages,
+        'route': f"{doc_type}/{complexity}",
+        'seconds': elapsed,
+        'pages_per_second': pages / elapsed if elapsed else 0.0,
+        'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_SELF),
+        'peak_child_rss_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN),
+        'stages': converter.timings.totals()
+    }))
+
+def run_case(name, quick=False):
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.converter_bench', '--child', corpus_path(name, quick)],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{name} failed: {result.stderr.strip().splitlines()[-1]}")
+    # Libraries may print warnings on stdout; the measurements are the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages against the stored baseline"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['pages_per_second'] < base['pages_per_second'] * (1 - threshold):
+            regressions.append(f"{name}: {result['pages_per_second']:.2f} pages/s "
+                               f"vs baseline {base['pages_per_second']:.2f}")
+        if result['peak_rss_mb'] > base['peak_rss_mb'] * (1 + threshold):
+            regressions.append(f"{name}: peak RSS {result['peak_rss_mb']:.0f} MB "
+                               f"vs baseline {base['peak_rss_mb']:.0f} MB")
+        # Baselines saved before worker memory was measured have no child peak
+        base_child = base.get('peak_child_rss_mb')
+        if base_child and result['peak_child_rss_mb'] > base_child * (1 + threshold):
+            regressions.append(f"{name}: worker peak RSS {result['peak_child_rss_mb']:.0f} MB "
+                               f"vs baseline {base_child:.0f} MB")
+    return regressions
+
+def print_report(results):
+    print(f"{'case':<20} {'route':<22} {'pages':>6} {'pages/s':>9} {'rss MB':>8} {'worker MB':>9}  slowest stages")
+    for name, result in results.items():
+        stages = sorted(result['stages'].items(), key=lambda item: item[1], reverse=True)
+        top = ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in stages if stage != 'convert')
+        print(f"{name:<20} {result['route']:<22} {result['pages']:>6} "
+              f"{result['pages_per_second']:>9.2f} {result['peak_rss_mb']:>8.0f} "
+              f"{result['peak_child_rss_mb']:>9.0f}  {top}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark DocumentConverter on a synthetic PDF corpus')
+    parser.add_argument('--case', action='append', choices=sorted(CASES), help='run only these cases')
+    parser.add_argument('--quick', action='store_true', help='use a 50-page long report')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child)
+        return 0
+
+    names = args.case or list(CASES)
+    build_corpus(names, args.quick)
+    results = {result_key(name, args.quick): run_case(name, args.quick) for name in names}
+    print_report(results)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import io
+import os
+import uuid
+import shutil
+import zipfile
+import tempfile
+import unittest
+import fitz
+from unittest import mock
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.services.batch_converter import batch_directory, batch_entries, convert_batch, stream_zip
+
+class BatchConverterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.token = str(uuid.uuid4())
+        self.batch_dir = os.path.join(self.temp_dir, self.token)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _item(self, index, filename, text=None):
+        file_dir = os.path.join(self.batch_dir, str(index))
+        os.makedirs(file_dir)
+        input_path = os.path.join(file_dir, filename)
+        if text is None:
+            with open(input_path, 'wb') as f:
+                f.write(b'not a pdf')
+        else:
+            pdf = fitz.open()
+            pdf.new_page().insert_text((72, 72), text, fontsize=12)
+            pdf.save(input_path)
+            pdf.close()
+        return filename, input_path, os.path.join(file_dir, os.path.splitext(filename)[0] + '.docx')
+
+    def test_batch_results_and_streamed_zip(self):
+        items = [
+            self._item(0, 'report.pdf', "First report"),
+            self._item(1, 'broken.pdf'),
+            self._item(2, 'report.pdf', "Second report"),
+        ]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = convert_batch(items, pool)
+
+        # One result per upload, in upload order; the broken file fails on its own
+        self.assertEqual([r['filename'] for r in results], ['report.pdf', 'broken.pdf', 'report.pdf'])
+        self.assertEqual([r['success'] for r in results], [True, False, True])
+        self.assertTrue(results[1]['error'])
+        self.assertGreater(results[0]['duration'], 0)
+        self.assertFalse(any(r['cached'] for r in results))
+
+        # The download token resolves to the batch directory; anything else does not
+        batch_dir = batch_directory(self.temp_dir, self.token)
+        self.assertEqual(batch_dir, self.batch_dir)
+        for token in ('../' + self.token, 'not-a-token', str(uuid.uuid4())):
+            self.assertIsNone(batch_directory(self.temp_dir, token))
+
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(stream_zip(batch_entries(batch_dir)))))
+        self.assertEqual(archive.namelist(), ['report.docx', 'report_2.docx'])
+        self.assertEqual(archive.testzip(), None)
+        with open(items[2][2], 'rb') as f:
+            self.assertEqual(archive.read('report_2.docx'), f.read())
+
+    def test_worker_crash_only_fails_the_crashing_file(self):
+        items = [self._item(0, 'first.pdf', "First"), self._item(1, 'crash.pdf', "Crash"),
+                 self._item(2, 'third.pdf', "Third")]
+        submitted = []
+
+        def submit(fn, input_path, output_path, target_format, options):
+            # crash.pdf kills its worker, which fails every file in the pool at the time
+            future = Future()
+            if len(submitted) < len(items) or input_path == items[1][1]:
+                future.set_exception(BrokenProcessPool("worker died"))
+            else:
+                future.set_result(fn(input_path, output_path, target_format, options))
+            submitted.append(os.path.basename(input_path))
+            return future
+
+        results = convert_batch(items, mock.Mock(submit=submit))
+
+        self.assertEqual([r['success'] for r in results], [True, False, True])
+        self.assertIn("worker died", results[1]['error'])
+        # Files caught by the crash are retried one at a time
+        self.assertEqual(submitted[3:], ['first.pdf', 'crash.pdf', 'third.pdf'])
+
+if __name__ == '__main__':
+    unittest.main()
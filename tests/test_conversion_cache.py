@@ -0,0 +1,87 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from flask import Flask
+from app.services.conversion_cache import ConversionCache, get_conversion_cache
+
+class ConversionCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ConversionCache(os.path.join(self.temp_dir, 'cache'), max_bytes=10)
+        self.input_path = self._write('input.pdf', b'%PDF-1.4 test')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_key_depends_on_format_and_options(self):
+        key = self.cache.make_key(self.input_path, 'docx')
+        self.assertEqual(key, self.cache.make_key(self.input_path, 'DOCX', {}))
+        self.assertNotEqual(key, self.cache.make_key(self.input_path, 'txt'))
+        self.assertNotEqual(key, self.cache.make_key(self.input_path, 'docx', {'pages': '1'}))
+
+    def test_put_and_get(self):
+        key = self.cache.make_key(self.input_path, 'docx')
+        dest_path = os.path.join(self.temp_dir, 'output.docx')
+        self.assertFalse(self.cache.get(key, dest_path))
+
+        self.cache.put(key, self._write('converted.docx', b'docx'))
+        self.assertTrue(self.cache.get(key, dest_path))
+        with open(dest_path, 'rb') as f:
+            self.assertEqual(f.read(), b'docx')
+
+        # Editing a served output in place leaves the cache entry intact
+        with open(dest_path, 'ab') as f:
+            f.write(b' edited')
+        other_path = os.path.join(self.temp_dir, 'other.docx')
+        self.assertTrue(self.cache.get(key, other_path))
+        with open(other_path, 'rb') as f:
+            self.assertEqual(f.read(), b'docx')
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put('old', self._write('old.docx', b'123456'))
+        old_entry = os.path.join(self.cache.cache_dir, 'old')
+        past = time.time() - 60
+        os.utime(old_entry, (past, past))
+
+        self.cache.put('new', self._write('new.docx', b'123456'))
+        self.assertFalse(os.path.exists(old_entry))
+        self.assertTrue(os.path.exists(os.path.join(self.cache.cache_dir, 'new')))
+
+    def test_application_cache_is_created_once(self):
+        app = Flask(__name__)
+        app.config['CONVERSION_CACHE_DIR'] = os.path.join(self.temp_dir, 'app-cache')
+        barrier = threading.Barrier(8)
+        caches = []
+
+        def get_cache():
+            barrier.wait()
+            with app.app_context():
+                caches.append(get_conversion_cache())
+
+        def slow_init(cache, *args):
+            time.sleep(0.1)
+            original_init(cache, *args)
+
+        original_init = ConversionCache.__init__
+        with mock.patch.object(ConversionCache, '__init__', autospec=True, side_effect=slow_init) as init:
+            threads = [threading.Thread(target=get_cache) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        init.assert_called_once()
+        self.assertEqual(len({id(cache) for cache in caches}), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+from app.services import conversion_jobs
+from app.services.conversion_jobs import ConversionJobQueue, JOB_PENDING_TTL
+from app.services.converter_pool import ConverterPool, _pool_convert
+
+class ConversionJobQueueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pool = ConverterPool(workers=1)
+        self.queue = ConversionJobQueue(os.path.join(self.temp_dir, 'jobs.sqlite3'), self.pool, workers=1)
+
+    def tearDown(self):
+        self.queue.shutdown()
+        self.pool.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _wait(self, job_id, timeout=30):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.queue.get(job_id)
+            if job['status'] in ('finished', 'failed'):
+                return job
+            time.sleep(0.1)
+        self.fail('Job did not complete in time')
+
+    def test_claim_is_fifo_and_exclusive(self):
+        # Keep the workers stopped so they do not race the test for jobs
+        with mock.patch.object(self.queue, 'start'):
+            self.queue.submit('a.pdf', 'a.docx')
+            self.queue.submit('b.pdf', 'b.docx')
+
+        self.assertEqual(self.queue.claim()['input_path'], 'a.pdf')
+        self.assertEqual(self.queue.claim()['input_path'], 'b.pdf')
+        self.assertIsNone(self.queue.claim())
+
+    def test_expired_lease_is_requeued(self):
+        with mock.patch.object(self.queue, 'start'):
+            job_id = self.queue.submit('a.pdf', 'a.docx')
+
+        first = self.queue.claim()
+        self.assertTrue(self.queue.renew(first))
+        self.assertIsNone(self.queue.claim())
+
+        # The first worker stops renewing, e.g. because its process died
+        with mock.patch('time.time', return_value=first['lease_expires_at'] + 1):
+            second = self.queue.claim()
+        self.assertEqual(second['id'], job_id)
+        self.assertNotEqual(second['lease'], first['lease'])
+
+        # The first worker no longer owns the job and cannot finish it
+        self.assertFalse(self.queue.renew(first))
+        self.queue._finish(first, 'late failure')
+        self.assertEqual(self.queue.get(job_id)['status'], 'running')
+        self.queue._finish(second)
+        self.assertEqual(self.queue.get(job_id)['status'], 'finished')
+
+    def test_running_job_renews_its_lease(self):
+        with mock.patch.object(self.queue, 'start'):
+            self.queue.submit('a.pdf', os.path.join(self.temp_dir, 'a.docx'))
+        job = self.queue.claim()
+
+        future = Future()
+        threading.Timer(0.3, future.set_result, ((False, {}),)).start()
+        with mock.patch.object(conversion_jobs, 'JOB_HEARTBEAT_INTERVAL', 0.05), \
+                mock.patch.object(self.queue._pool, 'submit', return_value=future), \
+                mock.patch.object(self.queue, 'renew', wraps=self.queue.renew) as renew:
+            self.queue._run(job)
+
+        self.assertGreaterEqual(renew.call_count, 3)
+        self.assertEqual(self.queue.get(job['id'])['status'], 'failed')
+
+    def test_jobs_run_on_the_shared_pool(self):
+        with mock.patch.object(self.queue, 'start'):
+            self.queue.submit('a.pdf', os.path.join(self.temp_dir, 'a.docx'), options={'pages': '1'})
+        job = self.queue.claim()
+
+        future = Future()
+        future.set_result((False, {}))
+        with mock.patch.object(self.pool, 'submit', return_value=future) as submit:
+            self.queue._run(job)
+        submit.assert_called_once_with(_pool_convert, 'a.pdf', job['output_path'], 'docx', {'pages': '1'})
+
+        # Stopping the queue leaves the shared pool to its owner
+        with mock.patch.object(self.pool, 'shutdown') as shutdown:
+            self.queue.shutdown()
+        shutdown.assert_not_called()
+
+    def test_job_directory_is_kept_until_the_result_expires(self):
+        self.queue.reaper = mock.Mock()
+        self.queue.result_ttl = 600
+        job_dir = os.path.join(self.temp_dir, 'job')
+        with mock.patch.object(self.queue, 'start'):
+            self.queue.submit('a.pdf', os.path.join(job_dir, 'a.docx'))
+        self.queue.reaper.register.assert_called_once_with(job_dir, JOB_PENDING_TTL)
+
+        # The download window starts when the job finishes, not when it was submitted
+        self.queue._finish(self.queue.claim())
+        self.queue.reaper.register.assert_called_with(job_dir, 600)
+
+    def test_failed_conversion_is_reported(self):
+        input_path = os.path.join(self.temp_dir, 'broken.pdf')
+        with open(input_path, 'wb') as f:
+            f.write(b'not a pdf')
+
+        job_id = self.queue.submit(input_path, os.path.join(self.temp_dir, 'broken.docx'))
+        job = self._wait(job_id)
+        self.assertEqual(job['status'], 'failed')
+        self.assertTrue(job['error'])
+
+if __name__ == '__main__':
+    unittest.main()
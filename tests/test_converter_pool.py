@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import threading
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+from flask import Flask
+from app.services import converter as converter_module
+from app.services.converter_pool import ConverterPool, get_converter_pool
+
+def _warm_state():
+    return 'app.services.shared_pdf2docx' in sys.modules, len(converter_module._styled_templates)
+
+def _slow_pid(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+class ConverterPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.pool = ConverterPool(workers=2)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_workers_are_warm_before_the_first_task(self):
+        pdf2docx_loaded, templates = self.pool.start().run(_warm_state)
+        self.assertTrue(pdf2docx_loaded)
+        self.assertGreater(templates, 0)
+
+    def test_crashed_worker_is_replaced_and_other_tasks_resubmitted(self):
+        self.pool.start()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(self.pool.run(_slow_pid, 0.5)))
+        waiter.start()
+        time.sleep(0.1)
+
+        # Crashing a worker breaks the pool for every task in it
+        with self.assertRaises(BrokenProcessPool):
+            self.pool.submit(os._exit, 1).result()
+        waiter.join()
+
+        # The other task was resubmitted to a new pool, which keeps serving tasks
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(self.pool.run(os.getpid), int)
+
+    def test_broken_pool_is_replaced_once(self):
+        broken = mock.Mock(submit=mock.Mock(side_effect=BrokenProcessPool))
+        self.pool._executor = broken
+        barrier = threading.Barrier(8)
+
+        def submit():
+            barrier.wait()
+            self.pool.submit(os.getpid)
+
+        with mock.patch.object(self.pool, '_create_executor', return_value=mock.Mock()) as create:
+            threads = [threading.Thread(target=submit) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        create.assert_called_once_with()
+        broken.shutdown.assert_called_once_with(wait=False)
+        self.assertEqual(self.pool._executor.submit.call_count, 8)
+
+    def test_shutdown_stops_the_workers(self):
+        pids = {self.pool.start().run(os.getpid) for _ in range(4)}
+        self.pool.shutdown()
+        self.assertIsNone(self.pool._executor)
+        for pid in pids:
+            with self.assertRaises(ProcessLookupError):
+                os.kill(pid, 0)
+
+        # The pool starts again on the next task
+        self.assertNotIn(self.pool.run(os.getpid), pids)
+
+    def test_application_pool_is_started_once(self):
+        app = Flask(__name__)
+        barrier = threading.Barrier(8)
+        pools = []
+
+        def get_pool():
+            barrier.wait()
+            with app.app_context():
+                pools.append(get_converter_pool())
+
+        def slow_start(pool):
+            time.sleep(0.1)
+            return pool
+
+        with mock.patch.object(ConverterPool, 'start', autospec=True, side_effect=slow_start) as start:
+            threads = [threading.Thread(target=get_pool) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        start.assert_called_once()
+        self.assertEqual(len({id(pool) for pool in pools}), 1)
+        self.assertIs(app.extensions['converter_pool'], pools[0])
+
+if __name__ == '__main__':
+    unittest.main()
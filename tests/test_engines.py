@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest
+import fitz
+import multiprocessing
+from unittest import mock
+from docx import Document
+from app.services import converter as converter_module
+from app.services.converter import ConversionContext, DocumentConverter, DocxFile, _run_pdf2docx_candidate
+from app.services.shared_pdf2docx import SharedPdf2DocxConverter
+
+def _inline_pool(result=None):
+    """Engine pool stand-in that runs the candidate in-process (or returns the given result)"""
+    def apply_async(fn, args):
+        value = fn(*args) if result is None else None
+        return mock.Mock(get=mock.Mock(return_value=value) if result is None else result)
+    return mock.Mock(apply_async=mock.Mock(side_effect=apply_async))
+
+class ConversionEnginesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, 'input.pdf')
+        pdf = fitz.open()
+        for number in range(2):
+            pdf.new_page().insert_text((72, 72), f"Page {number + 1}", fontsize=12)
+        pdf.save(self.pdf_path)
+        pdf.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pdf2docx_document_requires_a_parsed_page(self):
+        from pdf2docx.converter import ConversionException
+        from pdf2docx.page.Page import Page
+
+        with ConversionContext(self.pdf_path) as context:
+            doc = SharedPdf2DocxConverter(context).convert_to_document()
+            self.assertIn("Page 2", "\n".join(p.text for p in doc.paragraphs))
+
+            # Like Converter.make_docx, a PDF whose pages all fail to parse is an error
+            with mock.patch.object(Page, 'parse', side_effect=RuntimeError("broken page")):
+                with self.assertRaises(ConversionException):
+                    SharedPdf2DocxConverter(context).convert_to_document()
+
+    def _convert_with_multiple_engines(self, converter, pool, scores):
+        rendered = []
+        render_docx = converter._render_docx
+
+        def render(*args, **kwargs):
+            rendered.append(render_docx(*args, **kwargs))
+            return rendered[-1]
+
+        with mock.patch.object(converter_module, '_engine_pool', return_value=pool), \
+                mock.patch.object(converter, '_render_docx', render), \
+                mock.patch.object(DocumentConverter, '_evaluate_conversion_quality', side_effect=scores), \
+                ConversionContext(self.pdf_path) as context:
+            doc = converter._convert_with_multiple_engines(context)
+        self.assertEqual(len(rendered), 1)
+        return doc, rendered[0]
+
+    def test_multiple_engines_keep_the_higher_score(self):
+        converter = DocumentConverter(page_workers=0)
+
+        # The inline pool scores the pdf2docx candidate first, then the standard document
+        doc, standard_doc = self._convert_with_multiple_engines(converter, _inline_pool(), [5, 3])
+        self.assertIsNot(doc, standard_doc)
+        self.assertIn("Page 2", "\n".join(p.text for p in doc.paragraphs))
+
+        doc, standard_doc = self._convert_with_multiple_engines(converter, _inline_pool(), [3, 3])
+        self.assertIs(doc, standard_doc)
+
+    def test_streamed_conversion_keeps_the_pdf2docx_file(self):
+        converter = DocumentConverter(page_workers=0)
+        with mock.patch.object(converter_module, '_engine_pool', return_value=_inline_pool()), \
+                mock.patch.object(converter, '_quality_score', return_value=-1), \
+                ConversionContext(self.pdf_path) as context:
+            doc = converter._convert_with_multiple_engines(context, stream=True)
+
+        # The winning candidate is copied to the output, not loaded into a document tree
+        self.assertIsInstance(doc, DocxFile)
+        output_path = os.path.join(self.temp_dir, 'output.docx')
+        doc.save(output_path)
+        self.assertIn("Page 2", "\n".join(p.text for p in Document(output_path).paragraphs))
+
+    def test_timed_out_candidate_is_stopped(self):
+        converter = DocumentConverter(page_workers=0)
+        converter.engine_timeout = 60
+        timed_out = mock.Mock(side_effect=multiprocessing.TimeoutError)
+        pool = _inline_pool(result=timed_out)
+
+        doc, standard_doc = self._convert_with_multiple_engines(converter, pool, [1])
+        self.assertIs(doc, standard_doc)
+        # pdf2docx only gets what is left of the deadline after the standard render
+        timeout = timed_out.call_args.kwargs['timeout']
+        self.assertTrue(0 < timeout < 60)
+        pool.terminate.assert_called_once_with()
+
+    def test_standard_candidate_stops_at_the_deadline(self):
+        converter = DocumentConverter(page_workers=0)
+        converter.engine_timeout = 0
+
+        # The inline pool renders pdf2docx first, so the deadline has passed when the standard render starts
+        with mock.patch.object(converter_module, '_engine_pool', return_value=_inline_pool()), \
+                mock.patch.object(converter, '_process_single_column_page') as process_page, \
+                ConversionContext(self.pdf_path) as context:
+            doc = converter._convert_with_multiple_engines(context)
+        process_page.assert_not_called()
+        self.assertIn("Page 2", "\n".join(p.text for p in doc.paragraphs))
+
+    def test_engine_pool_is_reused(self):
+        converter = DocumentConverter(page_workers=0)
+        try:
+            for _ in range(2):
+                with ConversionContext(self.pdf_path) as context:
+                    doc = converter._convert_with_multiple_engines(context)
+                self.assertIn("Page 2", "\n".join(p.text for p in doc.paragraphs))
+            self.assertEqual(list(converter_module._engine_pools), [os.getpid()])
+        finally:
+            converter_module._discard_engine_pool(converter_module._engine_pool())
+
+    def test_failed_pdf2docx_candidate_is_not_replaced(self):
+        from pdf2docx.converter import ConversionException
+        from pdf2docx.page.Page import Page
+
+        output_path = os.path.join(self.temp_dir, 'candidate.docx')
+        with mock.patch.object(Page, 'parse', side_effect=RuntimeError("broken page")):
+            with self.assertRaises(ConversionException):
+                _run_pdf2docx_candidate(self.pdf_path, output_path)
+        self.assertFalse(os.path.exists(output_path))
+
+if __name__ == '__main__':
+    unittest.main()
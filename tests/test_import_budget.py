@@ -0,0 +1,26 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from app.import_report import loaded_heavy_modules, main
+
+class ImportBudgetTestCase(unittest.TestCase):
+    def test_routes_do_not_import_heavy_modules(self):
+        # Blueprints are imported by every worker; heavy libraries must wait for first use
+        statement = (
+            'import app.routes.api, app.routes.business_api, '
+            'app.routes.analytics, app.routes.gmail'
+        )
+        self.assertEqual(loaded_heavy_modules(statement), [])
+
+    def test_report_fails_when_a_heavy_module_is_loaded(self):
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(['--statement', 'import json', '--budget-ms', '60000']), 0)
+            self.assertEqual(main(['--statement', 'import numpy', '--budget-ms', '60000']), 1)
+        self.assertIn('heavy modules loaded at startup: numpy', output.getvalue())
+
+    def test_converter_defers_numpy_and_pdf2docx(self):
+        statement = 'import app.services.converter, app.services.converter_pool'
+        self.assertEqual(loaded_heavy_modules(statement), [])
+
+if __name__ == '__main__':
+    unittest.main()
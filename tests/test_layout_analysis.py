@@ -0,0 +1,167 @@
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import contextmanager
+import fitz
+from concurrent.futures import Future
+import numpy as np
+from unittest import mock
+from docx import Document
+from docx.shared import Pt
+from app.services import converter as converter_module
+from app.services.converter import DocumentConverter, ConversionContext, LayoutSummary
+from app.services.page_model import Span
+
+class LayoutAnalysisTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.converter = DocumentConverter(page_workers=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_density_map_counts_overlapping_blocks(self):
+        bboxes = np.array([[0, 0, 306, 396], [100, 100, 612, 792], [-10, 700, 50, 900]], dtype=float)
+        density = self.converter._text_density_map(bboxes, 612, 792, 100)
+
+        expected = np.zeros((100, 100), dtype=np.int32)
+        for x0, y0, x1, y1 in bboxes:
+            xs, xe = max(0, int(x0 / 612 * 100)), min(100, int(x1 / 612 * 100) + 1)
+            ys, ye = max(0, int(y0 / 792 * 100)), min(100, int(y1 / 792 * 100) + 1)
+            expected[xs:xe, ys:ye] += 1
+        np.testing.assert_array_equal(density, expected)
+
+    def test_single_pass_collects_bullets_headers_and_ratings(self):
+        pdf_path = os.path.join(self.temp_dir, 'layout.pdf')
+        pdf = fitz.open()
+        page = pdf.new_page()
+        page.insert_text((72, 72), "Skills", fontsize=18)
+        page.insert_text((72, 120), "- Python\n2. Flask\n(3) SQL", fontsize=10)
+        page.insert_text((72, 220), "English 8/10", fontsize=10)
+        pdf.save(pdf_path)
+        pdf.close()
+
+        with ConversionContext(pdf_path) as context:
+            layout_info = self.converter._analyze_page_layout(context.snapshot(0))
+
+        self.assertEqual(layout_info['bullet_styles'], {'-', '2', '('})
+        self.assertEqual([h['text'] for h in layout_info['headers']], ['Skills'])
+        self.assertEqual(layout_info['headers'][0]['level'], 1)
+        self.assertTrue(layout_info['has_ratings'])
+
+    def test_layout_is_analysed_once_per_page(self):
+        pdf_path = os.path.join(self.temp_dir, 'pages.pdf')
+        pdf = fitz.open()
+        for number in range(5):
+            pdf.new_page().insert_text((72, 72), f"Page {number + 1}", fontsize=11)
+        pdf.save(pdf_path)
+        pdf.close()
+
+        analyse = mock.Mock(wraps=self.converter._analyze_page_layout)
+        with mock.patch.object(self.converter, '_analyze_page_layout', analyse):
+            with ConversionContext(pdf_path) as context:
+                self.converter._render_docx(context)
+
+        self.assertEqual(sorted(call.args[0].number for call in analyse.call_args_list), [0, 1, 2, 3, 4])
+
+    def _write_pages(self, count):
+        pdf_path = os.path.join(self.temp_dir, 'report.pdf')
+        pdf = fitz.open()
+        for number in range(count):
+            page = pdf.new_page()
+            page.insert_text((72, 72), f"Section {number + 1}", fontsize=16)
+            page.insert_textbox(fitz.Rect(72, 100, 520, 400),
+                                f"- Item {number}\nBody text for page {number + 1}.", fontsize=10)
+        pdf.save(pdf_path)
+        pdf.close()
+        return pdf_path
+
+    def _render_body(self, converter, pdf_path):
+        with ConversionContext(pdf_path) as context:
+            return converter._render_docx(context).element.body.xml
+
+    def test_worker_analysis_matches_serial_output(self):
+        pdf_path = self._write_pages(10)
+        expected = self._render_body(self.converter, pdf_path)
+
+        parallel = DocumentConverter(page_workers=2)
+        analyse = mock.Mock(wraps=parallel._analyze_page_layout)
+        with mock.patch.object(converter_module, 'PARALLEL_MIN_PAGES', 2), \
+                mock.patch.object(parallel, '_analyze_page_layout', analyse):
+            self.assertEqual(self._render_body(parallel, pdf_path), expected)
+
+        # Only the global summary pages were analysed here; workers did the rest
+        self.assertEqual(sorted(call.args[0].number for call in analyse.call_args_list), [0, 1, 2])
+        self.assertEqual(len(parallel.timings.spans['page_layout_analysis']), 10)
+
+    def test_failed_worker_chunk_is_analysed_locally(self):
+        pdf_path = self._write_pages(6)
+        expected = self._render_body(self.converter, pdf_path)
+
+        # The first chunk comes back from a worker, the second one failed
+        chunks = [[0, 1, 2], [3, 4, 5]]
+        futures = [Future(), Future()]
+        futures[0].set_result(converter_module._analyze_pages_worker(pdf_path, chunks[0]))
+        futures[1].set_exception(RuntimeError("worker died"))
+
+        @contextmanager
+        def page_layouts(context):
+            yield converter._collect_page_layouts(context, chunks, futures)
+
+        converter = DocumentConverter(page_workers=0)
+        analyse = mock.Mock(wraps=converter._analyze_page_layout)
+        with mock.patch.object(converter, '_page_layouts', page_layouts), \
+                mock.patch.object(converter, '_analyze_page_layout', analyse):
+            self.assertEqual(self._render_body(converter, pdf_path), expected)
+
+        # Pages 0-2 were analysed for the global summary; the failed chunk's pages locally
+        self.assertEqual(sorted(call.args[0].number for call in analyse.call_args_list), [0, 1, 2, 3, 4, 5])
+
+    def test_layout_summary(self):
+        summary = LayoutSummary()
+        self.assertEqual(summary.global_layout(), {})
+
+        summary.add({'type': 'multi_column', 'font_sizes': {10: 50, 18: 2}, 'bullet_styles': {'-'}})
+        summary.add({'type': 'single_column', 'font_sizes': {10: 40, 14: 3}, 'has_ratings': True})
+        global_layout = summary.global_layout()
+
+        self.assertEqual(global_layout['layout_type'], 'multi_column')
+        self.assertFalse(global_layout['consistent_layout_type'])
+        self.assertEqual(global_layout['body_font_size'], 10)
+        self.assertEqual(global_layout['header_font_sizes'], [18, 14])
+        self.assertEqual(global_layout['bullet_styles'], {'-'})
+        self.assertTrue(global_layout['has_ratings'])
+
+    def test_styled_documents_come_from_cached_templates(self):
+        layout = {'body_font_size': 10, 'header_font_sizes': [18, 14]}
+        with mock.patch.dict(converter_module._styled_templates, clear=True):
+            first = self.converter._styled_document(layout)
+            first.add_paragraph("Only in the first document")
+            second = self.converter._styled_document(dict(layout, layout_type='multi_column'))
+
+            self.assertEqual(list(converter_module._styled_templates), [('Calibri', 10, (18, 14))])
+        self.assertEqual(second.paragraphs, [])
+        self.assertEqual(second.styles['Normal'].font.size, Pt(10))
+        self.assertEqual(second.styles['Heading 2'].font.size, Pt(14))
+        self.assertEqual(second.sections[0].left_margin, first.sections[0].left_margin)
+
+    def test_spans_with_the_same_run_formatting_share_a_run(self):
+        bbox = (0, 0, 10, 10)
+        spans = [
+            Span("Hello", bbox, "Helvetica", 10.0, 0, 0),
+            Span("big", bbox, "Helvetica", 10.2, 8, 0),  # same half points; monospace is not written
+            Span("  ", bbox, "Helvetica", 14.0, 16, 0),
+            Span("world", bbox, "Helvetica", 10.0, 16, 0),
+            Span("again", bbox, "Helvetica", 10.0, 16, 0),
+            Span("red", bbox, "Helvetica", 10.0, 16, 0xFF0000),
+        ]
+        paragraph = Document().add_paragraph()
+        self.converter._add_span_runs(paragraph, spans)
+
+        self.assertEqual([run.text for run in paragraph.runs], ["Hello big ", "world again ", "red "])
+        self.assertEqual([run.bold for run in paragraph.runs], [False, True, True])
+        self.assertEqual(str(paragraph.runs[2].font.color.rgb), "FF0000")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from flask import Flask
+from app.routes.metrics import metrics
+from app.services.conversion_cache import ConversionCache
+from app.services.converter import StageTimings
+from app.services.metrics import StageMetrics, server_timing_header
+
+class StageMetricsTestCase(unittest.TestCase):
+    def test_nested_spans_of_a_stage_are_timed_once(self):
+        timings = StageTimings()
+        with timings.span('page_processing'):
+            with timings.span('page_processing'):
+                with timings.span('image_extraction'):
+                    pass
+        self.assertEqual(len(timings.spans['page_processing']), 1)
+        self.assertEqual(len(timings.spans['image_extraction']), 1)
+
+    def test_prometheus_histogram(self):
+        metrics = StageMetrics()
+        metrics.observe({'save': [0.003, 0.2], 'convert': [1.5]})
+        text = metrics.render()
+        self.assertIn('# TYPE converter_stage_duration_seconds histogram', text)
+        self.assertIn('converter_stage_duration_seconds_bucket{stage="save",le="0.005"} 1', text)
+        self.assertIn('converter_stage_duration_seconds_bucket{stage="save",le="+Inf"} 2', text)
+        self.assertIn('converter_stage_duration_seconds_count{stage="convert"} 1', text)
+
+    def test_server_timing_header(self):
+        self.assertEqual(server_timing_header({'save': 0.0125, 'convert': 1.0}),
+                         'convert;dur=1000.0, save;dur=12.5')
+
+    def test_cache_hits_are_timed(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            cache = ConversionCache(os.path.join(temp_dir, 'cache'))
+            input_path = os.path.join(temp_dir, 'input.pdf')
+            with open(input_path, 'wb') as f:
+                f.write(b'%PDF input')
+            with mock.patch('app.services.conversion_cache.record_stage_timings') as record:
+                key = cache.make_key(input_path)
+                cache.put(key, input_path)
+                self.assertFalse(cache.get('missing', os.path.join(temp_dir, 'miss.docx')))
+                self.assertTrue(cache.get(key, os.path.join(temp_dir, 'hit.docx')))
+            self.assertEqual([list(call.args[0]) for call in record.call_args_list], [['cache_key'], ['cache_hit']])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+class MetricsRouteTestCase(unittest.TestCase):
+    def setUp(self):
+        app = Flask(__name__)
+        app.register_blueprint(metrics)
+        self.app = app
+        self.client = app.test_client()
+
+    def _get(self, remote_addr, **headers):
+        return self.client.get('/metrics', headers=headers, environ_base={'REMOTE_ADDR': remote_addr})
+
+    def test_without_token_only_local_scrapes_are_served(self):
+        with mock.patch('app.routes.metrics.METRICS_TOKEN', None):
+            self.assertEqual(self._get('127.0.0.1').status_code, 200)
+            self.assertEqual(self._get('203.0.113.7').status_code, 404)
+
+    def test_token_is_required_when_configured(self):
+        self.app.config['METRICS_TOKEN'] = 'scrape-secret'
+        self.assertEqual(self._get('127.0.0.1').status_code, 404)
+        self.assertEqual(self._get('203.0.113.7', Authorization='Bearer wrong').status_code, 404)
+        response = self._get('203.0.113.7', Authorization='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'converter_stage_duration_seconds', response.data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import fitz
+from unittest import mock
+from docx import Document
+from docx.shared import Pt, RGBColor
+from app.services import converter as converter_module
+from app.services.converter import ConversionContext, DocumentConverter
+from app.services.ooxml_writer import OoxmlDocument
+
+def _read(path_or_stream):
+    doc = Document(path_or_stream)
+    paragraphs = [(p.text, p.style.name, p.alignment, p.paragraph_format.space_after,
+                   [(r.text, r.bold, r.italic, r.underline, r.font.name, r.font.size) for r in p.runs])
+                  for p in doc.paragraphs]
+    sections = [(s.page_width, s.page_height, s.left_margin) for s in doc.sections]
+    return paragraphs, sections, len(doc.tables), len(doc.inline_shapes)
+
+class OoxmlWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _pdf(self, pages):
+        pdf_path = os.path.join(self.temp_dir, 'input.pdf')
+        pdf = fitz.open()
+        for number in range(pages):
+            page = pdf.new_page(width=842 if number == 1 else 595, height=595 if number == 1 else 842)
+            page.insert_text((72, 72), f"Chapter {number + 1}", fontsize=18)
+            page.insert_textbox(fitz.Rect(72, 100, 500, 400), "First line\nSecond line & more <text>", fontsize=10)
+        pdf.save(pdf_path)
+        pdf.close()
+        return pdf_path
+
+    def test_matches_python_docx_output(self):
+        pdf_path = self._pdf(3)
+
+        outputs = {'python-docx': os.path.join(self.temp_dir, 'python-docx.docx')}
+        DocumentConverter(page_workers=0).convert_to_docx(pdf_path, outputs['python-docx'])
+
+        # Streaming page by page through the OOXML writer gives the same document
+        outputs['stream'] = os.path.join(self.temp_dir, 'stream.docx')
+        with mock.patch('app.services.converter.STREAM_MIN_PAGES', 1), \
+                mock.patch.object(OoxmlDocument, 'flush', autospec=True, side_effect=OoxmlDocument.flush) as flush:
+            DocumentConverter(page_workers=0).convert_to_docx(pdf_path, outputs['stream'])
+        self.assertEqual(flush.call_count, 4)
+
+        self.assertEqual(_read(outputs['stream']), _read(outputs['python-docx']))
+
+    def test_large_documents_are_streamed_by_convert(self):
+        pdf_path = self._pdf(4)
+        expected = os.path.join(self.temp_dir, 'expected.docx')
+        DocumentConverter(page_workers=0).convert(pdf_path, expected)
+
+        output_path = os.path.join(self.temp_dir, 'streamed.docx')
+        converter = DocumentConverter(page_workers=0)
+        with mock.patch('app.services.converter.STREAM_MIN_PAGES', 2), \
+                mock.patch.object(OoxmlDocument, 'flush', autospec=True, side_effect=OoxmlDocument.flush) as flush, \
+                mock.patch.object(converter, '_apply_specialized_post_processing') as post_process:
+            self.assertTrue(converter.convert(pdf_path, output_path))
+
+        # Every page was spooled as soon as it was rendered; nothing edits the document afterwards
+        self.assertEqual(flush.call_count, 5)
+        post_process.assert_not_called()
+        self.assertEqual([p[0] for p in _read(output_path)[0]], [p[0] for p in _read(expected)[0]])
+
+    def test_complex_documents_stream_the_standard_candidate(self):
+        pdf_path = self._pdf(21)
+        output_path = os.path.join(self.temp_dir, 'streamed.docx')
+        converter = DocumentConverter(page_workers=0)
+        # The pdf2docx candidate scores lowest, so the streamed standard document is kept
+        candidate = mock.Mock(get=mock.Mock(return_value=(-1, {})))
+        pool = mock.Mock(apply_async=mock.Mock(return_value=candidate))
+        with mock.patch('app.services.converter.STREAM_MIN_PAGES', 10), \
+                mock.patch.object(converter_module, '_engine_pool', return_value=pool), \
+                mock.patch.object(converter, '_convert_with_multiple_engines',
+                                  wraps=converter._convert_with_multiple_engines) as multiple_engines, \
+                mock.patch.object(converter, '_quality_features', wraps=converter._quality_features) as features:
+            self.assertTrue(converter.convert(pdf_path, output_path))
+
+        multiple_engines.assert_called_once_with(mock.ANY, stream=True)
+        self.assertEqual(features.call_count, 21)
+        self.assertIn("Chapter 21", "\n".join(p.text for p in Document(output_path).paragraphs))
+
+    def test_streamed_quality_score_matches_the_whole_document(self):
+        pdf_path = self._pdf(3)
+        converter = DocumentConverter(page_workers=0)
+        with ConversionContext(pdf_path) as context:
+            expected = converter._evaluate_conversion_quality(converter._render_docx(context))
+        quality = converter_module.Counter()
+        with ConversionContext(pdf_path) as context:
+            converter._render_docx(context, stream=True, quality=quality)
+        self.assertEqual(converter._quality_score(quality), expected)
+        self.assertGreater(quality['text_length'], 0)
+
+    def test_runs_and_style_errors(self):
+        doc = OoxmlDocument()
+        paragraph = doc.add_paragraph("Title\tlevel", style="Heading 1")
+        run = paragraph.add_run("bold")
+        run.bold = True
+        run.font.size = Pt(14)
+        run.font.color.rgb = RGBColor(5, 99, 193)
+        doc.add_paragraph()
+        doc.add_page_break()
+
+        # Unknown and wrongly typed styles fail the way python-docx does
+        with self.assertRaises(KeyError):
+            doc.add_paragraph().style = "No Such Style"
+        with self.assertRaises(ValueError):
+            doc.add_paragraph().style = "Table Grid"
+
+        doc.remove_repeated_empty_paragraphs()
+        stream = io.BytesIO()
+        doc.save(stream)
+        paragraphs, _, _, _ = _read(stream)
+
+        self.assertEqual([p[0] for p in paragraphs], ["Title\tlevelbold", ""])
+        self.assertEqual(paragraphs[0][1], "Heading 1")
+        self.assertEqual(paragraphs[0][4][1], ("bold", True, None, None, None, Pt(14)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import pickle
+import unittest
+import fitz
+from app.services.page_model import TEXT_BLOCK, build_blocks
+
+class PageModelTestCase(unittest.TestCase):
+    def setUp(self):
+        self.pdf = fitz.open()
+        page = self.pdf.new_page()
+        page.insert_text((72, 72), "Experience", fontsize=16, fontname="helv")
+        page.insert_text((72, 200), "Python and Flask", fontsize=10, fontname="helv")
+        self.page = page
+
+    def tearDown(self):
+        self.pdf.close()
+
+    def test_matches_text_dict(self):
+        raw_blocks = [b for b in self.page.get_text("dict")["blocks"] if b["type"] == 0]
+        blocks = [b for b in build_blocks(self.page) if b.type == TEXT_BLOCK]
+
+        self.assertEqual(len(blocks), len(raw_blocks))
+        for block, raw_block in zip(blocks, raw_blocks):
+            raw_spans = [span for line in raw_block["lines"] for span in line["spans"]]
+            self.assertEqual(block.text, "".join(span["text"] for span in raw_spans))
+            self.assertEqual([span.size for span in block.spans()], [span["size"] for span in raw_spans])
+            self.assertEqual(block.bbox, raw_block["bbox"])
+
+    def test_fonts_are_shared_and_blocks_pickle(self):
+        spans = [span for block in build_blocks(self.page) for span in block.spans()]
+        self.assertIs(spans[0].font, spans[-1].font)
+
+        blocks = pickle.loads(pickle.dumps(build_blocks(self.page)))
+        self.assertEqual([b.text for b in blocks], ["Experience", "Python and Flask"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+import fitz
+from concurrent.futures import ProcessPoolExecutor
+from app.services.converter import ConversionOptionsError, DocumentConverter, parse_page_options, select_pages
+
+class PageSelectionTestCase(unittest.TestCase):
+    def test_defaults_to_every_page(self):
+        self.assertEqual(select_pages(4), [0, 1, 2, 3])
+        self.assertEqual(select_pages(4, {'pages': ''}), [0, 1, 2, 3])
+
+    def test_page_ranges(self):
+        self.assertEqual(select_pages(10, {'pages': '1-3,5'}), [0, 1, 2, 4])
+        self.assertEqual(select_pages(10, {'pages': '8-'}), [7, 8, 9])
+        self.assertEqual(select_pages(10, {'pages': [3, '1']}), [0, 2])
+        self.assertEqual(select_pages(5, {'pages': '4-20'}), [3, 4])
+
+    def test_preview_and_max_pages(self):
+        self.assertEqual(select_pages(200, {'first_n_preview': 2}), [0, 1])
+        self.assertEqual(select_pages(10, {'pages': '3-10', 'max_pages': 2}), [2, 3])
+        self.assertEqual(select_pages(10, {'pages': '1,5', 'first_n_preview': '3'}), [0])
+
+    def test_invalid_selection(self):
+        for options in ({'pages': 'x'}, {'pages': '0'}, {'pages': '5-2'},
+                        {'pages': '20'}, {'max_pages': 0}, {'first_n_preview': -1},
+                        {'pages': {'1': 2}}, {'max_pages': [2]}, {'first_n_preview': {}}):
+            with self.assertRaises(ConversionOptionsError):
+                select_pages(10, options)
+
+    def test_options_are_validated_without_the_document(self):
+        self.assertEqual(parse_page_options({'pages': '1-3,8-', 'max_pages': '2'}), ([(1, 3), (8, None)], None, 2))
+        self.assertEqual(parse_page_options(None), (None, None, None))
+        for options in ({'pages': '3-1'}, {'max_pages': [1]}, {'first_n_preview': 'two'}):
+            with self.assertRaises(ConversionOptionsError):
+                parse_page_options(options)
+
+    def test_selection_errors_cross_the_process_pool(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            pdf_path = os.path.join(temp_dir, 'input.pdf')
+            pdf = fitz.open()
+            pdf.new_page()
+            pdf.save(pdf_path)
+            pdf.close()
+
+            # Routes tell missing pages (400) from failed conversions by the exception type
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(DocumentConverter(page_workers=0).convert, pdf_path,
+                                         os.path.join(temp_dir, 'output.docx'), options={'pages': '5'})
+                with self.assertRaises(ConversionOptionsError):
+                    future.result()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from app.services.converter import DocumentConverter, LAYOUT_TABLE_STYLE
+
+class LayoutTableStyleTestCase(unittest.TestCase):
+    def test_tables_use_the_shared_borderless_style(self):
+        doc = Document()
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).text = "Name"
+        for cell in (table.cell(0, 0), table.cell(1, 1)):
+            cell._tc.get_or_add_tcPr().append(parse_xml(
+                f'<w:tcBorders {nsdecls("w")}><w:top w:val="single" w:sz="4"/></w:tcBorders>'))
+
+        converter = DocumentConverter(page_workers=0)
+        converter._fix_table_borders(doc)
+        converter._fix_table_borders(doc)
+
+        self.assertEqual(table.style.name, LAYOUT_TABLE_STYLE)
+        self.assertEqual(table._tbl.xpath('.//w:tcBorders'), [])
+        self.assertEqual(len([s for s in doc.styles if s.name == LAYOUT_TABLE_STYLE]), 1)
+
+        style_xml = table.style.element.xml
+        self.assertIn('w:insideV w:val="nil"', style_xml)
+        self.assertIn('w:left w:w="60" w:type="dxa"', style_xml)
+
+if __name__ == '__main__':
+    unittest.main()
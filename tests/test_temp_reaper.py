@@ -0,0 +1,94 @@
+import io
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from flask import Flask
+from app.routes.api import api
+from app.services.conversion_cache import ConversionCache
+from app.services.temp_reaper import TempFileReaper, CONVERTED_TTL, get_temp_reaper
+
+class TempFileReaperTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.reaper = TempFileReaper(os.path.join(self.temp_dir, 'artifacts.sqlite3'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reaps_only_expired_artifacts(self):
+        expired_file = os.path.join(self.temp_dir, 'converted.docx')
+        expired_dir = os.path.join(self.temp_dir, 'upload')
+        fresh_file = os.path.join(self.temp_dir, 'fresh.docx')
+        os.makedirs(expired_dir)
+        for path in (expired_file, os.path.join(expired_dir, 'input.pdf'), fresh_file):
+            open(path, 'wb').close()
+
+        self.reaper.register(expired_file, 60)
+        self.reaper.register(expired_dir, 60)
+        self.reaper.register(fresh_file, 3600)
+
+        self.assertEqual(self.reaper.reap(now=time.time() + 120), 2)
+        self.assertFalse(os.path.exists(expired_file))
+        self.assertFalse(os.path.exists(expired_dir))
+        self.assertTrue(os.path.exists(fresh_file))
+
+        # Expired entries are removed from the index, so a second pass has nothing to do
+        self.assertEqual(self.reaper.reap(now=time.time() + 120), 0)
+
+    def test_missing_files_are_ignored(self):
+        self.reaper.register(os.path.join(self.temp_dir, 'gone.docx'), 0)
+        self.assertEqual(self.reaper.reap(now=time.time() + 1), 1)
+
+    def test_failed_conversion_output_is_reaped(self):
+        app = Flask(__name__, root_path=self.temp_dir)
+        app.register_blueprint(api)
+
+        def convert(input_path, output_path, target_format):
+            # The worker died after writing part of the output
+            with open(output_path, 'wb') as f:
+                f.write(b'partial')
+            return False
+
+        app.extensions.update(
+            temp_reaper=self.reaper,
+            conversion_cache=ConversionCache(os.path.join(self.temp_dir, 'cache')),
+            converter_pool=mock.Mock(convert=mock.Mock(side_effect=convert))
+        )
+        response = app.test_client().post('/api/convert', data={'file': (io.BytesIO(b'%PDF-1.4'), 'report.pdf')})
+        self.assertEqual(response.status_code, 500)
+
+        converted_dir = os.path.join(self.temp_dir, 'temp', 'converted')
+        self.assertEqual(len(os.listdir(converted_dir)), 1)
+        self.assertEqual(self.reaper.reap(now=time.time() + CONVERTED_TTL + 1), 1)
+        self.assertEqual(os.listdir(converted_dir), [])
+
+    def test_application_reaper_is_started_once(self):
+        app = Flask(__name__, root_path=self.temp_dir)
+        barrier = threading.Barrier(8)
+        reapers = []
+
+        def get_reaper():
+            barrier.wait()
+            with app.app_context():
+                reapers.append(get_temp_reaper())
+
+        def slow_start(reaper):
+            time.sleep(0.1)
+            return reaper
+
+        with mock.patch.object(TempFileReaper, 'start', autospec=True, side_effect=slow_start) as start:
+            threads = [threading.Thread(target=get_reaper) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        start.assert_called_once()
+        self.assertEqual(len({id(reaper) for reaper in reapers}), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+import fitz
+from unittest import mock
+from app.services import converter as converter_module
+from app.services.converter import DocumentConverter
+
+class TextConversionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, 'input.pdf')
+        pdf = fitz.open()
+        for number in range(12):
+            page = pdf.new_page()
+            page.insert_text((72, 72), f"Page {number + 1}", fontsize=14)
+            page.insert_textbox(fitz.Rect(72, 100, 500, 300), f"Body of page {number + 1}\nSecond line", fontsize=10)
+        pdf.save(self.pdf_path)
+        pdf.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _convert(self, converter, name, options=None):
+        output_path = os.path.join(self.temp_dir, name)
+        self.assertTrue(converter.convert_to_txt(self.pdf_path, output_path, options=options))
+        with open(output_path, encoding='utf-8') as f:
+            return f.read()
+
+    def test_streamed_text_matches_whole_document_text(self):
+        # The text the converter wrote before it streamed pages: every page, then a blank line
+        with fitz.open(self.pdf_path) as pdf:
+            page_texts = [page.get_text() + "\n\n" for page in pdf]
+        expected = "".join(page_texts)
+
+        self.assertEqual(self._convert(DocumentConverter(page_workers=0), 'serial.txt'), expected)
+        with mock.patch.object(converter_module, 'PARALLEL_MIN_PAGES', 2), \
+                mock.patch.object(converter_module, 'TEXT_CHUNK_PAGES', 2):
+            self.assertEqual(self._convert(DocumentConverter(page_workers=2), 'parallel.txt'), expected)
+
+        partial = self._convert(DocumentConverter(page_workers=0), 'partial.txt', {'pages': '2,4'})
+        self.assertEqual(partial, page_texts[1] + page_texts[3])
+
+if __name__ == '__main__':
+    unittest.main()